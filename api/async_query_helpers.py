@@ -0,0 +1,73 @@
+"""Versions asynchrones des query helpers.
+
+Chaque fonction exécute la requête de `query_helpers` correspondante : avec
+une `AsyncSession` via `AsyncSession.run_sync` (sans passer par le
+threadpool), avec une `Session` synchrone dans le threadpool de Starlette.
+"""
+
+from functools import wraps
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from . import query_helpers as helpers
+from .query_helpers import (  # noqa: F401  fonctions sans accès à la base
+    MOVIE_KEYS,
+    RATING_KEYS,
+    TAG_KEYS,
+    LINK_KEYS,
+    MOVIE_COLUMNS,
+    RATING_COLUMNS,
+    TAG_COLUMNS,
+    LINK_COLUMNS,
+    encode_cursor,
+    decode_cursor,
+    next_cursor,
+    export_movies_statement,
+    export_ratings_statement,
+    export_tags_statement,
+    export_links_statement,
+)
+
+
+def _asynchronous(func):
+    @wraps(func)
+    async def wrapper(db, *args, **kwargs):
+        if isinstance(db, AsyncSession):
+            return await db.run_sync(func, *args, **kwargs)
+        return await run_in_threadpool(func, db, *args, **kwargs)
+    return wrapper
+
+# Films
+
+get_movie = _asynchronous(helpers.get_movie)
+movie_exists = _asynchronous(helpers.movie_exists)
+get_movies = _asynchronous(helpers.get_movies)
+get_movies_by_ids = _asynchronous(helpers.get_movies_by_ids)
+search_movies = _asynchronous(helpers.search_movies)
+get_movie_stats = _asynchronous(helpers.get_movie_stats)
+
+# Évaluations
+
+get_rating = _asynchronous(helpers.get_rating)
+get_ratings = _asynchronous(helpers.get_ratings)
+get_ratings_by_keys = _asynchronous(helpers.get_ratings_by_keys)
+
+# Tags
+
+get_tag = _asynchronous(helpers.get_tag)
+get_tags = _asynchronous(helpers.get_tags)
+
+# Links
+
+get_link = _asynchronous(helpers.get_link)
+get_links = _asynchronous(helpers.get_links)
+get_links_by_ids = _asynchronous(helpers.get_links_by_ids)
+
+# Requetes analytiques
+
+get_table_counts = _asynchronous(helpers.get_table_counts)
+get_movie_count = _asynchronous(helpers.get_movie_count)
+get_rating_count = _asynchronous(helpers.get_rating_count)
+get_tag_count = _asynchronous(helpers.get_tag_count)
+get_link_count = _asynchronous(helpers.get_link_count)
@@ -0,0 +1,149 @@
+"""Construction hors ligne de l'index de similarité item-item.
+
+Les notes de la table ratings forment une matrice creuse utilisateurs x
+films (SciPy). Chaque colonne est centrée sur la moyenne de chaque
+utilisateur (cosinus ajusté, par défaut) ou laissée brute (cosinus), puis
+normalisée : la similarité de deux films est le produit scalaire de leurs
+colonnes. La matrice films x films est calculée par blocs de lignes, dont
+seuls les K meilleurs voisins sont gardés, ce qui borne la mémoire quel
+que soit le nombre de films. Les paires notées par moins de `--min-common`
+utilisateurs en commun et les similarités négatives sont écartées.
+
+Usage :
+    python -m api.build_similarity [--top-k 50] [--min-common 5] [--metric adjusted-cosine]
+
+L'index est écrit dans le dossier lu par l'API (voir similarity.py) ; les
+workers le chargent à leur démarrage.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import create_engine
+
+from .database import DATABASE_PATH
+from .similarity import SIMILARITY_INDEX_DIR, save_index
+
+METRICS = ("adjusted-cosine", "cosine")
+
+DEFAULT_TOP_K = 50
+DEFAULT_MIN_COMMON = 5
+
+# Mémoire de travail d'un bloc de la matrice de similarité : similarités et
+# nombres d'utilisateurs communs denses, plus les tableaux de argpartition
+DEFAULT_BLOCK_MB = 256
+BYTES_PER_CELL = 24
+
+READ_CHUNK_SIZE = 1_000_000
+
+
+def read_ratings(database_path: str = DATABASE_PATH):
+    """Lit les colonnes userId, movieId et rating de la table ratings."""
+    engine = create_engine(f"sqlite:///file:{database_path}?mode=ro&uri=true")
+    # curseur DBAPI : des tuples sqlite3, bien plus rapides à convertir que des Row SQLAlchemy
+    connection = engine.raw_connection()
+    chunks = []
+    try:
+        cursor = connection.cursor()
+        cursor.execute('SELECT "userId", "movieId", rating FROM ratings')
+        while rows := cursor.fetchmany(READ_CHUNK_SIZE):
+            chunks.append(np.array(rows, dtype=np.float64))
+    finally:
+        connection.close()
+        engine.dispose()
+    ratings = np.concatenate(chunks) if chunks else np.empty((0, 3))
+    return ratings[:, 0].astype(np.int64), ratings[:, 1].astype(np.int64), ratings[:, 2]
+
+
+def rating_matrices(users: np.ndarray, movies: np.ndarray, ratings: np.ndarray, metric: str):
+    """Matrices creuses utilisateurs x films des notes normalisées et des notes présentes.
+
+    Retourne les IDs des films (ordre des colonnes), les notes (centrées
+    pour le cosinus ajusté) divisées par la norme de leur colonne, et une
+    matrice de 1 qui compte les utilisateurs communs à deux films.
+    """
+    movie_ids, movie_index = np.unique(movies, return_inverse=True)
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    values = ratings.astype(np.float64)
+    if metric == "adjusted-cosine":
+        means = np.bincount(user_index, weights=values) / np.bincount(user_index)
+        values = values - means[user_index]
+
+    norms = np.sqrt(np.bincount(movie_index, weights=values ** 2, minlength=len(movie_ids)))[movie_index]
+    values = np.divide(values, norms, out=np.zeros_like(values), where=norms > 0)
+
+    shape = (len(user_ids), len(movie_ids))
+    normalized = sparse.csc_matrix((values.astype(np.float32), (user_index, movie_index)), shape=shape)
+    present = sparse.csc_matrix((np.ones(len(values), dtype=np.float32), (user_index, movie_index)), shape=shape)
+    return movie_ids, normalized, present
+
+
+def top_neighbors(normalized, present, top_k: int, min_common: int, block_bytes: int):
+    """K plus proches voisins de chaque colonne, en positions de colonnes (-1 si absent)."""
+    count = normalized.shape[1]
+    neighbors = np.full((count, top_k), -1, dtype=np.int32)
+    scores = np.zeros((count, top_k), dtype=np.float32)
+    k = min(top_k, count - 1)
+    if k <= 0:
+        return neighbors, scores
+
+    rows, present_rows = normalized.T.tocsr(), present.T.tocsr()
+    block = max(1, block_bytes // (count * BYTES_PER_CELL))
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        similarity = (rows[start:stop] @ normalized).toarray()
+        common = (present_rows[start:stop] @ present).toarray()
+        similarity[common < min_common] = -np.inf
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        kept = candidate_scores > 0
+        neighbors[start:stop, :k] = np.where(kept, candidates, -1)
+        scores[start:stop, :k] = np.where(kept, candidate_scores, 0)
+    return neighbors, scores
+
+
+def build_index(database_path: str = DATABASE_PATH, index_dir: str = SIMILARITY_INDEX_DIR,
+                top_k: int = DEFAULT_TOP_K, min_common: int = DEFAULT_MIN_COMMON,
+                metric: str = METRICS[0], block_bytes: int = DEFAULT_BLOCK_MB * 1024 * 1024):
+    started = time.perf_counter()
+    users, movies, ratings = read_ratings(database_path)
+    print(f"{'notes':<12} {len(ratings):>12,} lignes  {time.perf_counter() - started:8.2f}s")
+
+    step_started = time.perf_counter()
+    movie_ids, normalized, present = rating_matrices(users, movies, ratings, metric)
+    positions, scores = top_neighbors(normalized, present, top_k, min_common, block_bytes)
+    neighbors = np.where(positions >= 0, movie_ids[positions], -1).astype(np.int32)
+    print(f"{'voisins':<12} {len(movie_ids):>12,} films   {time.perf_counter() - step_started:8.2f}s")
+
+    save_index(index_dir, movie_ids.astype(np.int32), neighbors, scores)
+    found = (neighbors >= 0).sum(axis=1)
+    print(f"{'index':<12} {np.mean(found):>12.1f} voisins par film en moyenne, "
+          f"{np.count_nonzero(found == 0):,} films sans voisin")
+    print(f"{'total':<12} {'':>12}        {time.perf_counter() - started:8.2f}s  -> {index_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcule l'index des films similaires à partir des notes.")
+    parser.add_argument("--database", default=DATABASE_PATH, help="Base SQLite dont les notes sont lues")
+    parser.add_argument("--index-dir", default=SIMILARITY_INDEX_DIR, help="Dossier de l'index à produire")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Nombre de voisins gardés par film")
+    parser.add_argument("--min-common", type=int, default=DEFAULT_MIN_COMMON,
+                        help="Nombre minimal d'utilisateurs ayant noté les deux films")
+    parser.add_argument("--metric", choices=METRICS, default=METRICS[0], help="Mesure de similarité")
+    parser.add_argument("--block-mb", type=int, default=DEFAULT_BLOCK_MB,
+                        help="Mémoire de travail d'un bloc de la matrice de similarité, en Mio")
+    args = parser.parse_args()
+    build_index(args.database, args.index_dir, args.top_k, args.min_common, args.metric,
+                args.block_mb * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    main()
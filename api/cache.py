@@ -0,0 +1,180 @@
+"""Cache des réponses GET et requêtes conditionnelles (ETag / If-None-Match).
+
+Le jeu de données ne change qu'au rechargement de movies.db : les réponses
+sont gardées dans un cache LRU en mémoire (nombre d'entrées, taille totale
+et durée de vie bornés), indexé par chemin, paramètres et en-tête Accept.
+L'ETag est dérivé de la version du jeu de données et de la requête, ce qui
+permet de répondre 304 sans interroger la base.
+
+Configuration par variables d'environnement :
+    API_CACHE_ENABLED       1 (défaut) ou 0
+    API_CACHE_MAX_ENTRIES   nombre maximal de réponses gardées
+    API_CACHE_MAX_BYTES     taille totale maximale des corps gardés
+    API_CACHE_ENTRY_BYTES   taille maximale d'un corps mis en cache
+    API_CACHE_TTL           durée de vie d'une entrée, en secondes
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from .database import DATABASE_PATH
+
+CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "1") == "1"
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.getenv("API_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_ENTRY_BYTES = int(os.getenv("API_CACHE_ENTRY_BYTES", str(8 * 1024 * 1024)))
+CACHE_TTL = int(os.getenv("API_CACHE_TTL", "300"))
+
+
+def dataset_version(path: str = DATABASE_PATH) -> str:
+    """Version du jeu de données : change dès que le fichier SQLite ou son WAL est modifié."""
+    parts = []
+    for suffix in ("", "-wal"):
+        try:
+            stat = os.stat(path + suffix)
+        except FileNotFoundError:
+            continue
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+
+class CacheEntry:
+    __slots__ = ("status", "headers", "body", "expires")
+
+    def __init__(self, status: int, headers: list, body: bytes, expires: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+
+
+class ResponseCache:
+    """Cache LRU borné en nombre d'entrées, en octets et en durée de vie."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, status: int, headers: list, body: bytes):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(status, headers, body, time.monotonic() + self.ttl)
+        self.size += len(body)
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key).body)
+
+
+class ResponseCacheMiddleware:
+    """Middleware ASGI : cache LRU des réponses GET 200 et réponses 304 conditionnelles.
+
+    Les réponses marquées `Cache-Control: no-store` (exports en streaming,
+    métriques...) ne sont ni mises en cache ni dotées d'un ETag.
+    """
+
+    def __init__(self, app, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 entry_bytes: int = CACHE_ENTRY_BYTES, ttl: float = CACHE_TTL, version=dataset_version):
+        self.app = app
+        self.cache = ResponseCache(max_entries, max_bytes, ttl)
+        self.entry_bytes = entry_bytes
+        self.ttl = int(ttl)
+        self.version = version
+        self._version = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        version = self.version()
+        if version != self._version:
+            self.cache.clear()
+            self._version = version
+
+        headers = dict(scope["headers"])
+        accept = headers.get(b"accept", b"")
+        key = (scope["path"], scope["query_string"], accept)
+        etag = self._etag(version, key)
+        cache_headers = [
+            (b"etag", etag),
+            (b"cache-control", f"public, max-age={self.ttl}".encode()),
+            (b"vary", b"Accept"),
+        ]
+
+        if etag in _split_etags(headers.get(b"if-none-match", b"")):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            await send({"type": "http.response.start", "status": entry.status,
+                        "headers": entry.headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        await self._call_and_store(scope, receive, send, key, cache_headers)
+
+    async def _call_and_store(self, scope, receive, send, key, cache_headers):
+        """Transmet la réponse au client au fil de l'eau et en garde une copie si elle est cachable."""
+        captured = {"cacheable": False, "headers": None, "status": None, "body": []}
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                no_store = any(
+                    name.lower() == b"cache-control" and b"no-store" in value.lower()
+                    for name, value in headers
+                )
+                if message["status"] == 200 and not no_store:
+                    headers += cache_headers
+                    captured.update(cacheable=True, status=200, headers=headers, size=0)
+                    message = dict(message, headers=headers + [(b"x-cache", b"MISS")])
+            elif message["type"] == "http.response.body" and captured["cacheable"]:
+                body = message.get("body", b"")
+                captured["size"] += len(body)
+                if captured["size"] > self.entry_bytes:
+                    captured["cacheable"] = False
+                    captured["body"] = []
+                else:
+                    captured["body"].append(body)
+                if not message.get("more_body", False) and captured["cacheable"]:
+                    self.cache.put(key, captured["status"], captured["headers"], b"".join(captured["body"]))
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+    @staticmethod
+    def _etag(version: str, key) -> bytes:
+        path, query, accept = key
+        digest = hashlib.sha1(b"\0".join((version.encode(), path.encode(), query, accept))).hexdigest()
+        return f'"{digest[:20]}"'.encode()
+
+
+def _split_etags(value: bytes) -> set:
+    """Découpe un en-tête If-None-Match ("a", W/"b") en ensemble d'ETags."""
+    return {tag.strip().removeprefix(b"W/") for tag in value.split(b",") if tag.strip()}
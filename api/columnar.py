@@ -0,0 +1,106 @@
+"""Sorties en colonnes : flux Arrow IPC et fichiers Parquet.
+
+Les lignes (tuples) sortent de la base sans passer par l'ORM ni par JSON :
+elles sont transposées en colonnes typées puis écrites en record batches
+Arrow. Le schéma Arrow est déduit des types SQLAlchemy des colonnes
+sélectionnées.
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import Float, Integer
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+def arrow_type(sql_type) -> pa.DataType:
+    """Type Arrow correspondant à un type de colonne SQLAlchemy."""
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+def arrow_schema(columns) -> pa.Schema:
+    """Schéma Arrow d'une liste de colonnes (ou de `select().selected_columns`)."""
+    return pa.schema([(column.key, arrow_type(column.type)) for column in columns])
+
+
+def record_batch(schema: pa.Schema, rows) -> pa.RecordBatch:
+    """Transpose des lignes en record batch, une colonne à la fois."""
+    columns = list(zip(*rows)) or [()] * len(schema)
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def wants_arrow(request: Request) -> bool:
+    """Indique si le client demande un flux Arrow via l'en-tête Accept."""
+    return ARROW_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def arrow_response(rows, columns, headers: dict = None) -> Response:
+    """Réponse Arrow IPC (format stream) contenant une page de lignes."""
+    schema = arrow_schema(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(record_batch(schema, rows))
+    return Response(sink.getvalue().to_pybytes(), media_type=ARROW_MEDIA_TYPE, headers=headers)
+
+
+class _ChunkSink:
+    """Fichier en écriture seule dont on récupère les octets au fur et à mesure."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ColumnarEncoder:
+    """Encode un export bloc par bloc en Arrow IPC ou en Parquet (un row group par bloc)."""
+
+    def __init__(self, columns, fmt: str):
+        self.schema = arrow_schema(columns)
+        self._sink = _ChunkSink()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, self.schema)
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows) -> bytes:
+        self._writer.write_batch(record_batch(self.schema, rows))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
@@ -0,0 +1,168 @@
+"""Fixtures des tests de l'API.
+
+Les tests n'utilisent pas api/movies.db (construit localement, absent du
+dépôt) : une petite base est générée dans un dossier temporaire, par le
+même chemin de chargement que `python -m api.load_data`.
+"""
+
+import asyncio
+import csv
+import os
+import shutil
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.load_data import load_database
+
+GENRES = ("Action", "Adventure", "Animation", "Children", "Comedy", "Drama", "Romance", "Sci-Fi", "Thriller")
+TAGS = ("funny", "dark", "classic", "Highly quotable")
+MOVIE_COUNT = 120
+USER_COUNT = 40
+
+
+def write_dataset(data_dir: str):
+    """Écrit des CSV au format de data/, déterministes : ~1 900 notes, 120 films, 40 utilisateurs."""
+    movie_ids = [1] + [index * 7 + 3 for index in range(1, MOVIE_COUNT)]
+    movies, links, ratings, tags = [], [], [], []
+    for index, movie_id in enumerate(movie_ids):
+        title = "Toy Story (1995)" if index == 0 else f"Movie {index} {'Story' if index % 5 == 0 else 'Tale'} ({1970 + index % 50})"
+        genres = "(no genres listed)" if index % 29 == 28 else "|".join(
+            dict.fromkeys(GENRES[(index * step) % len(GENRES)] for step in (1, 2, 5)[: 1 + index % 3])
+        )
+        movies.append((movie_id, title, genres))
+        links.append((movie_id, f"{100000 + index:07d}", "" if index % 13 == 12 else index * 11))
+        for user_id in range(1, USER_COUNT + 1):
+            if (user_id * 31 + index * 17) % 5 < 2:
+                rating = ((user_id + index) % 10 + 1) / 2
+                ratings.append((user_id, movie_id, rating, 1_000_000_000 + user_id * 10_000 + index * 37))
+            if (user_id + index) % 11 == 0:
+                tags.append((user_id, movie_id, TAGS[(user_id + index) % len(TAGS)], 1_100_000_000 + user_id + index))
+
+    tables = {
+        "movies.csv": (("movieId", "title", "genres"), movies),
+        "links.csv": (("movieId", "imdbId", "tmdbId"), links),
+        "ratings.csv": (("userId", "movieId", "rating", "timestamp"), ratings),
+        "tags.csv": (("userId", "movieId", "tag", "timestamp"), tags),
+    }
+    for filename, (header, rows) in tables.items():
+        with open(os.path.join(data_dir, filename), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+@pytest.fixture(scope="session")
+def dataset_dir(tmp_path_factory) -> str:
+    data_dir = str(tmp_path_factory.mktemp("data"))
+    write_dataset(data_dir)
+    return data_dir
+
+
+@pytest.fixture(scope="session")
+def database_path(dataset_dir) -> str:
+    path = os.path.join(dataset_dir, "movies.db")
+    load_database(path, dataset_dir)
+    return path
+
+
+@pytest.fixture(scope="session")
+def database_engine(database_path):
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database_engine):
+    with sessionmaker(bind=database_engine)() as session:
+        yield session
+
+
+@pytest.fixture
+def query_plans(database_engine):
+    """Retourne `plans(call)` : exécute `call()` et renvoie le plan SQLite de chaque requête émise."""
+
+    def plans(call) -> list:
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(database_engine, "before_cursor_execute", capture)
+        try:
+            call()
+        finally:
+            event.remove(database_engine, "before_cursor_execute", capture)
+        with database_engine.connect() as conn:
+            return [
+                [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                for statement, parameters in statements
+            ]
+
+    return plans
+
+
+@contextmanager
+def serve(engine):
+    """Application branchée sur `engine`, sans le cache des réponses ; l'état précédent est rétabli en sortie."""
+    from api import export, main
+    from api.cache import ResponseCacheMiddleware
+
+    TestSession = sessionmaker(bind=engine, autoflush=False)
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+    # les exports ouvrent leur propre session, hors de get_db
+    sessions = export.SessionLocal, export.AsyncSessionLocal
+    export.SessionLocal = TestSession
+    export.AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_test_db():
+        with TestSession() as session:
+            yield session
+
+    app = main.app
+    middleware = app.user_middleware
+    previous = app.dependency_overrides.get(main.get_db)
+    # le cache répondrait avec les corps d'un autre test : il est retiré de la pile
+    app.user_middleware = [entry for entry in middleware if entry.cls is not ResponseCacheMiddleware]
+    app.middleware_stack = None
+    app.dependency_overrides[main.get_db] = get_test_db
+    try:
+        yield app
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(main.get_db, None)
+        else:
+            app.dependency_overrides[main.get_db] = previous
+        app.user_middleware = middleware
+        app.middleware_stack = None
+        export.SessionLocal, export.AsyncSessionLocal = sessions
+        asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture(scope="session")
+def client(database_engine):
+    """Client de l'application branché sur la base de test, sans le cache des réponses."""
+    with serve(database_engine) as app:
+        yield TestClient(app)
+
+
+@pytest.fixture
+def writable_engine(database_path, tmp_path):
+    """Moteur sur une copie de la base de test, que le test peut modifier."""
+    path = tmp_path / "movies.db"
+    shutil.copy(database_path, path)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def writable_client(writable_engine):
+    """Client de l'application branché sur `writable_engine`."""
+    with serve(writable_engine) as app:
+        yield TestClient(app)
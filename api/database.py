@@ -1,30 +1,98 @@
 """Database configuration"""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 import os
 
+from .metrics import METRICS_ENABLED, instrument_engine
+from .slow_queries import SLOW_QUERY_ENABLED, SlowQueryLog, configure_logging
+from .settings import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_SIZE,
+    DATABASE_PROFILE,
+    get_profile,
+)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'movies.db')}"
+DATABASE_PATH = os.path.join(BASE_DIR, 'movies.db')
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Accès asynchrone (aiosqlite) : les endpoints n'occupent pas un worker du
+# threadpool de Starlette pendant les requêtes SQL.
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
 
 
-# # Créer un moteur de base de données (engine) qui établit la connexion avec notre base SQLite (movies.db).
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def database_url(driver: str, read_only: bool) -> str:
+    """URL de movies.db pour un driver, ouverte en lecture seule (URI `mode=ro`) si demandé."""
+    if read_only:
+        return f"{driver}:///file:{DATABASE_PATH}?mode=ro&uri=true"
+    return f"{driver}:///{DATABASE_PATH}"
+
+
+def apply_pragmas(engine, pragmas):
+    """Exécute les pragmas du profil sur chaque nouvelle connexion du moteur."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_database_engine(profile_name: str = DATABASE_PROFILE):
+    """Crée le moteur synchrone configuré selon un profil (voir settings.py)."""
+    profile = get_profile(profile_name)
+    engine = create_engine(
+        database_url("sqlite", profile.read_only),
+        connect_args={"check_same_thread": False},
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+    )
+    apply_pragmas(engine, profile.pragmas)
+    return engine
+
+
+def create_async_database_engine(profile_name: str = DATABASE_PROFILE):
+    """Crée le moteur asynchrone (aiosqlite) configuré selon un profil."""
+    profile = get_profile(profile_name)
+    engine = create_async_engine(
+        database_url("sqlite+aiosqlite", profile.read_only),
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+    )
+    apply_pragmas(engine.sync_engine, profile.pragmas)
+    return engine
+
+
+# Créer un moteur de base de données (engine) qui établit la connexion avec notre base SQLite (movies.db).
+engine = create_database_engine()
 
 # Définir SessionLocal, qui permet de créer des sessions pour interagir avec la base de données.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_database_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Durée et nombre des requêtes SQL par route, exposés sur /metrics
+if METRICS_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
+# Requêtes au-delà de API_SLOW_QUERY_MS, avec leur plan (python -m api.slow_queries)
+if SLOW_QUERY_ENABLED:
+    configure_logging()
+    slow_query_log = SlowQueryLog()
+    slow_query_log.instrument(engine)
+    slow_query_log.instrument(async_engine.sync_engine)
+
 # Définir Base, qui servira de classe de base pour nos modèles SQLAlchemy.
 Base = declarative_base()
 
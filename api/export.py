@@ -0,0 +1,105 @@
+"""Exports en streaming (NDJSON, CSV, Arrow ou Parquet) pour les endpoints /export/*.
+
+Les lignes sont lues par blocs de `EXPORT_BATCH_SIZE` avec `yield_per` et
+encodées bloc par bloc : la mémoire reste constante quelle que soit la
+taille de la table. La session est ouverte par le générateur lui-même pour
+rester valide pendant toute la durée de la réponse.
+"""
+
+import csv
+import io
+import json
+
+from fastapi.responses import StreamingResponse
+
+from .columnar import ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE, ColumnarEncoder
+from .database import AsyncSessionLocal, SessionLocal
+from .settings import DATABASE_MODE
+
+EXPORT_BATCH_SIZE = 5_000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": ARROW_MEDIA_TYPE,
+    "parquet": PARQUET_MEDIA_TYPE,
+}
+
+FILE_EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "arrow": "arrows", "parquet": "parquet"}
+
+
+def encode_ndjson(names, rows) -> bytes:
+    """Encode un bloc de lignes en JSON, un objet par ligne."""
+    return "".join(
+        json.dumps(dict(zip(names, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+def encode_csv(rows) -> bytes:
+    """Encode un bloc de lignes en CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class TextEncoder:
+    """Encode un export bloc par bloc en NDJSON ou en CSV (avec ligne d'en-tête)."""
+
+    def __init__(self, columns, fmt: str):
+        self.names = [column.key for column in columns]
+        self.fmt = fmt
+
+    def start(self) -> bytes:
+        return encode_csv([self.names]) if self.fmt == "csv" else b""
+
+    def encode(self, rows) -> bytes:
+        if self.fmt == "csv":
+            return encode_csv(rows)
+        return encode_ndjson(self.names, rows)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+def _encoder(statement, fmt: str):
+    if fmt in ("arrow", "parquet"):
+        return ColumnarEncoder(statement.selected_columns, fmt)
+    return TextEncoder(statement.selected_columns, fmt)
+
+
+def _sync_stream(statement, fmt: str):
+    encoder = _encoder(statement, fmt)
+    yield encoder.start()
+    with SessionLocal() as db:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+    yield encoder.finish()
+
+
+async def _async_stream(statement, fmt: str):
+    encoder = _encoder(statement, fmt)
+    yield encoder.start()
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+    yield encoder.finish()
+
+
+def streaming_response(statement, fmt: str, filename: str) -> StreamingResponse:
+    """Construit la réponse streaming d'un export."""
+    if DATABASE_MODE == "sync":
+        body = _sync_stream(statement, fmt)
+    else:
+        body = _async_stream(statement, fmt)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{FILE_EXTENSIONS[fmt]}"',
+            # jamais mis en cache : le corps peut faire plusieurs centaines de Mo
+            "Cache-Control": "no-store",
+        },
+    )
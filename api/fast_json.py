@@ -0,0 +1,26 @@
+"""Sérialisation rapide des listes, sans validation Pydantic ligne par ligne.
+
+Avec `API_FAST_JSON=1`, les endpoints de liste lisent les colonnes exposées
+en tuples (voir `query_helpers.*_COLUMNS`) et les encodent directement avec
+orjson. Le corps produit est identique, octet pour octet, à celui de la
+sérialisation FastAPI par `response_model` (JSON compact, UTF-8, champs
+dans l'ordre des schémas) ; le schéma OpenAPI ne change pas.
+"""
+
+import os
+
+import orjson
+from fastapi.responses import Response
+
+FAST_JSON_ENABLED = os.getenv("API_FAST_JSON", "0") == "1"
+
+
+def encode_rows(rows, columns) -> bytes:
+    """Encode des tuples de colonnes en tableau JSON d'objets."""
+    names = [column.key for column in columns]
+    return orjson.dumps([dict(zip(names, row)) for row in rows])
+
+
+def json_response(rows, columns, headers: dict = None) -> Response:
+    """Réponse JSON d'une page de liste encodée avec orjson."""
+    return Response(encode_rows(rows, columns), media_type="application/json", headers=headers)
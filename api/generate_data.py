@@ -0,0 +1,345 @@
+"""Génération d'un jeu de données MovieLens synthétique, à l'échelle voulue.
+
+Les volumes suivent un facteur d'échelle appliqué au jeu de données livré
+(`--scale 1` : ~100 000 notes, 610 utilisateurs, 9 742 films ; `--scale 250`
+approche MovieLens 25M) ; le nombre de films croît moins vite que celui des
+notes, comme dans les versions publiées de MovieLens. Les distributions
+imitent les données réelles :
+
+- popularité des films selon une loi de Zipf-Mandelbrot (quelques films
+  concentrent une grande partie des notes, une longue traîne en a peu) ;
+- activité des utilisateurs log-normale, avec au moins 20 notes chacun ;
+- genres, années, mots des titres et textes des tags tirés de data/*.csv ;
+- note = qualité du film + biais de l'utilisateur + bruit, arrondie à
+  l'étoile ou à la demi-étoile ; horodatages dans la période d'activité de
+  l'utilisateur.
+
+Tout est vectorisé avec NumPy et produit par blocs : les notes sont générées
+par tranches d'utilisateurs et écrites au fil de l'eau, la mémoire reste
+bornée quel que soit le volume. Le résultat ne dépend que de la graine.
+
+Usage :
+    python -m api.generate_data --scale 100 --output-dir data/synthetic
+    python -m api.generate_data --scale 1000 --database movies_large.db
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from functools import partial
+from typing import Dict, Iterator, List, NamedTuple
+
+import numpy as np
+
+from .database import DATABASE_PATH
+from .load_data import DATA_DIR, DEFAULT_CHUNK_SIZE, build_database, compile_insert, insert_chunks, report
+from . import models
+
+# Volumes du jeu de données livré (--scale 1)
+BASE_MOVIES = 9_742
+BASE_USERS = 610
+BASE_RATINGS = 100_836
+BASE_TAGS = 3_683
+
+# Nombre de films proportionnel à scale ** MOVIES_GROWTH (250 -> ~67 000 films)
+MOVIES_GROWTH = 0.35
+# Popularité 1 / (rang + ZIPF_OFFSET) ** ZIPF_EXPONENT, ajustée sur data/ratings.csv
+# (le film le plus noté y reçoit ~0,3 % des notes)
+ZIPF_EXPONENT = 0.7
+ZIPF_OFFSET = 30
+# Tirages complémentaires pour remplacer les films déjà notés par un utilisateur
+TOP_UP_ROUNDS = 8
+MIN_RATINGS_PER_USER = 20
+ACTIVITY_SIGMA = 1.2
+
+# Qualité des films, biais des utilisateurs et bruit, en étoiles
+MOVIE_QUALITY_MEAN = 3.5
+MOVIE_QUALITY_STD = 0.45
+USER_BIAS_STD = 0.35
+RATING_NOISE_STD = 0.9
+# Part des notes arrondies à l'étoile entière (les autres à la demi-étoile)
+WHOLE_STAR_SHARE = 0.6
+
+# Période couverte par les horodatages (1996-01-01 -> 2018-09-24)
+FIRST_TIMESTAMP = 820_454_400
+LAST_TIMESTAMP = 1_537_799_250
+# Durée moyenne de la période d'activité d'un utilisateur (secondes)
+MEAN_ACTIVITY_SPAN = 2 * 365 * 24 * 3600
+
+# En-têtes des CSV, identiques à ceux de data/
+COLUMNS = {
+    models.Movie: ("movieId", "title", "genres"),
+    models.Link: ("movieId", "imdbId", "tmdbId"),
+    models.Rating: ("userId", "movieId", "rating", "timestamp"),
+    models.Tag: ("userId", "movieId", "tag", "timestamp"),
+}
+
+YEAR_PATTERN = re.compile(r"\((\d{4})\)\s*$")
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z']+")
+
+# Bloc de colonnes : {nom de colonne: liste de valeurs}
+Chunk = Dict[str, list]
+
+
+class Reference(NamedTuple):
+    """Valeurs réelles tirées de data/*.csv."""
+
+    genres: List[str]
+    years: np.ndarray
+    title_words: List[str]
+    tags: List[str]
+
+
+class Population(NamedTuple):
+    """Films et utilisateurs générés, partagés par les notes et les tags."""
+
+    movie_quality: np.ndarray
+    movie_cdf: np.ndarray
+    user_ratings: np.ndarray
+    user_bias: np.ndarray
+    user_start: np.ndarray
+    user_span: np.ndarray
+
+
+def read_reference(data_dir: str = DATA_DIR) -> Reference:
+    genres, years, words = [], [], set()
+    with open(os.path.join(data_dir, "movies.csv"), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            genres.append(row["genres"])
+            year = YEAR_PATTERN.search(row["title"])
+            if year:
+                years.append(int(year.group(1)))
+            words.update(WORD_PATTERN.findall(YEAR_PATTERN.sub("", row["title"])))
+    with open(os.path.join(data_dir, "tags.csv"), newline="", encoding="utf-8") as f:
+        tags = [row["tag"] for row in csv.DictReader(f)]
+    return Reference(genres, np.array(years), sorted(words), tags)
+
+
+def _counts(scale: float):
+    """Nombre de films, d'utilisateurs, de notes et de tags pour un facteur d'échelle."""
+    return (
+        max(1, round(BASE_MOVIES * scale ** MOVIES_GROWTH)),
+        max(1, round(BASE_USERS * scale)),
+        max(1, round(BASE_RATINGS * scale)),
+        max(0, round(BASE_TAGS * scale)),
+    )
+
+
+def _zipf_cdf(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Fonction de répartition de la popularité, rangs répartis au hasard entre les films."""
+    weights = 1.0 / (rng.permutation(size) + 1.0 + ZIPF_OFFSET) ** ZIPF_EXPONENT
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _draw(rng: np.random.Generator, cdf: np.ndarray, size: int) -> np.ndarray:
+    """Tire `size` index selon une fonction de répartition."""
+    return np.minimum(np.searchsorted(cdf, rng.random(size), side="right"), len(cdf) - 1)
+
+
+def make_population(rng: np.random.Generator, n_movies: int, n_users: int, n_ratings: int) -> Population:
+    activity = rng.lognormal(0.0, ACTIVITY_SIGMA, n_users)
+    extra = max(0, n_ratings - MIN_RATINGS_PER_USER * n_users)
+    user_ratings = MIN_RATINGS_PER_USER + rng.multinomial(extra, activity / activity.sum())
+    # un utilisateur ne peut pas noter plus de la moitié du catalogue
+    user_ratings = np.minimum(user_ratings, max(1, n_movies // 2))
+    user_start = rng.integers(FIRST_TIMESTAMP, LAST_TIMESTAMP, n_users)
+    user_span = np.minimum(rng.exponential(MEAN_ACTIVITY_SPAN, n_users), LAST_TIMESTAMP - user_start)
+    return Population(
+        movie_quality=rng.normal(MOVIE_QUALITY_MEAN, MOVIE_QUALITY_STD, n_movies),
+        movie_cdf=_zipf_cdf(rng, n_movies),
+        user_ratings=user_ratings,
+        user_bias=rng.normal(0.0, USER_BIAS_STD, n_users),
+        user_start=user_start,
+        user_span=user_span,
+    )
+
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    """Clés distinctes triées ; tri en place, bien plus rapide que np.unique sur des int64."""
+    keys.sort()
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def _distinct_movies(rng: np.random.Generator, cdf: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Tire `counts[i]` films distincts pour chaque utilisateur i d'une tranche.
+
+    Retourne les clés triées utilisateur * n_movies + film. Les doublons
+    (clé primaire de ratings) sont retirés puis remplacés par de nouveaux
+    tirages, en quelques passes vectorisées.
+    """
+    n_movies = len(cdf)
+    keys = np.empty(0, dtype=np.int64)
+    missing = counts
+    for _ in range(TOP_UP_ROUNDS):
+        users = np.repeat(np.arange(len(counts), dtype=np.int64), missing)
+        keys = _sorted_unique(np.concatenate([keys, users * n_movies + _draw(rng, cdf, len(users))]))
+        missing = counts - np.bincount(keys // n_movies, minlength=len(counts))
+        if not missing.any():
+            break
+    return keys
+
+
+def generate_movies(rng: np.random.Generator, reference: Reference, n_movies: int,
+                    chunk_size: int) -> Iterator[Chunk]:
+    words = np.array(reference.title_words, dtype=object)
+    for start in range(0, n_movies, chunk_size):
+        size = min(chunk_size, n_movies - start)
+        lengths = rng.integers(1, 5, size)
+        title_words = words[rng.integers(len(words), size=lengths.sum())]
+        years = rng.choice(reference.years, size)
+        titles = [
+            f"{' '.join(parts)} ({year})"
+            for parts, year in zip(np.split(title_words, np.cumsum(lengths)[:-1]), years.tolist())
+        ]
+        genres = [reference.genres[i] for i in rng.integers(len(reference.genres), size=size).tolist()]
+        yield {"movieId": list(range(start + 1, start + size + 1)), "title": titles, "genres": genres}
+
+
+def generate_links(rng: np.random.Generator, n_movies: int, chunk_size: int) -> Iterator[Chunk]:
+    imdb_ids = rng.choice(9_000_000, n_movies, replace=False) + 100_000
+    tmdb_ids = rng.choice(max(2_000_000, 2 * n_movies), n_movies, replace=False) + 1
+    for start in range(0, n_movies, chunk_size):
+        stop = min(n_movies, start + chunk_size)
+        yield {
+            "movieId": list(range(start + 1, stop + 1)),
+            "imdbId": [f"{imdb_id:07d}" for imdb_id in imdb_ids[start:stop].tolist()],
+            "tmdbId": [str(tmdb_id) for tmdb_id in tmdb_ids[start:stop].tolist()],
+        }
+
+
+def _timestamps(rng: np.random.Generator, population: Population, users: np.ndarray) -> np.ndarray:
+    return population.user_start[users] + (rng.random(len(users)) * population.user_span[users]).astype(np.int64)
+
+
+def _round_stars(rng: np.random.Generator, stars: np.ndarray) -> np.ndarray:
+    whole = rng.random(len(stars)) < WHOLE_STAR_SHARE
+    return np.clip(np.where(whole, np.round(stars), np.round(stars * 2) / 2), 0.5, 5.0)
+
+
+def generate_ratings(rng: np.random.Generator, population: Population, chunk_size: int) -> Iterator[Chunk]:
+    """Notes triées par utilisateur puis par film, générées par tranches d'utilisateurs."""
+    n_movies = len(population.movie_quality)
+    ends = np.cumsum(population.user_ratings)
+    # première et dernière tranche d'utilisateurs de chaque bloc d'environ chunk_size notes
+    bounds = np.unique(np.searchsorted(ends, np.arange(chunk_size, ends[-1], chunk_size), side="right"))
+    for first, last in zip(np.r_[0, bounds], np.r_[bounds, len(ends)]):
+        if first == last:
+            continue
+        keys = _distinct_movies(rng, population.movie_cdf, population.user_ratings[first:last])
+        users, movies = first + keys // n_movies, keys % n_movies
+        stars = (
+            population.movie_quality[movies]
+            + population.user_bias[users]
+            + rng.normal(0.0, RATING_NOISE_STD, len(keys))
+        )
+        yield {
+            "userId": (users + 1).tolist(),
+            "movieId": (movies + 1).tolist(),
+            "rating": _round_stars(rng, stars).tolist(),
+            "timestamp": _timestamps(rng, population, users).tolist(),
+        }
+
+
+def generate_tags(rng: np.random.Generator, population: Population, reference: Reference, n_tags: int,
+                  chunk_size: int) -> Iterator[Chunk]:
+    """Tags posés par les utilisateurs actifs sur les films populaires."""
+    if not n_tags:
+        return
+    n_movies = len(population.movie_quality)
+    n_texts = len(reference.tags)
+    user_cdf = np.cumsum(population.user_ratings) / population.user_ratings.sum()
+    users = _draw(rng, user_cdf, n_tags).astype(np.int64)
+    movies = _draw(rng, population.movie_cdf, n_tags)
+    texts = rng.integers(n_texts, size=n_tags)
+    # un seul triplet (utilisateur, film, tag) : clé primaire de tags
+    keys = _sorted_unique((users * n_movies + movies) * n_texts + texts)
+    users, movies, texts = keys // n_texts // n_movies, keys // n_texts % n_movies, keys % n_texts
+    timestamps = _timestamps(rng, population, users)
+    for start in range(0, len(keys), chunk_size):
+        stop = start + chunk_size
+        yield {
+            "userId": (users[start:stop] + 1).tolist(),
+            "movieId": (movies[start:stop] + 1).tolist(),
+            "tag": [reference.tags[i] for i in texts[start:stop].tolist()],
+            "timestamp": timestamps[start:stop].tolist(),
+        }
+
+
+def generate(scale: float, seed: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE, data_dir: str = DATA_DIR):
+    """Retourne les générateurs de blocs de chaque table, dans l'ordre de chargement.
+
+    Chaque table a son propre générateur aléatoire dérivé de la graine : le
+    contenu d'une table ne dépend pas de l'ordre dans lequel elles sont lues.
+    """
+    reference = read_reference(data_dir)
+    n_movies, n_users, n_ratings, n_tags = _counts(scale)
+    population_rng, movies_rng, links_rng, ratings_rng, tags_rng = (
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(5)
+    )
+    population = make_population(population_rng, n_movies, n_users, n_ratings)
+    return (
+        (models.Movie, generate_movies(movies_rng, reference, n_movies, chunk_size)),
+        (models.Link, generate_links(links_rng, n_movies, chunk_size)),
+        (models.Rating, generate_ratings(ratings_rng, population, chunk_size)),
+        (models.Tag, generate_tags(tags_rng, population, reference, n_tags, chunk_size)),
+    )
+
+
+def write_csv(path: str, columns, chunks: Iterator[Chunk]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for chunk in chunks:
+            rows = list(zip(*(chunk[name] for name in columns)))
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def write_csv_files(output_dir: str, tables):
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    total = 0
+    for model, chunks in tables:
+        table_started = time.perf_counter()
+        count = write_csv(os.path.join(output_dir, f"{model.__tablename__}.csv"), COLUMNS[model], chunks)
+        report(model.__tablename__, count, time.perf_counter() - table_started)
+        total += count
+    report("total", total, time.perf_counter() - started)
+
+
+def load_chunks(conn, model, chunks: Iterator[Chunk]) -> int:
+    """Insère des blocs de colonnes générés dans la table du modèle."""
+    statement = compile_insert(conn, model, COLUMNS[model])
+    rows = (list(zip(*(chunk[name] for name in statement.positiontup))) for chunk in chunks)
+    return insert_chunks(conn, statement, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un jeu de données MovieLens synthétique.")
+    parser.add_argument("--scale", type=float, default=10.0,
+                        help="Facteur d'échelle par rapport à data/ (1 : ~100 000 notes)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine : même graine, mêmes données")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000,
+                        help="Nombre de lignes générées et écrites par bloc")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Dossier des CSV de référence (genres, titres, tags)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output-dir", help="Dossier où écrire movies.csv, links.csv, ratings.csv et tags.csv")
+    target.add_argument("--database", nargs="?", const=DATABASE_PATH,
+                        help="Fichier SQLite à construire directement (défaut : movies.db)")
+    args = parser.parse_args()
+
+    tables = generate(args.scale, args.seed, args.chunk_size, args.data_dir)
+    if args.output_dir:
+        write_csv_files(args.output_dir, tables)
+    else:
+        build_database(args.database, [(model, partial(load_chunks, model=model, chunks=chunks))
+                                       for model, chunks in tables])
+
+
+if __name__ == "__main__":
+    main()
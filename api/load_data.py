@@ -0,0 +1,235 @@
+"""Construction de movies.db à partir des fichiers CSV MovieLens.
+
+Les CSV sont lus par blocs et insérés avec un ``executemany`` par bloc,
+chaque bloc dans sa propre transaction. Les index sont construits une fois
+toutes les lignes chargées, ce qui est bien plus rapide que de les
+maintenir ligne par ligne.
+
+Usage :
+    python -m api.load_data [--data-dir data] [--chunk-size 50000]
+"""
+
+import argparse
+import csv
+import os
+import time
+from functools import partial
+from itertools import islice
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.schema import CreateTable
+
+from .database import Base, BASE_DIR, DATABASE_PATH
+from . import models
+
+DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), "data")
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Pragmas de chargement : la base est reconstruite de zéro, on peut donc
+# sacrifier la durabilité (pas de journal, pas de fsync) pendant l'import.
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+)
+
+
+def _optional(value: str):
+    """Convertit une cellule vide en NULL."""
+    return value or None
+
+
+# Fichier CSV, modèle cible et conversion de chaque colonne
+SOURCES = (
+    ("movies.csv", models.Movie, {"movieId": int, "title": str, "genres": str}),
+    ("links.csv", models.Link, {"movieId": int, "imdbId": _optional, "tmdbId": _optional}),
+    ("ratings.csv", models.Rating, {"userId": int, "movieId": int, "rating": float, "timestamp": int}),
+    ("tags.csv", models.Tag, {"userId": int, "movieId": int, "tag": str, "timestamp": int}),
+)
+
+
+def read_chunks(path: str, converters: dict, columns: list, chunk_size: int):
+    """Lit un CSV par blocs de `chunk_size` tuples ordonnés selon `columns`."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        fields = [(header.index(name), converters[name]) for name in columns]
+        while True:
+            chunk = [
+                tuple(convert(row[position]) for position, convert in fields)
+                for row in islice(reader, chunk_size)
+            ]
+            if not chunk:
+                return
+            yield chunk
+
+
+def create_tables(conn):
+    """Recrée les tables sans leurs index secondaires."""
+    Base.metadata.drop_all(conn)
+    for table in Base.metadata.sorted_tables:
+        conn.execute(CreateTable(table))
+
+
+def build_movie_genres(conn) -> int:
+    """Éclate `movies.genres` ("Comedy|Drama") dans movie_genres et crée les triggers qui la tiennent à jour."""
+    for statement in models.MOVIE_GENRES_DDL:
+        conn.exec_driver_sql(statement)
+    return conn.exec_driver_sql("SELECT count(*) FROM movie_genres").scalar()
+
+
+def build_movies_fts(conn) -> int:
+    """Crée l'index plein texte des titres et le remplit en une passe."""
+    for statement in models.MOVIES_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO movies_fts(movies_fts) VALUES ('optimize')")
+    return conn.exec_driver_sql("SELECT count(*) FROM movies").scalar()
+
+
+def build_table_stats(conn) -> int:
+    """Enregistre le nombre de lignes de chaque table et crée les triggers de comptage."""
+    for statement in models.TABLE_STATS_DDL:
+        conn.exec_driver_sql(statement)
+    return len(models.COUNTED_TABLES)
+
+
+def build_movie_stats(conn) -> int:
+    """Agrège notes et tags par film et crée les triggers qui maintiennent ces agrégats."""
+    for statement in models.MOVIE_STATS_DDL:
+        conn.exec_driver_sql(statement)
+    return conn.exec_driver_sql("SELECT count(*) FROM movie_stats").scalar()
+
+
+# Tables dérivées des tables chargées depuis les CSV
+DERIVED_TABLES = (
+    (models.MovieGenre.__tablename__, build_movie_genres),
+    ("movies_fts", build_movies_fts),
+    (models.TableStat.__tablename__, build_table_stats),
+    (models.MovieStats.__tablename__, build_movie_stats),
+)
+
+
+def create_indexes(conn):
+    """Construit les index déclarés sur les modèles une fois les données en place."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn)
+    conn.exec_driver_sql("ANALYZE")
+
+
+def compile_insert(conn, model, columns):
+    """INSERT compilé une seule fois, exécuté ensuite avec des tuples positionnels
+    (ordre : `statement.positiontup`), sans le coût d'un dictionnaire par ligne."""
+    return insert(model).compile(dialect=conn.dialect, column_keys=list(columns))
+
+
+def insert_chunks(conn, statement, chunks) -> int:
+    """Insère des blocs de tuples, une transaction par bloc."""
+    count = 0
+    for chunk in chunks:
+        with conn.begin():
+            conn.exec_driver_sql(statement.string, chunk)
+        count += len(chunk)
+    return count
+
+
+def load_table(conn, path: str, model, converters: dict, chunk_size: int) -> int:
+    """Charge un CSV dans la table du modèle, une transaction par bloc."""
+    statement = compile_insert(conn, model, converters)
+    return insert_chunks(conn, statement, read_chunks(path, converters, statement.positiontup, chunk_size))
+
+
+def report(label: str, count: int, elapsed: float):
+    rate = count / elapsed if elapsed else float("inf")
+    print(f"{label:<12} {count:>12,} lignes  {elapsed:8.2f}s  {rate:>12,.0f} lignes/s")
+
+
+# Fichiers annexes d'une base SQLite en WAL
+SIDECAR_SUFFIXES = ("-wal", "-shm")
+
+
+def remove_database_files(path: str):
+    """Supprime une base SQLite et ses fichiers -wal / -shm s'ils existent."""
+    for suffix in ("",) + SIDECAR_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def build_database(database_path: str, tables):
+    """Construit la base dans un fichier temporaire puis le met en place.
+
+    `tables` est une suite de couples (modèle, load) où `load(conn)` remplit
+    la table du modèle et retourne le nombre de lignes insérées. Les tables
+    dérivées et les index sont construits ensuite.
+    """
+    build_path = f"{database_path}.tmp"
+    remove_database_files(build_path)
+
+    engine = create_engine(f"sqlite:///{build_path}")
+    started = time.perf_counter()
+    total = 0
+    try:
+        with engine.connect() as conn:
+            for pragma in LOAD_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            conn.commit()
+            with conn.begin():
+                create_tables(conn)
+
+            for model, load in tables:
+                table_started = time.perf_counter()
+                count = load(conn)
+                report(model.__tablename__, count, time.perf_counter() - table_started)
+                total += count
+
+            for label, build in DERIVED_TABLES:
+                step_started = time.perf_counter()
+                with conn.begin():
+                    count = build(conn)
+                report(label, count, time.perf_counter() - step_started)
+
+            step_started = time.perf_counter()
+            with conn.begin():
+                create_indexes(conn)
+            print(f"{'index':<12} {'':>12}        {time.perf_counter() - step_started:8.2f}s")
+
+            # WAL enregistré dans l'en-tête du fichier : les connexions en
+            # lecture seule du profil read-heavy n'ont pas à le modifier
+            conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+    finally:
+        engine.dispose()
+
+    # un -wal resté de l'ancienne base serait rejoué sur la nouvelle à la
+    # première ouverture : on le supprime avant de mettre la base en place
+    for suffix in SIDECAR_SUFFIXES:
+        if os.path.exists(database_path + suffix):
+            os.remove(database_path + suffix)
+    os.replace(build_path, database_path)
+    report("total", total, time.perf_counter() - started)
+
+
+def load_database(database_path: str = DATABASE_PATH, data_dir: str = DATA_DIR,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Reconstruit la base à partir des fichiers CSV de `data_dir`."""
+    build_database(database_path, [
+        (model, partial(load_table, path=os.path.join(data_dir, filename), model=model,
+                        converters=converters, chunk_size=chunk_size))
+        for filename, model, converters in SOURCES
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit movies.db à partir des CSV MovieLens.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Dossier contenant les fichiers CSV")
+    parser.add_argument("--database", default=DATABASE_PATH, help="Chemin du fichier SQLite à produire")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Nombre de lignes insérées par transaction")
+    args = parser.parse_args()
+    load_database(args.database, args.data_dir, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from contextlib import asynccontextmanager
 
-from .database import SessionLocal, engine
-from . import query_helpers as helpers
+from fastapi import FastAPI, Depends, HTTPException, Query, Path, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional, Union
+
+from .cache import CACHE_ENABLED, ResponseCacheMiddleware
+from .database import AsyncSessionLocal, SessionLocal
+from .metrics import METRICS_ENABLED, MetricsMiddleware, metrics_response
+from .settings import DATABASE_MODE
+from . import async_query_helpers as helpers
+from . import columnar, export, fast_json, similarity
 from . import schemas
 
 
@@ -30,6 +37,15 @@ externes (IMDB, TMDB).
 Tous les endpoints supportent la pagination (`skip`, `limit`) et des
 filtres optionnels selon les cas.
 
+Les listes de films, évaluations, tags et liens peuvent être reçues en
+colonnes au format Arrow IPC avec l'en-tête
+`Accept: application/vnd.apache.arrow.stream`.
+
+Les listes supportent aussi une pagination par curseur, bien plus rapide
+sur les pages profondes : passer `cursor=` (vide) pour la première page,
+puis la valeur de l'en-tête `X-Next-Cursor` de chaque réponse. L'absence
+de cet en-tête indique la dernière page.
+
 ### Bon à savoir
 - Vous pouvez tester tous les endpoints directement via l'interface Swagger
 ci-dessous.
@@ -38,19 +54,97 @@ avec le bon code HTTP.
 
 """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Index des films similaires projeté en mémoire : chaque worker le lit
+    # sans le copier (voir similarity.py)
+    app.state.similarity = similarity.load_index()
+    yield
+
+
 # Initialisation de l'application FastAPI
 app = FastAPI(
     title="MovieLens API",
-    description=api_description, version="0.1"
+    description=api_description, version="0.1",
+    lifespan=lifespan,
 )
+
+# Cache des réponses GET, ETag et réponses 304 (voir cache.py)
+if CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Métriques Prometheus par route, y compris les réponses servies par le cache
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+
 # dependance pour obtenir une session de base de données
-def get_db():
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# MOVIES_DB_MODE=sync revient aux sessions synchrones (requêtes dans le threadpool)
+get_db = get_sync_db if DATABASE_MODE == "sync" else get_async_db
+
+DbSession = Union[AsyncSession, Session]
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CURSOR_DESCRIPTION = (
+    "Curseur opaque de pagination par clé primaire (vide pour la première page, "
+    "puis la valeur de l'en-tête X-Next-Cursor)"
+)
+
+
+def check_cursor(cursor: Optional[str], skip: int, keys):
+    """Valide le curseur reçu avant d'interroger la base."""
+    if cursor is None:
+        return
+    if skip:
+        raise HTTPException(status_code=400, detail="Les paramètres skip et cursor ne peuvent pas être combinés")
+    if cursor:
+        try:
+            helpers.decode_cursor(cursor, len(keys))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
+def set_next_cursor(response: Response, rows, limit: int, cursor: Optional[str], keys):
+    """Ajoute l'en-tête X-Next-Cursor lorsque la pagination par curseur est utilisée."""
+    if cursor is None:
+        return
+    next_cursor = helpers.next_cursor(rows, limit, keys)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+# Les listes répondent en Arrow IPC lorsque le client l'annonce dans Accept
+ARROW_RESPONSES = {200: {"content": {columnar.ARROW_MEDIA_TYPE: {}}}}
+
+
+def wants_rows(request: Request) -> bool:
+    """Indique si la page doit être lue en tuples de colonnes (Arrow ou JSON rapide)."""
+    return columnar.wants_arrow(request) or fast_json.FAST_JSON_ENABLED
+
+
+def rows_page(request: Request, response: Response, rows, columns):
+    """Réponse Arrow ou JSON (orjson) d'une page de tuples, avec l'en-tête X-Next-Cursor éventuel."""
+    headers = {}
+    if NEXT_CURSOR_HEADER in response.headers:
+        headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+    if columnar.wants_arrow(request):
+        return columnar.arrow_response(rows, columns, headers)
+    return fast_json.json_response(rows, columns, headers)
+
 # Routes pour les films, Endpoints pour tester la santé de l'API
 @app.get(
     "/",
@@ -66,25 +160,158 @@ async def root():
     return {"Message": "API MovieLens est opérationnelle!"}
 
 
+@app.get(
+    "/metrics",
+    summary="Métriques Prometheus",
+    description=(
+        "Latence, requêtes en cours, taille des réponses et requêtes SQL "
+        "(nombre et durée) par route, au format texte de Prometheus."
+    ),
+    response_class=Response,
+    tags=["Monitoring"],
+    include_in_schema=METRICS_ENABLED,
+)
+async def read_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métriques désactivées")
+    return metrics_response()
+
+
+# Endpoint de recherche plein texte dans les titres (déclaré avant /movies/{movie_id})
+@app.get(
+    "/movies/search",
+    summary="Rechercher des films par titre",
+    description=(
+        "Recherche plein texte (FTS5) dans les titres. Plusieurs mots sont combinés, "
+        "le dernier est traité comme un préfixe (autocomplétion). Les résultats "
+        "sont classés par pertinence (bm25)."
+    ),
+    response_description="Films classés par pertinence",
+    response_model=List[schemas.MovieSimple],
+    tags=["Films"],
+)
+async def search_movies(
+    q: str = Query(..., min_length=1, description="Texte recherché, par exemple `toy sto`"),
+    limit: int = Query(20, ge=1, le=100, description="Nombre maximum de films à récupérer"),
+    db: DbSession = Depends(get_db)
+):
+    return await helpers.search_movies(db, q, limit=limit)
+
+# Endpoint pour obtenir plusieurs films en une requête
+@app.post(
+    "/movies/batch",
+    summary="Obtenir plusieurs films par leurs IDs",
+    description=(
+        "Récupère jusqu'à 500 films en une seule requête, dans l'ordre des IDs "
+        "demandés. Les IDs inconnus sont ignorés."
+    ),
+    response_description="Films trouvés",
+    response_model=List[schemas.MovieSimple],
+    tags=["Films"],
+)
+async def read_movies_batch(
+    body: schemas.MovieIds,
+    db: DbSession = Depends(get_db)
+):
+    return await helpers.get_movies_by_ids(db, body.ids)
+
 # Endpoint pour obtenir un film par son ID
 @app.get(
     "/movies/{movie_id}",
     summary="Obtenir un film par son ID",
-    description="Récupère les détails d'un film en utilisant son ID unique `movie_id`.",
+    description=(
+        "Récupère les détails d'un film en utilisant son ID unique `movie_id`. "
+        "Pour les films très notés, `ratings_limit` / `tags_limit` bornent les "
+        "listes embarquées et `include_stats` ajoute leurs agrégats."
+    ),
     response_model=schemas.MovieDetailed,
     tags=["Films"],
 )
-def read_movie(
+async def read_movie(
     movie_id: int = Path(..., description="L'ID unique du film à récupérer"),
-    db: Session = Depends(get_db)
+    ratings_limit: Optional[int] = Query(
+        None, ge=0, description="Nombre maximum de notes embarquées (les plus récentes), 0 pour les omettre"
+    ),
+    tags_limit: Optional[int] = Query(
+        None, ge=0, description="Nombre maximum de tags embarqués (les plus récents), 0 pour les omettre"
+    ),
+    include_stats: bool = Query(
+        False, description="Ajoute les statistiques de notes du film (champ `stats`)"
+    ),
+    db: DbSession = Depends(get_db)
 ):
-    movie = helpers.get_movie(db, movie_id)
+    movie = await helpers.get_movie(db, movie_id, ratings_limit=ratings_limit, tags_limit=tags_limit)
 
     if movie is None:
         raise HTTPException(status_code=404, detail="Film non trouvé")
 
+    if include_stats:
+        detailed = schemas.MovieDetailed.model_validate(movie)
+        detailed.stats = schemas.MovieStats(**(await helpers.get_movie_stats(db, movie_id)))
+        return detailed
+
     return movie
 
+# Endpoint pour obtenir les statistiques de notes d'un film
+@app.get(
+    "/movies/{movie_id}/stats",
+    summary="Obtenir les statistiques d'un film",
+    description=(
+        "Retourne le nombre de notes, la moyenne, l'écart-type, l'histogramme par "
+        "tranche de 0,5 étoile, le nombre de tags et les dates de première et "
+        "dernière note d'un film, à partir d'agrégats précalculés."
+    ),
+    response_model=schemas.MovieStats,
+    tags=["Films"],
+)
+async def read_movie_stats(
+    movie_id: int = Path(..., description="L'ID unique du film"),
+    db: DbSession = Depends(get_db)
+):
+    stats = await helpers.get_movie_stats(db, movie_id)
+
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Film non trouvé")
+
+    return stats
+
+# Endpoint pour obtenir les films les plus proches d'un film (index précalculé)
+@app.get(
+    "/movies/{movie_id}/similar",
+    summary="Obtenir les films similaires",
+    description=(
+        "Retourne les `k` films les plus proches d'un film selon leurs notes "
+        "(similarité cosinus ajustée item-item), lus dans un index précalculé "
+        "par `python -m api.build_similarity`. Les films sans voisin suffisamment "
+        "noté en commun retournent une liste vide."
+    ),
+    response_description="Films classés par similarité décroissante",
+    response_model=List[schemas.SimilarMovie],
+    tags=["Films"],
+)
+async def read_similar_movies(
+    request: Request,
+    movie_id: int = Path(..., description="L'ID unique du film"),
+    k: int = Query(10, ge=1, le=100, description="Nombre de films similaires à récupérer"),
+    db: DbSession = Depends(get_db)
+):
+    index = getattr(request.app.state, "similarity", None)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Index de similarité non construit")
+
+    neighbors = index.similar(movie_id, k)
+    if neighbors is None:
+        if not await helpers.movie_exists(db, movie_id):
+            raise HTTPException(status_code=404, detail="Film non trouvé")
+        return []
+
+    scores = dict(neighbors)
+    movies = await helpers.get_movies_by_ids(db, list(scores))
+    return [
+        schemas.SimilarMovie(movieId=movie.movieId, title=movie.title, genres=movie.genres, score=scores[movie.movieId])
+        for movie in movies
+    ]
+
 # Endpoint pour obtenir une liste de films avec (avec pagination et filtres optionnels title, genres, skip, limit)
 @app.get(
     "/movies",
@@ -93,17 +320,50 @@ def read_movie(
     response_description="Liste des films",
     response_model=List[schemas.MovieSimple],
     tags=["Films"],
+    responses=ARROW_RESPONSES,
 )
-def list_movies(
+async def list_movies(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Nombre de films à ignorer pour la pagination"),
     limit: int = Query(100, le=1000, description="Nombre maximum de films à récupérer"),
     title: str = Query(None, description="Filtre par titre de film"),
-    genres: str = Query(None, description="Filtre par genre de film"),
-    db: Session = Depends(get_db)
+    genres: str = Query(None, description="Filtre par genre exact, plusieurs genres séparés par des virgules"),
+    genres_match: Literal["any", "all"] = Query(
+        "any", description="any : au moins un des genres, all : tous les genres"
+    ),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: DbSession = Depends(get_db)
 ):
-    movies = helpers.get_movies(db, skip=skip, limit=limit, title=title, genres=genres)
+    check_cursor(cursor, skip, helpers.MOVIE_KEYS)
+    as_rows = wants_rows(request)
+    movies = await helpers.get_movies(db, skip=skip, limit=limit, title=title, genres=genres,
+                               genres_match=genres_match, cursor=cursor, as_rows=as_rows)
+    set_next_cursor(response, movies, limit, cursor, helpers.MOVIE_KEYS)
+    if as_rows:
+        return rows_page(request, response, movies, helpers.MOVIE_COLUMNS)
     return movies
 
+# Endpoint pour obtenir plusieurs évaluations en une requête
+@app.post(
+    "/ratings/batch",
+    summary="Obtenir plusieurs évaluations",
+    description=(
+        "Récupère jusqu'à 500 évaluations désignées par leurs couples "
+        "(userId, movieId), dans l'ordre demandé. Les couples sans évaluation "
+        "sont ignorés."
+    ),
+    response_description="Évaluations trouvées",
+    response_model=List[schemas.RatingSimple],
+    tags=["Évaluations"],
+)
+async def read_ratings_batch(
+    body: schemas.RatingKeys,
+    db: DbSession = Depends(get_db)
+):
+    keys = [(key.userId, key.movieId) for key in body.keys]
+    return await helpers.get_ratings_by_keys(db, keys)
+
 # Endpoint pour obtenir une évaluation par utilisateur et film
 @app.get(
     "/ratings/{user_id}/{movie_id}",
@@ -114,12 +374,12 @@ def list_movies(
     tags=["Évaluations"],
 )
 
-def read_rating(
+async def read_rating(
     user_id: int = Path(..., description="L'ID unique de l'utilisateur"),
     movie_id: int = Path(..., description="L'ID unique du film"),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    rating = helpers.get_rating(db, user_id, movie_id)
+    rating = await helpers.get_rating(db, user_id, movie_id)
 
     if rating is None:
         raise HTTPException(status_code=404, 
@@ -135,25 +395,36 @@ def read_rating(
     response_description="Liste des évaluations",
     response_model=List[schemas.RatingSimple],
     tags=["Évaluations"],
+    responses=ARROW_RESPONSES,
 )
-def list_ratings(
+async def list_ratings(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Nombre d'évaluations à ignorer pour la pagination"),
     limit: int = Query(100, le=1000, description="Nombre maximum d'évaluations à récupérer"),
     movies_id: int = Query(None, description="Filtre par ID de film"),
     user_id: int = Query(None, description="Filtre par ID d'utilisateur"),
     min_rating: float = Query(None, ge=0.0, le=5.0, description="Filtre par note minimale"),
     max_rating: float = Query(None, ge=0.0, le=5.0, description="Filtre par note maximale"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: DbSession = Depends(get_db)
 ):
-    ratings = helpers.get_ratings(
+    check_cursor(cursor, skip, helpers.RATING_KEYS)
+    as_rows = wants_rows(request)
+    ratings = await helpers.get_ratings(
         db,
         skip=skip,
         limit=limit,
         movies_id=movies_id,
         user_id=user_id,
         min_rating=min_rating,
-        max_rating=max_rating
+        max_rating=max_rating,
+        cursor=cursor,
+        as_rows=as_rows,
     )
+    set_next_cursor(response, ratings, limit, cursor, helpers.RATING_KEYS)
+    if as_rows:
+        return rows_page(request, response, ratings, helpers.RATING_COLUMNS)
     return ratings
 
 # Endpoint pour retourner un tag pour un utilisateur et un film donnés
@@ -168,13 +439,13 @@ def list_ratings(
     response_model=schemas.TagSimple,
     tags=["tags"],
 )
-def read_tag(
+async def read_tag(
     user_id: int = Path(..., description="ID de l'utilisateur"),
     movie_id: int = Path(..., description="ID du film"),
     tag_text: str = Path(..., description="Contenu exact du tag"),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    result = helpers.get_tag(
+    result = await helpers.get_tag(
         db,
         user_id=user_id,
         movie_id=movie_id,
@@ -201,23 +472,53 @@ def read_tag(
     ),
     response_model=List[schemas.TagSimple],
     tags=["tags"],
+    responses=ARROW_RESPONSES,
 )
-def list_tags(
+async def list_tags(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Nombre de résultats à ignorer"),
     limit: int = Query(
         100, le=1000, description="Nombre maximal de résultats à retourner"
     ),
     movie_id: Optional[int] = Query(None, description="Filtrer par ID de film"),
     user_id: Optional[int] = Query(None, description="Filtrer par ID d'utilisateur"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: DbSession = Depends(get_db),
 ):
-    return helpers.get_tags(
+    check_cursor(cursor, skip, helpers.TAG_KEYS)
+    as_rows = wants_rows(request)
+    tags = await helpers.get_tags(
         db,
         skip=skip,
         limit=limit,
         movie_id=movie_id,
         user_id=user_id,
+        cursor=cursor,
+        as_rows=as_rows,
     )
+    set_next_cursor(response, tags, limit, cursor, helpers.TAG_KEYS)
+    if as_rows:
+        return rows_page(request, response, tags, helpers.TAG_COLUMNS)
+    return tags
+
+
+# Endpoint pour retourner les liens de plusieurs films en une requête
+@app.post(
+    "/links/batch",
+    summary="Obtenir les liens de plusieurs films",
+    description=(
+        "Retourne les identifiants IMDB et TMDB de jusqu'à 500 films en une "
+        "seule requête, dans l'ordre des IDs demandés. Les IDs inconnus sont ignorés."
+    ),
+    response_model=List[schemas.LinkSimple],
+    tags=["links"],
+)
+async def read_links_batch(
+    body: schemas.MovieIds,
+    db: DbSession = Depends(get_db),
+):
+    return await helpers.get_links_by_ids(db, body.ids)
 
 
 # Endpoint pour retourner les identifiants IMDB et TMDB pour un film donné
@@ -228,11 +529,11 @@ def list_tags(
     response_model=schemas.LinkSimple,
     tags=["links"],
 )
-def read_link(
+async def read_link(
     movie_id: int = Path(..., description="ID du film"),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    result = helpers.get_link(db, movie_id=movie_id)
+    result = await helpers.get_link(db, movie_id=movie_id)
     if result is None:
         raise HTTPException(
             status_code=404,
@@ -251,15 +552,25 @@ def read_link(
     ),
     response_model=List[schemas.LinkSimple],
     tags=["links"],
+    responses=ARROW_RESPONSES,
 )
-def list_links(
+async def list_links(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Nombre de résultats à ignorer"),
     limit: int = Query(
         100, le=1000, description="Nombre maximal de résultats à retourner"
     ),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: DbSession = Depends(get_db),
 ):
-    return helpers.get_links(db, skip=skip, limit=limit)
+    check_cursor(cursor, skip, helpers.LINK_KEYS)
+    as_rows = wants_rows(request)
+    links = await helpers.get_links(db, skip=skip, limit=limit, cursor=cursor, as_rows=as_rows)
+    set_next_cursor(response, links, limit, cursor, helpers.LINK_KEYS)
+    if as_rows:
+        return rows_page(request, response, links, helpers.LINK_COLUMNS)
+    return links
 
 
 # Endpoint pour obtenir des statistiques sur la base de données
@@ -277,18 +588,89 @@ def list_links(
     response_model=schemas.AnalyticsResponse,
     tags=["analytics"],
 )
-def get_analytics(db: Session = Depends(get_db)):
-    movie_count = helpers.get_movie_count(db)
-    rating_count = helpers.get_rating_count(db)
-    tag_count = helpers.get_tag_count(db)
-    link_count = helpers.get_link_count(db)
+async def get_analytics(db: DbSession = Depends(get_db)):
+    # compteurs matérialisés dans table_stats : une seule lecture par clé primaire
+    counts = await helpers.get_table_counts(db)
 
     return schemas.AnalyticsResponse(
-        movie_count=movie_count,
-        rating_count=rating_count,
-        tag_count=tag_count,
-        link_count=link_count,
+        movie_count=counts["movies"],
+        rating_count=counts["ratings"],
+        tag_count=counts["tags"],
+        link_count=counts["links"],
     )
 
 
+# Endpoints d'export en streaming (NDJSON, CSV, Arrow ou Parquet), sans limite de taille
+EXPORT_FORMAT_DESCRIPTION = (
+    "Format de sortie : ndjson (un objet JSON par ligne), csv, arrow (flux Arrow IPC) ou parquet"
+)
+ExportFormat = Literal["ndjson", "csv", "arrow", "parquet"]
 
+
+@app.get(
+    "/export/movies",
+    summary="Exporter les films",
+    description="Exporte tous les films (filtres de /movies) en streaming.",
+    response_description="Flux NDJSON, CSV, Arrow ou Parquet",
+    tags=["export"],
+)
+async def export_movies(
+    fmt: ExportFormat = Query("ndjson", alias="format", description=EXPORT_FORMAT_DESCRIPTION),
+    title: str = Query(None, description="Filtre par titre de film"),
+    genres: str = Query(None, description="Filtre par genre exact, plusieurs genres séparés par des virgules"),
+    genres_match: Literal["any", "all"] = Query("any", description="any : au moins un des genres, all : tous les genres"),
+):
+    statement = helpers.export_movies_statement(title=title, genres=genres, genres_match=genres_match)
+    return export.streaming_response(statement, fmt, "movies")
+
+
+@app.get(
+    "/export/ratings",
+    summary="Exporter les évaluations",
+    description="Exporte toutes les évaluations (filtres de /ratings) en streaming.",
+    response_description="Flux NDJSON, CSV, Arrow ou Parquet",
+    tags=["export"],
+)
+async def export_ratings(
+    fmt: ExportFormat = Query("ndjson", alias="format", description=EXPORT_FORMAT_DESCRIPTION),
+    movies_id: int = Query(None, description="Filtre par ID de film"),
+    user_id: int = Query(None, description="Filtre par ID d'utilisateur"),
+    min_rating: float = Query(None, ge=0.0, le=5.0, description="Filtre par note minimale"),
+    max_rating: float = Query(None, ge=0.0, le=5.0, description="Filtre par note maximale"),
+):
+    statement = helpers.export_ratings_statement(
+        movies_id=movies_id,
+        user_id=user_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+    )
+    return export.streaming_response(statement, fmt, "ratings")
+
+
+@app.get(
+    "/export/tags",
+    summary="Exporter les tags",
+    description="Exporte tous les tags (filtres de /tags) en streaming.",
+    response_description="Flux NDJSON, CSV, Arrow ou Parquet",
+    tags=["export"],
+)
+async def export_tags(
+    fmt: ExportFormat = Query("ndjson", alias="format", description=EXPORT_FORMAT_DESCRIPTION),
+    movie_id: Optional[int] = Query(None, description="Filtrer par ID de film"),
+    user_id: Optional[int] = Query(None, description="Filtrer par ID d'utilisateur"),
+):
+    statement = helpers.export_tags_statement(movie_id=movie_id, user_id=user_id)
+    return export.streaming_response(statement, fmt, "tags")
+
+
+@app.get(
+    "/export/links",
+    summary="Exporter les liens des films",
+    description="Exporte tous les identifiants IMDB et TMDB en streaming.",
+    response_description="Flux NDJSON, CSV, Arrow ou Parquet",
+    tags=["export"],
+)
+async def export_links(
+    fmt: ExportFormat = Query("ndjson", alias="format", description=EXPORT_FORMAT_DESCRIPTION),
+):
+    return export.streaming_response(helpers.export_links_statement(), fmt, "links")
@@ -0,0 +1,208 @@
+"""Métriques Prometheus de l'API, exposées sur /metrics.
+
+Le middleware mesure chaque requête HTTP par modèle de route
+(`/movies/{movie_id}` et non `/movies/42`) : durée, requêtes en cours,
+taille des réponses et statut. Les événements `before_cursor_execute` /
+`after_cursor_execute` des moteurs SQLAlchemy (voir database.py) mesurent
+chaque requête SQL et l'attribuent à la route en cours, via une variable de
+contexte : le nombre de requêtes SQL par appel révèle les N+1, la durée par
+instruction les parcours de table.
+
+Configuration par variables d'environnement :
+    API_METRICS_ENABLED        1 (défaut) ou 0
+    PROMETHEUS_MULTIPROC_DIR   dossier partagé par les workers gunicorn
+                               (mode multiprocessus de prometheus_client)
+"""
+
+import os
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+METRICS_ENABLED = os.getenv("API_METRICS_ENABLED", "1") == "1"
+
+# Route des requêtes qui ne correspondent à aucun endpoint (404) : une seule
+# série plutôt qu'une par chemin inconnu
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+REQUESTS = Counter(
+    "http_requests", "Requêtes HTTP traitées", ["method", "route", "status"], registry=REGISTRY
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requêtes HTTP en cours",
+    ["method", "route"], multiprocess_mode="livesum", registry=REGISTRY,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Taille des corps de réponse",
+    ["method", "route"], buckets=SIZE_BUCKETS, registry=REGISTRY,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS, registry=REGISTRY,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Temps passé en requêtes SQL par requête HTTP",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL, par route et par instruction",
+    ["route", "statement"], buckets=QUERY_BUCKETS, registry=REGISTRY,
+)
+
+
+class RequestStats:
+    """Requêtes SQL de la requête HTTP en cours."""
+
+    __slots__ = ("route", "queries", "db_seconds")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("metrics_request", default=None)
+
+# L'opération est lue par anticipation : le mot-clé UPDATE est aussi celui qui précède la table
+STATEMENT_PATTERN = re.compile(r"^\s*(?=(\w+))(?:.*?\b(?:FROM|INTO|UPDATE)\s+[\"`]?(\w+))?", re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=1024)
+def statement_label(statement: str) -> str:
+    """Étiquette courte d'une instruction SQL : opération et première table ("SELECT ratings")."""
+    match = STATEMENT_PATTERN.match(statement)
+    if match is None:
+        return "other"
+    operation, table = match.groups()
+    return f"{operation.upper()} {table}" if table else operation.upper()
+
+
+def instrument_engine(engine):
+    """Mesure les requêtes SQL d'un moteur synchrone (`async_engine.sync_engine` pour aiosqlite)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        route = stats.route if stats is not None else "none"
+        DB_QUERY_DURATION.labels(route, statement_label(statement)).observe(elapsed)
+
+
+class RouteMetrics:
+    """Séries d'une route et d'une méthode, résolues une fois (`labels()` prend un verrou)."""
+
+    __slots__ = ("in_progress", "duration", "size", "queries", "db_duration", "requests", "_labels")
+
+    def __init__(self, method: str, route: str):
+        self._labels = (method, route)
+        self.in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        self.duration = REQUEST_DURATION.labels(method, route)
+        self.size = RESPONSE_SIZE.labels(method, route)
+        self.queries = REQUEST_QUERIES.labels(method, route)
+        self.db_duration = REQUEST_DB_DURATION.labels(method, route)
+        self.requests = {}
+
+    def count(self, status: int):
+        counter = self.requests.get(status)
+        if counter is None:
+            counter = self.requests[status] = REQUESTS.labels(*self._labels, str(status))
+        counter.inc()
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : latence, requêtes en cours, taille des réponses et requêtes SQL par route."""
+
+    def __init__(self, app, routes):
+        self.app = app
+        # liste des routes de l'application, complétée après l'ajout du middleware
+        self.routes = routes
+        self._metrics = {}
+
+    def _route(self, scope) -> str:
+        """Modèle de la route qui traitera la requête, résolu comme le routeur
+        (premier chemin et méthode correspondants) sans convertir les paramètres."""
+        path, method = scope["path"], scope["method"]
+        for route in self.routes:
+            methods = getattr(route, "methods", None)
+            if route.path_regex.match(path) and (methods is None or method in methods):
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], self._route(scope))
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = RouteMetrics(*key)
+        stats = RequestStats(key[1])
+        token = _current_request.set(stats)
+        response = {"status": 500, "size": 0}
+
+        async def send_and_measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_progress.dec()
+            _current_request.reset(token)
+            metrics.count(response["status"])
+            metrics.duration.observe(elapsed)
+            metrics.size.observe(response["size"])
+            metrics.queries.observe(stats.queries)
+            metrics.db_duration.observe(stats.db_seconds)
+
+
+def metrics_response() -> Response:
+    """Métriques au format texte de Prometheus, agrégées sur tous les workers en mode multiprocessus."""
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(
+        generate_latest(registry),
+        media_type=CONTENT_TYPE_LATEST,
+        headers={"Cache-Control": "no-store"},
+    )
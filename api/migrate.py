@@ -0,0 +1,131 @@
+"""Mise à jour des index d'une base existante et rapport des plans de requête.
+
+Crée les tables et les index déclarés sur les modèles qui manquent encore
+dans movies.db (sans recharger les données), remplit les tables dérivées
+(index plein texte, compteurs), met à jour les statistiques
+de l'optimiseur puis affiche le `EXPLAIN QUERY PLAN` de chaque requête des
+query helpers.
+
+Usage :
+    python -m api.migrate [--explain-only]
+"""
+
+import argparse
+
+from sqlalchemy import event, inspect
+
+from .database import Base, SessionLocal, create_database_engine, engine
+from . import query_helpers as helpers
+
+# Appels représentatifs de chaque query helper
+HELPER_CALLS = (
+    ("get_movie", lambda db: helpers.get_movie(db, 1)),
+    ("get_movie(ratings_limit, tags_limit)", lambda db: helpers.get_movie(db, 1, ratings_limit=20, tags_limit=20)),
+    ("get_movies", lambda db: helpers.get_movies(db)),
+    ("get_movies(title)", lambda db: helpers.get_movies(db, title="Story")),
+    ("get_movies(genres)", lambda db: helpers.get_movies(db, genres="Comedy,Drama", genres_match="all")),
+    ("get_movies(cursor)", lambda db: helpers.get_movies(db, cursor=helpers.encode_cursor([1]))),
+    ("get_movies_by_ids", lambda db: helpers.get_movies_by_ids(db, [1, 2, 3])),
+    ("get_movie_stats", lambda db: helpers.get_movie_stats(db, 1)),
+    ("search_movies", lambda db: helpers.search_movies(db, "toy sto")),
+    ("get_rating", lambda db: helpers.get_rating(db, 1, 1)),
+    ("get_ratings", lambda db: helpers.get_ratings(db)),
+    ("get_ratings(movies_id)", lambda db: helpers.get_ratings(db, movies_id=1)),
+    ("get_ratings(movies_id, min_rating)", lambda db: helpers.get_ratings(db, movies_id=1, min_rating=4.0)),
+    ("get_ratings(user_id)", lambda db: helpers.get_ratings(db, user_id=1)),
+    ("get_ratings(min_rating, max_rating)", lambda db: helpers.get_ratings(db, min_rating=2.0, max_rating=3.0)),
+    ("get_ratings(cursor)", lambda db: helpers.get_ratings(db, cursor=helpers.encode_cursor([1, 1]))),
+    ("get_ratings_by_keys", lambda db: helpers.get_ratings_by_keys(db, [(1, 1), (1, 3)])),
+    ("get_tag", lambda db: helpers.get_tag(db, 2, 60756, "funny")),
+    ("get_tags(movie_id)", lambda db: helpers.get_tags(db, movie_id=60756)),
+    ("get_tags(user_id)", lambda db: helpers.get_tags(db, user_id=2)),
+    ("get_link", lambda db: helpers.get_link(db, 1)),
+    ("get_links_by_ids", lambda db: helpers.get_links_by_ids(db, [1, 2, 3])),
+    ("get_links", lambda db: helpers.get_links(db)),
+    ("get_table_counts", helpers.get_table_counts),
+    ("get_movie_count", helpers.get_movie_count),
+    ("get_rating_count", helpers.get_rating_count),
+    ("get_tag_count", helpers.get_tag_count),
+    ("get_link_count", helpers.get_link_count),
+)
+
+
+def create_missing_indexes(write_engine=None) -> list:
+    """Crée les tables, tables dérivées et index manquants, retourne le nom des index créés.
+
+    Les tables dérivées (movies_fts, table_stats, movie_stats) sont créées
+    si besoin et remplies depuis les tables chargées par les DDL de models.py.
+    """
+    # moteur en écriture, quel que soit le profil utilisé par l'API
+    owned = write_engine is None
+    if owned:
+        write_engine = create_database_engine("write")
+    Base.metadata.create_all(write_engine)
+    created = []
+    with write_engine.begin() as conn:
+        existing = {
+            index["name"]
+            for table in inspect(conn).get_table_names()
+            for index in inspect(conn).get_indexes(table)
+        }
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    created.append(index.name)
+        conn.exec_driver_sql("ANALYZE")
+    if owned:
+        write_engine.dispose()
+    return created
+
+
+def capture_statements(call) -> list:
+    """Exécute un query helper et retourne les requêtes SQL qu'il émet."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        with SessionLocal() as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def explain(statement: str, parameters) -> list:
+    """Retourne le plan de requête SQLite sous forme de lignes indentées."""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append(f"{'  ' * depth[node_id]}{detail}")
+    return lines
+
+
+def report_query_plans():
+    for name, call in HELPER_CALLS:
+        print(f"\n== {name}")
+        for statement, parameters in capture_statements(call):
+            print("   " + " ".join(statement.split()))
+            for line in explain(statement, parameters):
+                print(f"     {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajoute les index manquants et affiche les plans de requête.")
+    parser.add_argument("--explain-only", action="store_true", help="N'affiche que les plans, sans modifier la base")
+    args = parser.parse_args()
+
+    if not args.explain_only:
+        created = create_missing_indexes()
+        print(f"Index créés : {', '.join(created) if created else 'aucun'}")
+    report_query_plans()
+
+
+if __name__ == "__main__":
+    main()
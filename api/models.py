@@ -1,6 +1,6 @@
 """SQLAlchemy models for the application"""
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship  # permet de définir des relations entre les tables
 from .database import Base
 
@@ -17,22 +17,93 @@ class Movie(Base):
     tags = relationship("Tag", back_populates="movie", cascade="all, delete")
     link = relationship("Link", back_populates="movie", uselist=False, cascade="all, delete") 
 
+# Index plein texte FTS5 sur les titres (contenu externe : la table movies),
+# tenu à jour par triggers. Il n'est pas déclarable comme modèle ORM : il est
+# créé s'il manque, puis reconstruit depuis movies, à chaque create_all (base
+# neuve ou `python -m api.migrate` sur une base existante).
+MOVIES_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+    "title, content='movies', content_rowid='movieId', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN "
+    "INSERT INTO movies_fts(rowid, title) VALUES (new.movieId, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN "
+    "INSERT INTO movies_fts(movies_fts, rowid, title) VALUES ('delete', old.movieId, old.title); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title ON movies BEGIN "
+    "INSERT INTO movies_fts(movies_fts, rowid, title) VALUES ('delete', old.movieId, old.title); "
+    "INSERT INTO movies_fts(rowid, title) VALUES (new.movieId, new.title); END",
+    # réindexe tous les titres : remplit un index créé sur une base existante
+    "INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')",
+)
+
+for statement in MOVIES_FTS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+event.listen(Movie.__table__, "before_drop", DDL("DROP TABLE IF EXISTS movies_fts"))
+
+class MovieGenre(Base):
+    """Genres d'un film, un par ligne, tirés de `Movie.genres` (voir MOVIE_GENRES_DDL)."""
+    __tablename__ = "movie_genres"
+
+    # (genre, movieId) : la clé primaire sert d'index pour filtrer par genre
+    genre = Column(String(collation="NOCASE"), primary_key=True)
+    movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True, index=True)
+
+
+def _insert_movie_genres(source: str) -> str:
+    """Insère les genres des films de `source` (colonnes movieId, genres), éclatés sur "|"."""
+    return (
+        "INSERT OR IGNORE INTO movie_genres (genre, movieId) "
+        "WITH RECURSIVE split(movieId, genre, rest) AS ("
+        f"SELECT movieId, '', genres || '|' FROM {source} "
+        "UNION ALL SELECT movieId, substr(rest, 1, instr(rest, '|') - 1), substr(rest, instr(rest, '|') + 1) "
+        "FROM split WHERE rest <> '') "
+        "SELECT genre, movieId FROM split WHERE genre <> ''"
+    )
+
+
+# movie_genres est remplie depuis movies.genres à chaque create_all (base neuve
+# ou `python -m api.migrate` sur une base existante), puis suit movies par triggers.
+MOVIE_GENRES_DDL = (
+    _insert_movie_genres("movies"),
+    "CREATE TRIGGER IF NOT EXISTS movies_genres_insert AFTER INSERT ON movies BEGIN "
+    + _insert_movie_genres("(SELECT NEW.movieId AS movieId, NEW.genres AS genres)") + "; END",
+    "CREATE TRIGGER IF NOT EXISTS movies_genres_delete AFTER DELETE ON movies BEGIN "
+    "DELETE FROM movie_genres WHERE movieId = OLD.movieId; END",
+    "CREATE TRIGGER IF NOT EXISTS movies_genres_update AFTER UPDATE OF movieId, genres ON movies BEGIN "
+    "DELETE FROM movie_genres WHERE movieId = OLD.movieId; "
+    + _insert_movie_genres("(SELECT NEW.movieId AS movieId, NEW.genres AS genres)") + "; END",
+)
+
+for statement in MOVIE_GENRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
 class Rating(Base):
     __tablename__ = "ratings"
+    __table_args__ = (
+        # notes d'un film, éventuellement filtrées par min_rating / max_rating
+        Index("ix_ratings_movieId_rating", "movieId", "rating"),
+        # notes les plus récentes d'un film (ratings_limit de /movies/{movie_id})
+        Index("ix_ratings_movieId_timestamp", "movieId", "timestamp"),
+    )
 
     userId = Column(Integer, primary_key=True, index=True)
     movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True)
     rating = Column(Float)
-    timestamp = Column(Integer)
+    timestamp = Column(Integer, index=True)
     
     movie = relationship("Movie", back_populates="ratings")
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        # tags les plus récents d'un film (tags_limit de /movies/{movie_id})
+        Index("ix_tags_movieId_timestamp", "movieId", "timestamp"),
+    )
 
     userId = Column(Integer, primary_key=True, index=True)
-    movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True)
-    tag = Column(String)
+    movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True, index=True)
+    # un utilisateur peut poser plusieurs tags sur un même film
+    tag = Column(String, primary_key=True)
     timestamp = Column(Integer)
     
     movie = relationship("Movie", back_populates="tags")
@@ -44,4 +115,133 @@ class Link(Base):
     imdbId = Column(String)
     tmdbId = Column(String)
 
-    movie = relationship("Movie", back_populates="link")
\ No newline at end of file
+    movie = relationship("Movie", back_populates="link")
+
+
+class TableStat(Base):
+    """Nombre de lignes de chaque table, écrit au chargement puis tenu à jour par triggers."""
+    __tablename__ = "table_stats"
+
+    table_name = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+
+
+# Compteurs matérialisés : /analytics lit table_stats au lieu de lancer un
+# COUNT(*) (parcours complet) sur chaque table.
+COUNTED_TABLES = ("movies", "ratings", "tags", "links")
+
+TABLE_STATS_DDL = tuple(
+    statement
+    for name in COUNTED_TABLES
+    for statement in (
+        f"INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT '{name}', count(*) FROM {name}",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_count_insert AFTER INSERT ON {name} BEGIN "
+        f"UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = '{name}'; END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_count_delete AFTER DELETE ON {name} BEGIN "
+        f"UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = '{name}'; END",
+    )
+)
+
+# Les triggers portent sur plusieurs tables : on les crée une fois toutes
+# les tables en place.
+for statement in TABLE_STATS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+
+class MovieStats(Base):
+    """Agrégats des notes et tags d'un film, construits au chargement puis tenus à jour par triggers."""
+    __tablename__ = "movie_stats"
+
+    movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True)
+    rating_count = Column(Integer, nullable=False, server_default="0")
+    # somme et somme des carrés : moyenne et écart-type se maintiennent par incréments
+    rating_sum = Column(Float, nullable=False, server_default="0")
+    rating_sum_squares = Column(Float, nullable=False, server_default="0")
+    tag_count = Column(Integer, nullable=False, server_default="0")
+    first_rating_timestamp = Column(Integer)
+    last_rating_timestamp = Column(Integer)
+
+
+class MovieRatingBucket(Base):
+    """Histogramme des notes d'un film par tranche de 0,5 étoile."""
+    __tablename__ = "movie_rating_histogram"
+
+    movieId = Column(Integer, ForeignKey("movies.movieId"), primary_key=True)
+    bucket = Column(Float, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+def _rating_added(row: str) -> str:
+    return (
+        "INSERT INTO movie_stats (movieId, rating_count, rating_sum, rating_sum_squares, tag_count, "
+        "first_rating_timestamp, last_rating_timestamp) "
+        f"VALUES ({row}.movieId, 1, {row}.rating, {row}.rating * {row}.rating, 0, {row}.timestamp, {row}.timestamp) "
+        "ON CONFLICT (movieId) DO UPDATE SET "
+        "rating_count = rating_count + 1, "
+        "rating_sum = rating_sum + excluded.rating_sum, "
+        "rating_sum_squares = rating_sum_squares + excluded.rating_sum_squares, "
+        "first_rating_timestamp = min(coalesce(first_rating_timestamp, excluded.first_rating_timestamp), "
+        "excluded.first_rating_timestamp), "
+        "last_rating_timestamp = max(coalesce(last_rating_timestamp, excluded.last_rating_timestamp), "
+        "excluded.last_rating_timestamp); "
+        "INSERT INTO movie_rating_histogram (movieId, bucket, count) "
+        f"VALUES ({row}.movieId, round({row}.rating * 2) / 2.0, 1) "
+        "ON CONFLICT (movieId, bucket) DO UPDATE SET count = count + 1; "
+    )
+
+
+def _rating_removed(row: str) -> str:
+    # min / max ne se décrémentent pas : on les recalcule pour ce film (index sur movieId)
+    return (
+        "UPDATE movie_stats SET "
+        "rating_count = rating_count - 1, "
+        f"rating_sum = rating_sum - {row}.rating, "
+        f"rating_sum_squares = rating_sum_squares - {row}.rating * {row}.rating, "
+        f"first_rating_timestamp = (SELECT min(timestamp) FROM ratings WHERE movieId = {row}.movieId), "
+        f"last_rating_timestamp = (SELECT max(timestamp) FROM ratings WHERE movieId = {row}.movieId) "
+        f"WHERE movieId = {row}.movieId; "
+        "UPDATE movie_rating_histogram SET count = count - 1 "
+        f"WHERE movieId = {row}.movieId AND bucket = round({row}.rating * 2) / 2.0; "
+    )
+
+
+def _tag_added(row: str) -> str:
+    return (
+        f"INSERT INTO movie_stats (movieId, tag_count) VALUES ({row}.movieId, 1) "
+        "ON CONFLICT (movieId) DO UPDATE SET tag_count = tag_count + 1; "
+    )
+
+
+def _tag_removed(row: str) -> str:
+    return f"UPDATE movie_stats SET tag_count = tag_count - 1 WHERE movieId = {row}.movieId; "
+
+
+MOVIE_STATS_DDL = (
+    "INSERT OR IGNORE INTO movie_stats (movieId, rating_count, rating_sum, rating_sum_squares, tag_count, "
+    "first_rating_timestamp, last_rating_timestamp) "
+    "SELECT movies.movieId, coalesce(r.n, 0), coalesce(r.s, 0), coalesce(r.ss, 0), coalesce(t.n, 0), "
+    "r.first_ts, r.last_ts FROM movies "
+    "LEFT JOIN (SELECT movieId, count(*) AS n, sum(rating) AS s, sum(rating * rating) AS ss, "
+    "min(timestamp) AS first_ts, max(timestamp) AS last_ts FROM ratings GROUP BY movieId) AS r "
+    "ON r.movieId = movies.movieId "
+    "LEFT JOIN (SELECT movieId, count(*) AS n FROM tags GROUP BY movieId) AS t "
+    "ON t.movieId = movies.movieId",
+    "INSERT OR IGNORE INTO movie_rating_histogram (movieId, bucket, count) "
+    "SELECT movieId, round(rating * 2) / 2.0, count(*) FROM ratings GROUP BY 1, 2",
+    "CREATE TRIGGER IF NOT EXISTS ratings_movie_stats_insert AFTER INSERT ON ratings BEGIN "
+    + _rating_added("NEW") + "END",
+    "CREATE TRIGGER IF NOT EXISTS ratings_movie_stats_delete AFTER DELETE ON ratings BEGIN "
+    + _rating_removed("OLD") + "END",
+    "CREATE TRIGGER IF NOT EXISTS ratings_movie_stats_update "
+    "AFTER UPDATE OF movieId, rating, timestamp ON ratings BEGIN "
+    + _rating_removed("OLD") + _rating_added("NEW") + "END",
+    "CREATE TRIGGER IF NOT EXISTS tags_movie_stats_insert AFTER INSERT ON tags BEGIN "
+    + _tag_added("NEW") + "END",
+    "CREATE TRIGGER IF NOT EXISTS tags_movie_stats_delete AFTER DELETE ON tags BEGIN "
+    + _tag_removed("OLD") + "END",
+    "CREATE TRIGGER IF NOT EXISTS tags_movie_stats_update AFTER UPDATE OF movieId ON tags BEGIN "
+    + _tag_removed("OLD") + _tag_added("NEW") + "END",
+)
+
+for statement in MOVIE_STATS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
@@ -1,24 +1,212 @@
+import base64
+import json
+import math
+import re
+
 from fastapi import FastAPI, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import Integer, and_, cast, func, or_, select, text, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Optional, Tuple
 
 from .import models
 
+# Pagination par curseur (keyset) : on pagine sur la clé primaire au lieu
+# d'un OFFSET, que SQLite doit parcourir puis jeter ligne à ligne.
+
+MOVIE_KEYS = (models.Movie.movieId,)
+RATING_KEYS = (models.Rating.userId, models.Rating.movieId)
+TAG_KEYS = (models.Tag.userId, models.Tag.movieId, models.Tag.tag)
+LINK_KEYS = (models.Link.movieId,)
+
+# Colonnes exposées par l'API, lues en tuples (sans objets ORM) par les
+# sorties en colonnes (Arrow, Parquet) et les exports.
+
+MOVIE_COLUMNS = (models.Movie.movieId, models.Movie.title, models.Movie.genres)
+RATING_COLUMNS = (models.Rating.userId, models.Rating.movieId, models.Rating.rating, models.Rating.timestamp)
+TAG_COLUMNS = (models.Tag.userId, models.Tag.movieId, models.Tag.tag, models.Tag.timestamp)
+# tmdbId est stocké en texte mais exposé en entier par l'API
+LINK_COLUMNS = (models.Link.movieId, models.Link.imdbId, cast(models.Link.tmdbId, Integer).label("tmdbId"))
+
+
+def encode_cursor(values) -> str:
+    """Encode les valeurs de clé primaire d'une ligne en curseur opaque."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Décode un curseur opaque, lève ValueError s'il est invalide."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise ValueError(f"Curseur invalide : {cursor!r}") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Curseur invalide : {cursor!r}")
+    # seules des valeurs de clé scalaires peuvent être comparées en SQL
+    if any(isinstance(value, bool) or not isinstance(value, (int, float, str)) for value in values):
+        raise ValueError(f"Curseur invalide : {cursor!r}")
+    return values
+
+
+def _entities(model, columns, as_rows: bool):
+    """Objets ORM du modèle, ou tuples des colonnes exposées si `as_rows`."""
+    return columns if as_rows else (model,)
+
+
+def next_cursor(rows, limit: int, keys) -> Optional[str]:
+    """Retourne le curseur de la page suivante, ou None si la page est la dernière."""
+    if not rows or len(rows) < limit:
+        return None
+    return encode_cursor(getattr(rows[-1], key.key) for key in keys)
+
+
+def _paginate(query, keys, skip: int, limit: int, cursor: Optional[str]):
+    """Pagine par OFFSET, ou par clé primaire si un curseur est fourni ("" pour la première page)."""
+    if cursor is None:
+        return query.offset(skip).limit(limit).all()
+
+    query = query.order_by(*keys)
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        if len(keys) == 1:
+            query = query.filter(keys[0] > values[0])
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+    return query.limit(limit).all()
+
 # Films
 
-def get_movie(db: Session, movie_id: int):
-    """Récupère un film par son ID."""
-    return db.query(models.Movie).filter(models.Movie.movieId == movie_id).first()
+def get_movie(db: Session, movie_id: int, ratings_limit: Optional[int] = None,
+              tags_limit: Optional[int] = None):
+    """Récupère un film par son ID avec ses notes, tags et lien chargés d'avance.
+
+    `ratings_limit` / `tags_limit` bornent le nombre de notes et de tags
+    embarqués (les plus récents d'abord, 0 pour les omettre) ; None les charge
+    tous en une requête `selectinload`.
+    """
+    query = db.query(models.Movie).options(joinedload(models.Movie.link))
+    if ratings_limit is None:
+        query = query.options(selectinload(models.Movie.ratings))
+    if tags_limit is None:
+        query = query.options(selectinload(models.Movie.tags))
+    movie = query.filter(models.Movie.movieId == movie_id).first()
+
+    if movie is not None:
+        if ratings_limit is not None:
+            set_committed_value(movie, "ratings", _latest(db, models.Rating, movie_id, ratings_limit))
+        if tags_limit is not None:
+            set_committed_value(movie, "tags", _latest(db, models.Tag, movie_id, tags_limit))
+    return movie
+
+def _latest(db: Session, model, movie_id: int, limit: int) -> list:
+    """Retourne les `limit` lignes les plus récentes d'un film (notes ou tags)."""
+    if limit == 0:
+        return []
+    return (
+        db.query(model)
+        .filter(model.movieId == movie_id)
+        .order_by(model.timestamp.desc())
+        .limit(limit)
+        .all()
+    )
+
+def _in_request_order(rows, requested, key) -> list:
+    """Remet les lignes d'une requête IN dans l'ordre demandé (doublons et absents ignorés)."""
+    found = {key(row): row for row in rows}
+    return [found[value] for value in dict.fromkeys(requested) if value in found]
+
+def get_movies_by_ids(db: Session, movie_ids: List[int]):
+    """Récupère plusieurs films en une requête `IN`, dans l'ordre des IDs demandés."""
+    movies = db.query(models.Movie).filter(models.Movie.movieId.in_(set(movie_ids))).all()
+    return _in_request_order(movies, movie_ids, lambda movie: movie.movieId)
 
-def get_movies(db: Session, skip: int = 0, limit: int = 100, title: str = None, genres: str = None):
-    """Récupère une liste de films optionnels."""
-    query = db.query(models.Movie)
-    
+def movie_exists(db: Session, movie_id: int) -> bool:
+    """Indique si un film existe, sans charger ses relations."""
+    return db.query(models.Movie.movieId).filter(models.Movie.movieId == movie_id).first() is not None
+
+def split_genres(genres: str) -> List[str]:
+    """Découpe "Comedy,Drama" ou "Comedy|Drama" en liste de genres."""
+    return [genre.strip() for genre in re.split(r"[,|]", genres) if genre.strip()]
+
+def get_movies(db: Session, skip: int = 0, limit: int = 100, title: str = None, genres: str = None,
+               cursor: Optional[str] = None, genres_match: str = "any", as_rows: bool = False):
+    """Récupère une liste de films optionnels.
+
+    Les genres sont comparés exactement (sans tenir compte de la casse) via la
+    table movie_genres : `genres_match="any"` retourne les films ayant au moins
+    un des genres, `"all"` ceux qui les ont tous. `as_rows` retourne des
+    tuples de `MOVIE_COLUMNS` au lieu d'objets ORM.
+    """
+    query = filter_movies(db.query(*_entities(models.Movie, MOVIE_COLUMNS, as_rows)), title, genres, genres_match)
+    return _paginate(query, MOVIE_KEYS, skip, limit, cursor)
+
+def filter_movies(query, title: str = None, genres: str = None, genres_match: str = "any"):
+    """Applique les filtres de /movies à une requête ORM ou à un select()."""
     if title:
         query = query.filter(models.Movie.title.like(f"%{title}%"))
     if genres:
-        query = query.filter(models.Movie.genres.like(f"%{genres}%"))
-    return query.offset(skip).limit(limit).all()
+        names = split_genres(genres)
+        movie_ids = select(models.MovieGenre.movieId).where(models.MovieGenre.genre.in_(names))
+        distinct_names = {name.lower() for name in names}
+        if genres_match == "all" and len(distinct_names) > 1:
+            movie_ids = movie_ids.group_by(models.MovieGenre.movieId).having(
+                func.count() == len(distinct_names)
+            )
+        query = query.filter(models.Movie.movieId.in_(movie_ids))
+    return query
+def fts_query(search: str) -> str:
+    """Convertit une saisie libre en requête FTS5.
+
+    Chaque mot devient un terme entre guillemets (pas d'injection de syntaxe
+    FTS5) et le dernier un préfixe, pour l'autocomplétion.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return ""
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+def search_movies(db: Session, search: str, limit: int = 20):
+    """Recherche plein texte dans les titres, résultats classés par pertinence (bm25)."""
+    query = fts_query(search)
+    if not query:
+        return []
+    statement = text(
+        "SELECT movies.* FROM movies_fts JOIN movies ON movies.movieId = movies_fts.rowid "
+        "WHERE movies_fts MATCH :query ORDER BY movies_fts.rank LIMIT :limit"
+    )
+    return db.query(models.Movie).from_statement(statement).params(query=query, limit=limit).all()
+# Tranches de l'histogramme des notes (0,5 à 5 étoiles)
+RATING_BUCKETS = tuple(step / 2 for step in range(1, 11))
+
+def get_movie_stats(db: Session, movie_id: int) -> Optional[dict]:
+    """Retourne les agrégats précalculés des notes et tags d'un film, None si le film n'existe pas."""
+    stats = db.query(models.MovieStats).filter(models.MovieStats.movieId == movie_id).first()
+    if stats is None and not movie_exists(db, movie_id):
+        return None
+
+    histogram = dict.fromkeys(RATING_BUCKETS, 0)
+    histogram.update(
+        db.query(models.MovieRatingBucket.bucket, models.MovieRatingBucket.count)
+        .filter(models.MovieRatingBucket.movieId == movie_id)
+        .all()
+    )
+    count = stats.rating_count if stats else 0
+    mean = std = None
+    if count:
+        mean = stats.rating_sum / count
+        std = math.sqrt(max(stats.rating_sum_squares / count - mean * mean, 0.0))
+    return {
+        "movieId": movie_id,
+        "rating_count": count,
+        "rating_mean": mean,
+        "rating_std": std,
+        "histogram": [{"rating": bucket, "count": n} for bucket, n in sorted(histogram.items())],
+        "tag_count": stats.tag_count if stats else 0,
+        "first_rating_timestamp": stats.first_rating_timestamp if stats else None,
+        "last_rating_timestamp": stats.last_rating_timestamp if stats else None,
+    }
+
 # Évaluations
 
 def get_rating(db: Session, user_id: int, movie_id: int):
@@ -28,10 +216,29 @@ def get_rating(db: Session, user_id: int, movie_id: int):
         models.Rating.movieId == movie_id
     ).first()
 
-def get_ratings(db: Session, skip: int = 0, limit: int = 100, movies_id: int = None, user_id: int = None, min_rating: float = None, max_rating: float = None):
-    """Récupère une liste d'évaluations avec filtre optionnelles."""
-    query = db.query(models.Rating)
-    
+def get_ratings(db: Session, skip: int = 0, limit: int = 100, movies_id: int = None, user_id: int = None, min_rating: float = None, max_rating: float = None,
+                cursor: Optional[str] = None, as_rows: bool = False):
+    """Récupère une liste d'évaluations avec filtre optionnelles (tuples de `RATING_COLUMNS` si `as_rows`)."""
+    query = filter_ratings(db.query(*_entities(models.Rating, RATING_COLUMNS, as_rows)), movies_id, user_id, min_rating, max_rating)
+    return _paginate(query, RATING_KEYS, skip, limit, cursor)
+
+def get_ratings_by_keys(db: Session, keys: List[Tuple[int, int]]):
+    """Récupère plusieurs évaluations par couples (user_id, movie_id) en une requête.
+
+    Un `(userId, movieId) IN (VALUES ...)` est planifié par SQLite en parcours
+    complet de ratings ; un OR d'égalités sur la clé primaire donne un
+    MULTI-INDEX OR, une recherche dans l'index par couple.
+    """
+    if not keys:
+        return []
+    ratings = db.query(models.Rating).filter(or_(*(
+        and_(models.Rating.userId == user_id, models.Rating.movieId == movie_id)
+        for user_id, movie_id in dict.fromkeys(keys)
+    ))).all()
+    return _in_request_order(ratings, keys, lambda rating: (rating.userId, rating.movieId))
+
+def filter_ratings(query, movies_id: int = None, user_id: int = None, min_rating: float = None, max_rating: float = None):
+    """Applique les filtres de /ratings à une requête ORM ou à un select()."""
     if movies_id is not None:
         query = query.filter(models.Rating.movieId == movies_id)
     if user_id is not None:
@@ -40,8 +247,7 @@ def get_ratings(db: Session, skip: int = 0, limit: int = 100, movies_id: int = N
         query = query.filter(models.Rating.rating >= min_rating)
     if max_rating is not None:
         query = query.filter(models.Rating.rating <= max_rating)
-        
-    return query.offset(skip).limit(limit).all()
+    return query
 
 # Tags
 
@@ -60,17 +266,20 @@ def get_tags(
         limit: int = 100,
         movie_id: Optional[int] = None,
         user_id: Optional[int] = None,
-       
+        cursor: Optional[str] = None,
+        as_rows: bool = False,
     ):
-    """Récupère une liste de tags avec filtre optionnelles."""
-    query = db.query(models.Tag)
-    
+    """Récupère une liste de tags avec filtre optionnelles (tuples de `TAG_COLUMNS` si `as_rows`)."""
+    query = filter_tags(db.query(*_entities(models.Tag, TAG_COLUMNS, as_rows)), movie_id, user_id)
+    return _paginate(query, TAG_KEYS, skip, limit, cursor)
+
+def filter_tags(query, movie_id: Optional[int] = None, user_id: Optional[int] = None):
+    """Applique les filtres de /tags à une requête ORM ou à un select()."""
     if movie_id is not None:
         query = query.filter(models.Tag.movieId == movie_id)
     if user_id is not None:
         query = query.filter(models.Tag.userId == user_id)
-        
-    return query.offset(skip).limit(limit).all()
+    return query
 
 # Links
 
@@ -78,26 +287,68 @@ def get_link(db: Session, movie_id: int):
     """Reourne le lien IMDB et TMDB associé à un film donné."""
     return db.query(models.Link).filter(models.Link.movieId == movie_id).first()
 
-def get_links(db: Session, skip: int = 0, limit: int = 100):
-    """Récupère une liste paginée de liens IMDB et TMDB de films."""
-    return db.query(models.Link).offset(skip).limit(limit).all()
+def get_links_by_ids(db: Session, movie_ids: List[int]):
+    """Récupère les liens de plusieurs films en une requête `IN`, dans l'ordre des IDs demandés."""
+    links = db.query(models.Link).filter(models.Link.movieId.in_(set(movie_ids))).all()
+    return _in_request_order(links, movie_ids, lambda link: link.movieId)
+
+def get_links(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+              as_rows: bool = False):
+    """Récupère une liste paginée de liens IMDB et TMDB de films (tuples de `LINK_COLUMNS` si `as_rows`)."""
+    return _paginate(db.query(*_entities(models.Link, LINK_COLUMNS, as_rows)), LINK_KEYS, skip, limit, cursor)
+
+# Exports
+# Requêtes de colonnes parcourues par blocs avec yield_per pour les
+# endpoints /export/*.
+
+def export_movies_statement(title: str = None, genres: str = None, genres_match: str = "any"):
+    """Requête d'export des films, avec les filtres de /movies."""
+    return filter_movies(select(*MOVIE_COLUMNS), title, genres, genres_match)
+
+def export_ratings_statement(movies_id: int = None, user_id: int = None, min_rating: float = None, max_rating: float = None):
+    """Requête d'export des évaluations, avec les filtres de /ratings."""
+    return filter_ratings(select(*RATING_COLUMNS), movies_id, user_id, min_rating, max_rating)
+
+def export_tags_statement(movie_id: Optional[int] = None, user_id: Optional[int] = None):
+    """Requête d'export des tags, avec les filtres de /tags."""
+    return filter_tags(select(*TAG_COLUMNS), movie_id, user_id)
+
+def export_links_statement():
+    """Requête d'export des liens IMDB et TMDB."""
+    return select(*LINK_COLUMNS)
 
 # Requetes analytiques
+# Les compteurs sont lus dans table_stats (maintenue par triggers) ; le
+# COUNT(*) ne sert que si une table n'y est pas encore enregistrée.
+
+def get_table_counts(db: Session) -> dict:
+    """Retourne le nombre de lignes de chaque table en une seule requête."""
+    counts = dict(db.query(models.TableStat.table_name, models.TableStat.row_count).all())
+    for model in (models.Movie, models.Rating, models.Tag, models.Link):
+        if model.__tablename__ not in counts:
+            counts[model.__tablename__] = db.query(model).count()
+    return counts
+
+def _table_count(db: Session, model) -> int:
+    count = db.query(models.TableStat.row_count).filter(
+        models.TableStat.table_name == model.__tablename__
+    ).scalar()
+    return count if count is not None else db.query(model).count()
 
 def get_movie_count(db: Session) -> int:
     """Retourne le nombre total de films dans la base de données."""
-    return db.query(models.Movie).count()
+    return _table_count(db, models.Movie)
 
 def get_rating_count(db: Session) -> int:
     """Retourne le nombre total d'évaluations dans la base de données."""
-    return db.query(models.Rating).count()
+    return _table_count(db, models.Rating)
 
 def get_tag_count(db: Session) -> int:
     """Retourne le nombre total de tags dans la base de données."""
-    return db.query(models.Tag).count()
+    return _table_count(db, models.Tag)
 
 def get_link_count(db: Session) -> int:
     """Retourne le nombre total de liens dans la base de données."""
-    return db.query(models.Link).count()
+    return _table_count(db, models.Link)
 
  
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Réglages de la base de données, lus dans l'environnement.
+
+Un profil regroupe le mode d'ouverture du fichier SQLite et les pragmas
+appliqués à chaque nouvelle connexion (événement `connect` de SQLAlchemy,
+voir database.py) :
+
+    default     lecture/écriture, réglages SQLite par défaut
+    read-heavy  lecture seule (URI mode=ro) : mmap, grand cache de pages,
+                tables temporaires en mémoire, query_only
+    write       lecture/écriture en WAL, pour les scripts de maintenance
+
+Variables d'environnement :
+    MOVIES_DB_MODE          async (défaut) ou sync
+    MOVIES_DB_PROFILE       nom du profil (défaut : default)
+    MOVIES_DB_POOL_SIZE     connexions gardées ouvertes par processus
+    MOVIES_DB_MAX_OVERFLOW  connexions supplémentaires en cas de pic
+    MOVIES_DB_MMAP_SIZE     taille du mmap en octets (profil read-heavy)
+    MOVIES_DB_CACHE_SIZE    cache de pages par connexion en Kio (profil read-heavy)
+"""
+
+import os
+from typing import NamedTuple, Tuple
+
+# "async" (défaut) ou "sync" pour revenir aux sessions synchrones
+DATABASE_MODE = os.getenv("MOVIES_DB_MODE", "async")
+
+DATABASE_PROFILE = os.getenv("MOVIES_DB_PROFILE", "default")
+
+# Une connexion par worker du threadpool (mode sync) ou requête concurrente
+# (mode async) : même taille par défaut que le pool de threads de Python.
+DATABASE_POOL_SIZE = int(os.getenv("MOVIES_DB_POOL_SIZE", str(min(32, (os.cpu_count() or 1) + 4))))
+DATABASE_MAX_OVERFLOW = int(os.getenv("MOVIES_DB_MAX_OVERFLOW", "10"))
+
+MMAP_SIZE = int(os.getenv("MOVIES_DB_MMAP_SIZE", str(1024 * 1024 * 1024)))
+CACHE_SIZE_KIB = int(os.getenv("MOVIES_DB_CACHE_SIZE", "65536"))
+
+
+class DatabaseProfile(NamedTuple):
+    read_only: bool
+    pragmas: Tuple[str, ...]
+
+
+PROFILES = {
+    "default": DatabaseProfile(read_only=False, pragmas=()),
+    # Le jeu de données n'est modifié qu'au rechargement : les pages sont lues
+    # via mmap (cache de l'OS partagé entre connexions et workers) et le cache
+    # de pages de chaque connexion reste chaud d'une requête à l'autre.
+    "read-heavy": DatabaseProfile(
+        read_only=True,
+        pragmas=(
+            f"PRAGMA mmap_size = {MMAP_SIZE}",
+            f"PRAGMA cache_size = -{CACHE_SIZE_KIB}",
+            "PRAGMA temp_store = MEMORY",
+            "PRAGMA query_only = ON",
+        ),
+    ),
+    "write": DatabaseProfile(
+        read_only=False,
+        pragmas=(
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",
+            "PRAGMA temp_store = MEMORY",
+        ),
+    ),
+}
+
+
+def get_profile(name: str = DATABASE_PROFILE) -> DatabaseProfile:
+    """Retourne un profil par son nom, lève ValueError s'il est inconnu."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Profil de base inconnu : {name!r} (choisir parmi {', '.join(PROFILES)})"
+        ) from None
@@ -0,0 +1,108 @@
+"""Index de similarité item-item, lu par l'API pour /movies/{movie_id}/similar.
+
+L'index est calculé hors ligne à partir de la table ratings (voir
+build_similarity.py) et garde les K plus proches voisins de chaque film,
+dans un dossier de trois tableaux NumPy :
+
+    movie_ids.npy   IDs des films indexés, triés (n,)
+    neighbors.npy   IDs des voisins, par similarité décroissante (n, K), -1 en fin de ligne
+    scores.npy      similarités correspondantes (n, K)
+
+Les fichiers sont projetés en mémoire (`np.load(mmap_mode="r")`) au
+démarrage de chaque worker : rien n'est copié, les pages lues sont
+partagées entre workers par le cache de l'OS. Une recherche est une
+dichotomie dans `movie_ids` puis la lecture d'une ligne.
+
+Variables d'environnement :
+    API_SIMILARITY_INDEX    dossier de l'index (défaut : api/similarity_index)
+"""
+
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SIMILARITY_INDEX_DIR = os.getenv("API_SIMILARITY_INDEX", os.path.join(BASE_DIR, "similarity_index"))
+
+INDEX_FILES = ("movie_ids", "neighbors", "scores")
+
+logger = logging.getLogger(__name__)
+
+
+class SimilarityIndex:
+    """K plus proches voisins de chaque film, lus dans des tableaux projetés en mémoire."""
+
+    def __init__(self, movie_ids: np.ndarray, neighbors: np.ndarray, scores: np.ndarray):
+        self.movie_ids = movie_ids
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @property
+    def k(self) -> int:
+        return self.neighbors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.movie_ids)
+
+    def similar(self, movie_id: int, k: int) -> Optional[List[Tuple[int, float]]]:
+        """Les `k` films les plus proches avec leur score, ou None si le film n'est pas indexé."""
+        position = int(np.searchsorted(self.movie_ids, movie_id))
+        if position == len(self.movie_ids) or self.movie_ids[position] != movie_id:
+            return None
+        neighbors = self.neighbors[position, :k].tolist()
+        scores = self.scores[position, :k].tolist()
+        return [(neighbor, score) for neighbor, score in zip(neighbors, scores) if neighbor >= 0]
+
+
+def save_index(index_dir: str, movie_ids: np.ndarray, neighbors: np.ndarray, scores: np.ndarray):
+    """Écrit l'index dans un dossier temporaire puis remplace l'ancien.
+
+    Les workers qui ont projeté l'ancien index continuent de le lire jusqu'à
+    leur redémarrage : ses fichiers supprimés restent valides tant qu'ils sont
+    ouverts.
+    """
+    build_dir = f"{index_dir}.tmp"
+    os.makedirs(build_dir, exist_ok=True)
+    for name, array in zip(INDEX_FILES, (movie_ids, neighbors, scores)):
+        np.save(os.path.join(build_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+    previous_dir = f"{index_dir}.old"
+    if os.path.isdir(index_dir):
+        os.replace(index_dir, previous_dir)
+    os.replace(build_dir, index_dir)
+    if os.path.isdir(previous_dir):
+        for name in os.listdir(previous_dir):
+            os.remove(os.path.join(previous_dir, name))
+        os.rmdir(previous_dir)
+
+
+def load_index(index_dir: str = SIMILARITY_INDEX_DIR) -> Optional[SimilarityIndex]:
+    """Projette l'index en mémoire, ou retourne None s'il est absent ou inutilisable.
+
+    Un index incomplet ou corrompu ne doit pas empêcher l'API de démarrer :
+    /movies/{movie_id}/similar répond alors 503 jusqu'à sa reconstruction.
+    """
+    if not os.path.isdir(index_dir):
+        logger.warning("Index de similarité absent (%s) : lancer python -m api.build_similarity", index_dir)
+        return None
+    try:
+        movie_ids, neighbors, scores = (
+            np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r") for name in INDEX_FILES
+        )
+    except (OSError, ValueError) as exc:
+        logger.warning("Index de similarité illisible (%s) : %s", index_dir, exc)
+        return None
+    consistent = (
+        movie_ids.ndim == 1 and neighbors.ndim == 2
+        and neighbors.shape == scores.shape and neighbors.shape[0] == len(movie_ids)
+    )
+    if not consistent:
+        logger.warning(
+            "Index de similarité incohérent (%s) : movie_ids %s, neighbors %s, scores %s",
+            index_dir, movie_ids.shape, neighbors.shape, scores.shape,
+        )
+        return None
+    return SimilarityIndex(movie_ids, neighbors, scores)
@@ -0,0 +1,202 @@
+"""Journal des requêtes SQL lentes, avec leur plan d'exécution SQLite.
+
+Toute instruction plus longue que le seuil est journalisée en JSON (une
+ligne par requête) avec sa durée, ses paramètres, la fonction de
+`query_helpers` qui l'a émise et, la première fois que sa forme est
+rencontrée (instruction normalisée : listes `IN (?, ?, ...)` repliées,
+littéraux numériques remplacés), la sortie de `EXPLAIN QUERY PLAN`.
+
+Le rapport classe les formes par temps total :
+
+    python -m api.slow_queries [--log api/slow_queries.jsonl] [--top 10]
+
+Configuration par variables d'environnement :
+    API_SLOW_QUERY_ENABLED  1 (défaut) ou 0
+    API_SLOW_QUERY_MS       seuil en millisecondes (défaut : 100)
+    API_SLOW_QUERY_LOG      fichier du journal (défaut : api/slow_queries.jsonl)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SLOW_QUERY_ENABLED = os.getenv("API_SLOW_QUERY_ENABLED", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("API_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.getenv("API_SLOW_QUERY_LOG", os.path.join(BASE_DIR, "slow_queries.jsonl"))
+
+# Paramètres gardés par requête journalisée (les /batch en lient jusqu'à 500)
+MAX_LOGGED_PARAMETERS = 20
+
+# Modules de l'API ignorés pour retrouver la fonction à l'origine d'une requête
+INSTRUMENTATION_MODULES = {__name__, "api.metrics", "api.database"}
+
+logger = logging.getLogger(__name__)
+
+IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+NUMBER_PATTERN = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+SPACE_PATTERN = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Forme normalisée d'une instruction, identique quelles que soient les valeurs liées."""
+    shape = SPACE_PATTERN.sub(" ", statement).strip()
+    shape = NUMBER_PATTERN.sub("?", shape)
+    return IN_LIST_PATTERN.sub("(?, ...)", shape)
+
+
+def shape_id(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def _origin() -> str:
+    """Fonction de l'API qui a émis la requête : de préférence celle de query_helpers."""
+    frame = sys._getframe(2)
+    fallback = "unknown"
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "api.query_helpers":
+            return f"query_helpers.{frame.f_code.co_name}"
+        if fallback == "unknown" and module.startswith("api.") and module not in INSTRUMENTATION_MODULES:
+            fallback = f"{module.removeprefix('api.')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+
+def _parameters(parameters):
+    if isinstance(parameters, dict):
+        return parameters
+    parameters = list(parameters or ())
+    if len(parameters) > MAX_LOGGED_PARAMETERS:
+        return parameters[:MAX_LOGGED_PARAMETERS] + [f"... ({len(parameters)} paramètres)"]
+    return parameters
+
+
+def _explain(dbapi_connection, statement: str, parameters) -> list:
+    """Plan d'exécution de l'instruction, lu par un curseur DBAPI (sans repasser par les événements)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:  # le plan est un complément : ne jamais faire échouer la requête
+        return [f"EXPLAIN impossible : {exc}"]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Journalise les instructions d'un moteur plus longues que `threshold_ms`."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS):
+        self.threshold = threshold_ms / 1000
+        self._explained = set()
+        self._lock = threading.Lock()
+
+    def instrument(self, engine):
+        """Écoute un moteur synchrone (`async_engine.sync_engine` pour aiosqlite)."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def start_query(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def end_query(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+            if elapsed >= self.threshold:
+                self.record(conn, statement, parameters, executemany, elapsed)
+
+    def record(self, conn, statement: str, parameters, executemany: bool, elapsed: float):
+        shape = statement_shape(statement)
+        key = shape_id(shape)
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed * 1000, 3),
+            "shape_id": key,
+            "origin": _origin(),
+            "statement": statement,
+            "parameters": [] if executemany else _parameters(parameters),
+        }
+        with self._lock:
+            first = key not in self._explained
+            self._explained.add(key)
+        if first and not executemany:
+            entry["shape"] = shape
+            entry["plan"] = _explain(conn.connection.dbapi_connection, statement, parameters)
+        logger.warning(json.dumps(entry, default=str, ensure_ascii=False))
+
+
+def configure_logging(path: str = SLOW_QUERY_LOG):
+    """Écrit les requêtes lentes dans `path`, une ligne JSON par requête."""
+    handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+
+
+# Rapport
+
+def read_log(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("{"):
+                yield json.loads(line)
+
+
+def summarize(entries) -> list:
+    """Agrège les requêtes par forme, triées par temps total décroissant."""
+    shapes = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "origins": set(),
+                                  "shape": None, "plan": None, "slowest": None})
+    for entry in entries:
+        shape = shapes[entry["shape_id"]]
+        shape["shape_id"] = entry["shape_id"]
+        shape["count"] += 1
+        shape["total_ms"] += entry["duration_ms"]
+        shape["origins"].add(entry["origin"])
+        if entry["duration_ms"] >= shape["max_ms"]:
+            shape["max_ms"] = entry["duration_ms"]
+            shape["slowest"] = entry
+        shape["shape"] = entry.get("shape") or shape["shape"] or statement_shape(entry["statement"])
+        shape["plan"] = entry.get("plan") or shape["plan"]
+    return sorted(shapes.values(), key=lambda shape: shape["total_ms"], reverse=True)
+
+
+def print_report(shapes: list, top: int, file=sys.stdout):
+    print(f"{'forme':<12} {'appels':>7} {'total ms':>11} {'moy. ms':>9} {'max ms':>9}  origine", file=file)
+    for shape in shapes[:top]:
+        print(
+            f"{shape['shape_id']:<12} {shape['count']:>7} {shape['total_ms']:>11.1f} "
+            f"{shape['total_ms'] / shape['count']:>9.1f} {shape['max_ms']:>9.1f}  {', '.join(sorted(shape['origins']))}",
+            file=file,
+        )
+    for shape in shapes[:top]:
+        print(f"\n[{shape['shape_id']}] {shape['shape']}", file=file)
+        print(f"  paramètres de la plus lente : {shape['slowest']['parameters']}", file=file)
+        for line in shape["plan"] or ["(plan non capturé)"]:
+            print(f"  {line}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classe les requêtes SQL lentes par temps total.")
+    parser.add_argument("--log", default=SLOW_QUERY_LOG, help="Fichier du journal des requêtes lentes")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de formes affichées")
+    args = parser.parse_args()
+    if not os.path.exists(args.log):
+        parser.exit(1, f"Journal introuvable : {args.log}\n")
+    print_report(summarize(read_log(args.log)), args.top)
+
+
+if __name__ == "__main__":
+    main()
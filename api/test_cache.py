@@ -0,0 +1,139 @@
+"""Cache des réponses GET, ETag et requêtes conditionnelles (voir cache.py).
+
+Le middleware est placé devant l'application de test ; sa version du jeu
+de données est lue sur une copie de la base que les tests modifient.
+"""
+
+import shutil
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.cache import ResponseCache, ResponseCacheMiddleware, dataset_version
+from api.columnar import ARROW_MEDIA_TYPE
+
+PATH = "/ratings?limit=20&movies_id=1"
+
+
+@pytest.fixture
+def version_path(database_path, tmp_path) -> str:
+    path = str(tmp_path / "movies.db")
+    shutil.copy(database_path, path)
+    return path
+
+
+@pytest.fixture
+def middleware(client, version_path):
+    return ResponseCacheMiddleware(client.app, version=lambda: dataset_version(version_path))
+
+
+@pytest.fixture
+def cached_client(middleware):
+    return TestClient(middleware)
+
+
+def test_second_request_is_served_from_the_cache(cached_client):
+    first = cached_client.get(PATH)
+    second = cached_client.get(PATH)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"].startswith("public, max-age=")
+
+
+@pytest.mark.parametrize("if_none_match", ['{etag}', 'W/{etag}', '"other", {etag}'])
+def test_matching_etag_gets_a_304(cached_client, if_none_match):
+    etag = cached_client.get(PATH).headers["etag"]
+    response = cached_client.get(PATH, headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_other_etag_gets_the_body(cached_client):
+    response = cached_client.get(PATH, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json()
+
+
+def test_accept_is_part_of_the_key(cached_client):
+    json_response = cached_client.get(PATH)
+    arrow_response = cached_client.get(PATH, headers={"Accept": ARROW_MEDIA_TYPE})
+    assert arrow_response.headers["x-cache"] == "MISS"
+    assert arrow_response.headers["content-type"] == ARROW_MEDIA_TYPE
+    assert arrow_response.headers["etag"] != json_response.headers["etag"]
+    assert cached_client.get(PATH).headers["content-type"] == "application/json"
+    assert cached_client.get(PATH, headers={"Accept": ARROW_MEDIA_TYPE}).headers["x-cache"] == "HIT"
+
+
+def test_no_store_responses_are_not_cached(cached_client, middleware):
+    for _ in range(2):
+        response = cached_client.get("/export/ratings?movies_id=1")
+        assert response.status_code == 200
+        assert "x-cache" not in response.headers
+        assert "etag" not in response.headers
+    assert len(middleware.cache) == 0
+
+
+def test_error_responses_are_not_cached(cached_client, middleware):
+    assert cached_client.get("/movies/999999").status_code == 404
+    assert len(middleware.cache) == 0
+
+
+def test_database_write_invalidates_the_cache(cached_client, version_path):
+    etag = cached_client.get(PATH).headers["etag"]
+    with sqlite3.connect(version_path) as conn:
+        conn.execute("UPDATE ratings SET rating = 0.5 WHERE movieId = 1")
+    response = cached_client.get(PATH, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "MISS"
+    assert response.headers["etag"] != etag
+
+
+def test_wal_write_invalidates_the_cache(cached_client, version_path):
+    conn = sqlite3.connect(version_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    try:
+        assert cached_client.get(PATH).headers["x-cache"] == "MISS"
+        assert cached_client.get(PATH).headers["x-cache"] == "HIT"
+        # écriture restée dans le WAL : seul movies.db-wal change
+        conn.execute("UPDATE ratings SET rating = 0.5 WHERE movieId = 1")
+        conn.commit()
+        assert cached_client.get(PATH).headers["x-cache"] == "MISS"
+    finally:
+        conn.close()
+
+
+def test_large_bodies_are_not_cached(client, version_path):
+    middleware = ResponseCacheMiddleware(client.app, entry_bytes=100, version=lambda: dataset_version(version_path))
+    cached_client = TestClient(middleware)
+    assert cached_client.get(PATH).status_code == 200
+    assert cached_client.get(PATH).headers["x-cache"] == "MISS"
+    assert len(middleware.cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, max_bytes=1_000, ttl=60)
+    cache.put("a", 200, [], b"a")
+    cache.put("b", 200, [], b"b")
+    cache.get("a")
+    cache.put("c", 200, [], b"c")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_cache_is_bounded_in_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.put("a", 200, [], b"123456")
+    cache.put("b", 200, [], b"123456")
+    assert cache.get("a") is None
+    assert len(cache) == 1 and cache.size == 6
+
+
+def test_expired_entry_is_dropped():
+    cache = ResponseCache(max_entries=10, max_bytes=1_000, ttl=-1)
+    cache.put("a", 200, [], b"a")
+    assert cache.get("a") is None
+    assert len(cache) == 0
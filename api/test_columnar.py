@@ -0,0 +1,81 @@
+"""Sorties Arrow IPC et Parquet (voir columnar.py), relues avec pyarrow.
+
+Une table relue doit contenir les mêmes lignes, dans le même ordre, que la
+réponse JSON équivalente.
+"""
+
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from api.columnar import ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE
+
+ARROW = {"Accept": ARROW_MEDIA_TYPE}
+
+EXPORTS = (
+    "/export/ratings?movies_id=1",
+    "/export/ratings?user_id=7&min_rating=3",
+    "/export/ratings",
+    "/export/movies?genres=Comedy",
+    "/export/tags",
+    "/export/links",
+)
+
+
+def _ndjson(client, path: str) -> list:
+    return [json.loads(line) for line in client.get(f"{path}{'&' if '?' in path else '?'}format=ndjson").text.splitlines()]
+
+
+def _read(body: bytes, fmt: str) -> pa.Table:
+    if fmt == "parquet":
+        return pq.read_table(pa.BufferReader(body))
+    return pa.ipc.open_stream(body).read_all()
+
+
+@pytest.mark.parametrize("fmt, media_type", [("arrow", ARROW_MEDIA_TYPE), ("parquet", PARQUET_MEDIA_TYPE)])
+@pytest.mark.parametrize("path", EXPORTS)
+def test_export_round_trip(client, path, fmt, media_type):
+    response = client.get(f"{path}{'&' if '?' in path else '?'}format={fmt}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+    assert response.headers["cache-control"] == "no-store"
+    expected = _ndjson(client, path)
+    assert expected
+    assert _read(response.content, fmt).to_pylist() == expected
+
+
+def test_export_column_types(client):
+    table = _read(client.get("/export/ratings?movies_id=1&format=parquet").content, "parquet")
+    assert table.schema == pa.schema([
+        ("userId", pa.int64()), ("movieId", pa.int64()), ("rating", pa.float64()), ("timestamp", pa.int64()),
+    ])
+
+
+def test_empty_export_keeps_its_schema(client):
+    for fmt in ("arrow", "parquet"):
+        table = _read(client.get(f"/export/ratings?movies_id=999999&format={fmt}").content, fmt)
+        assert table.num_rows == 0
+        assert table.schema.names == ["userId", "movieId", "rating", "timestamp"]
+
+
+@pytest.mark.parametrize("path", [
+    "/movies?limit=20&genres=Comedy",
+    "/ratings?limit=50&movies_id=1",
+    "/tags?limit=20",
+    "/links?limit=20",
+    "/ratings?limit=5&movies_id=999999",
+])
+def test_arrow_list_matches_json(client, path):
+    response = client.get(path, headers=ARROW)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    assert _read(response.content, "arrow").to_pylist() == client.get(path).json()
+
+
+def test_arrow_list_keeps_the_next_cursor(client):
+    path = "/ratings?limit=50&cursor="
+    response = client.get(path, headers=ARROW)
+    assert response.headers["x-next-cursor"] == client.get(path).headers["x-next-cursor"]
+    assert _read(response.content, "arrow").num_rows == 50
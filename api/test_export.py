@@ -0,0 +1,76 @@
+"""Exports en streaming /export/* (NDJSON et CSV, voir export.py).
+
+Un export doit contenir exactement les lignes de l'endpoint de liste
+correspondant, avec les mêmes filtres.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+# (export, liste) : mêmes filtres ; les listes filtrées tiennent dans une page
+QUERIES = (
+    ("/export/movies", "/movies?limit=1000"),
+    ("/export/movies?genres=Comedy,Thriller&genres_match=all", "/movies?limit=1000&genres=Comedy,Thriller&genres_match=all"),
+    ("/export/movies?title=Story", "/movies?limit=1000&title=Story"),
+    ("/export/ratings?movies_id=1", "/ratings?limit=1000&movies_id=1"),
+    ("/export/ratings?user_id=7", "/ratings?limit=1000&user_id=7"),
+    ("/export/ratings?min_rating=4.5", "/ratings?limit=1000&min_rating=4.5"),
+    ("/export/ratings?movies_id=1&min_rating=3&max_rating=4", "/ratings?limit=1000&movies_id=1&min_rating=3&max_rating=4"),
+    ("/export/tags?movie_id=1", "/tags?limit=1000&movie_id=1"),
+    ("/export/tags?user_id=11", "/tags?limit=1000&user_id=11"),
+    ("/export/links", "/links?limit=1000"),
+)
+
+
+def _export(client, path: str, fmt: str):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{path}{separator}format={fmt}")
+    assert response.status_code == 200
+    return response
+
+
+def _key(row: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in row.items()))
+
+
+@pytest.mark.parametrize("path, list_path", QUERIES)
+def test_ndjson_has_the_rows_of_the_list(client, path, list_path):
+    expected = client.get(list_path).json()
+    assert expected
+    rows = [json.loads(line) for line in _export(client, path, "ndjson").text.splitlines()]
+    assert sorted(rows, key=_key) == sorted(expected, key=_key)
+
+
+@pytest.mark.parametrize("path, list_path", QUERIES)
+def test_csv_has_the_rows_of_the_list(client, path, list_path):
+    expected = client.get(list_path).json()
+    reader = csv.DictReader(io.StringIO(_export(client, path, "csv").text))
+    assert reader.fieldnames == list(expected[0])
+    rows = list(reader)
+    as_text = [{name: "" if value is None else str(value) for name, value in row.items()} for row in expected]
+    assert sorted(map(_key, rows)) == sorted(map(_key, as_text))
+
+
+def test_unfiltered_export_is_not_limited_to_a_page(client, db):
+    from api import models
+
+    lines = _export(client, "/export/ratings", "ndjson").text.splitlines()
+    assert len(lines) == db.query(models.Rating).count() > 1000
+
+
+@pytest.mark.parametrize("fmt, media_type, extension", [
+    ("ndjson", "application/x-ndjson", "ndjson"),
+    ("csv", "text/csv; charset=utf-8", "csv"),
+])
+def test_export_headers(client, fmt, media_type, extension):
+    response = _export(client, "/export/ratings?movies_id=1", fmt)
+    assert response.headers["content-type"] == media_type
+    assert response.headers["cache-control"] == "no-store"
+    assert response.headers["content-disposition"] == f'attachment; filename="ratings.{extension}"'
+
+
+def test_unknown_export_format(client):
+    assert client.get("/export/ratings?format=xml").status_code == 422
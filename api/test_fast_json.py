@@ -0,0 +1,61 @@
+"""Le chemin rapide (API_FAST_JSON) doit produire exactement les mêmes réponses.
+
+Chaque liste est parcourue en entier par curseur avec et sans le chemin
+rapide, sur la base de test (voir conftest.py) et sans le cache des
+réponses ; les corps et l'en-tête X-Next-Cursor sont comparés octet pour
+octet. Le gain de débit se mesure avec le banc de charge (benchmarks/).
+"""
+
+import pytest
+
+from api import fast_json
+
+LIST_QUERIES = (
+    "/movies?limit=50",
+    "/movies?limit=20&genres=Comedy,Thriller&genres_match=all",
+    "/movies?limit=10&title=Story",
+    "/ratings?limit=500",
+    "/ratings?limit=20&movies_id=1&min_rating=3.5",
+    "/ratings?limit=20&user_id=7",
+    "/tags?limit=100",
+    "/tags?limit=10&movie_id=1",
+    "/links?limit=50",
+    "/links?limit=10&skip=20",
+)
+
+PAGED_QUERIES = ("/movies?limit=50", "/ratings?limit=500", "/tags?limit=100", "/links?limit=50")
+
+
+def _get(client, path: str, fast: bool, monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON_ENABLED", fast)
+    response = client.get(path)
+    assert response.status_code == 200
+    return response
+
+
+def _walk(client, path: str, fast: bool, monkeypatch):
+    """Parcourt toutes les pages d'une liste par curseur."""
+    cursor = ""
+    while cursor is not None:
+        response = _get(client, f"{path}&cursor={cursor}", fast, monkeypatch)
+        yield response
+        cursor = response.headers.get("x-next-cursor")
+
+
+@pytest.mark.parametrize("path", LIST_QUERIES)
+def test_same_bytes_with_offset(client, path, monkeypatch):
+    slow = _get(client, path, False, monkeypatch)
+    fast = _get(client, path, True, monkeypatch)
+    assert slow.json()
+    assert fast.content == slow.content
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+
+
+@pytest.mark.parametrize("path", PAGED_QUERIES)
+def test_same_bytes_on_every_page(client, path, monkeypatch):
+    pages = 0
+    for slow, fast in zip(_walk(client, path, False, monkeypatch), _walk(client, path, True, monkeypatch)):
+        assert fast.content == slow.content
+        assert fast.headers.get("x-next-cursor") == slow.headers.get("x-next-cursor")
+        pages += 1
+    assert pages > 1
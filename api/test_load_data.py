@@ -0,0 +1,27 @@
+"""Reconstruction de movies.db par build_database (voir load_data.py)."""
+
+import os
+import shutil
+import sqlite3
+
+from api.load_data import load_database
+
+
+def test_rebuild_discards_the_previous_wal(dataset_dir, database_path, tmp_path):
+    target = str(tmp_path / "movies.db")
+    # ancienne base ouverte en WAL, avec des écritures pas encore reportées dans le fichier
+    shutil.copy(database_path, target)
+    writer = sqlite3.connect(target)
+    writer.execute("PRAGMA wal_autocheckpoint = 0")
+    writer.execute("DELETE FROM movies")
+    writer.commit()
+    shutil.copy(target + "-wal", tmp_path / "stale-wal")
+    writer.close()
+    shutil.copy(tmp_path / "stale-wal", target + "-wal")
+
+    load_database(target, dataset_dir)
+
+    assert not os.path.exists(target + "-wal")
+    assert not os.path.exists(target + "-shm")
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("SELECT count(*) FROM movies").fetchone()[0] > 0
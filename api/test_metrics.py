@@ -0,0 +1,73 @@
+"""Métriques Prometheus de /metrics (voir metrics.py)."""
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from api.metrics import METRICS_ENABLED, UNMATCHED_ROUTE, instrument_engine, statement_label
+
+pytestmark = pytest.mark.skipif(not METRICS_ENABLED, reason="API_METRICS_ENABLED=0")
+
+
+def samples(client, name: str) -> dict:
+    """Valeurs d'une série de /metrics, par jeu d'étiquettes."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return {
+        tuple(sorted(sample.labels.items())): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+        if sample.name == name
+    }
+
+
+def requests_count(client, route: str, status: str) -> float:
+    labels = (("method", "GET"), ("route", route), ("status", status))
+    return samples(client, "http_requests_total").get(labels, 0)
+
+
+def test_requests_are_labelled_by_route_template(client):
+    before = requests_count(client, "/movies/{movie_id}", "200")
+    for movie_id in (1, 10, 17):
+        assert client.get(f"/movies/{movie_id}").status_code == 200
+    assert client.get("/movies/999999").status_code == 404
+
+    assert requests_count(client, "/movies/{movie_id}", "200") == before + 3
+    assert requests_count(client, "/movies/{movie_id}", "404") >= 1
+    routes = {dict(labels)["route"] for labels in samples(client, "http_requests_total")}
+    assert "/movies/1" not in routes and "/movies/999999" not in routes
+
+
+def test_static_route_wins_over_path_parameter(client):
+    before = requests_count(client, "/movies/search", "200")
+    client.get("/movies/search?q=toy")
+    assert requests_count(client, "/movies/search", "200") == before + 1
+
+
+def test_unknown_paths_share_one_series(client):
+    before = requests_count(client, UNMATCHED_ROUTE, "404")
+    client.get("/nowhere/1")
+    client.get("/nowhere/2")
+    assert requests_count(client, UNMATCHED_ROUTE, "404") == before + 2
+
+
+def test_sql_queries_are_attributed_to_the_route(writable_client, writable_engine):
+    instrument_engine(writable_engine)
+    writable_client.get("/ratings/1/1")
+    counts = samples(writable_client, "db_query_duration_seconds_count")
+    labels = (("route", "/ratings/{user_id}/{movie_id}"), ("statement", "SELECT ratings"))
+    assert counts[labels] >= 1
+
+
+def test_metrics_are_not_cached(client):
+    assert client.get("/metrics").headers["cache-control"] == "no-store"
+
+
+@pytest.mark.parametrize("statement, label", [
+    ('SELECT ratings."userId" FROM ratings WHERE ratings."movieId" = ?', "SELECT ratings"),
+    ('INSERT INTO "movies" (title) VALUES (?)', "INSERT movies"),
+    ("UPDATE movie_stats SET tag_count = 0", "UPDATE movie_stats"),
+    ("DELETE FROM tags WHERE movieId = ?", "DELETE tags"),
+    ("PRAGMA journal_mode = WAL", "PRAGMA"),
+])
+def test_statement_label(statement, label):
+    assert statement_label(statement) == label
@@ -0,0 +1,76 @@
+"""Mise à jour d'une base existante par `python -m api.migrate`."""
+
+import shutil
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api import query_helpers as helpers
+from api.migrate import create_missing_indexes
+
+
+@pytest.fixture
+def legacy_engine(database_path, tmp_path):
+    """Copie de la base de test, à dégrader en base antérieure avant la migration."""
+    path = tmp_path / "movies.db"
+    shutil.copy(database_path, path)
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrate_creates_and_fills_movies_fts(legacy_engine):
+    with legacy_engine.begin() as conn:
+        for name in ("movies_fts_insert", "movies_fts_delete", "movies_fts_update"):
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        conn.exec_driver_sql("DROP TABLE movies_fts")
+
+    create_missing_indexes(legacy_engine)
+    create_missing_indexes(legacy_engine)  # idempotent
+
+    with sessionmaker(bind=legacy_engine)() as db:
+        assert [movie.title for movie in helpers.search_movies(db, "toy sto")] == ["Toy Story (1995)"]
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE movies SET title = 'Amélie (2001)' WHERE \"movieId\" = 1")
+    with sessionmaker(bind=legacy_engine)() as db:
+        assert [movie.movieId for movie in helpers.search_movies(db, "amelie")] == [1]
+        assert helpers.search_movies(db, "toy sto") == []
+
+
+def test_migrate_fills_movie_genres(legacy_engine):
+    # base antérieure à movie_genres : ni la table ni ses triggers
+    with legacy_engine.begin() as conn:
+        for name in ("movies_genres_insert", "movies_genres_delete", "movies_genres_update"):
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        conn.exec_driver_sql("DROP TABLE movie_genres")
+
+    create_missing_indexes(legacy_engine)
+    create_missing_indexes(legacy_engine)  # idempotent
+
+    with legacy_engine.connect() as conn:
+        expected = {
+            (genre, movie_id)
+            for movie_id, genres in conn.exec_driver_sql("SELECT movieId, genres FROM movies")
+            for genre in genres.split("|")
+        }
+        rows = conn.exec_driver_sql("SELECT genre, movieId FROM movie_genres").all()
+    assert sorted(rows) == sorted(expected)
+    with sessionmaker(bind=legacy_engine)() as db:
+        assert helpers.get_movies(db, genres="Comedy", limit=5)
+
+
+def test_movie_genres_follow_movies(legacy_engine):
+    def genres(conn, movie_id):
+        return [row[0] for row in conn.exec_driver_sql(
+            "SELECT genre FROM movie_genres WHERE movieId = ? ORDER BY genre", (movie_id,))]
+
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO movies VALUES (999001, 'New (2020)', 'Drama|Comedy|Drama')")
+        assert genres(conn, 999001) == ["Comedy", "Drama"]
+        conn.exec_driver_sql("UPDATE movies SET genres = 'Horror' WHERE movieId = 999001")
+        assert genres(conn, 999001) == ["Horror"]
+        conn.exec_driver_sql("UPDATE movies SET movieId = 999002 WHERE movieId = 999001")
+        assert genres(conn, 999001) == [] and genres(conn, 999002) == ["Horror"]
+        conn.exec_driver_sql("DELETE FROM movies WHERE movieId = 999002")
+        assert genres(conn, 999002) == []
@@ -0,0 +1,84 @@
+"""Agrégats de /movies/{movie_id}/stats, tenus à jour par les triggers de MOVIE_STATS_DDL.
+
+Après chaque écriture dans ratings ou tags, la réponse doit être celle
+qu'on recalcule directement depuis ces tables.
+"""
+
+import math
+
+import pytest
+
+from api.query_helpers import RATING_BUCKETS
+
+# movie 1 et un film voisin, tous deux notés et tagués dans la base de test
+MOVIE_ID, OTHER_MOVIE_ID = 1, 10
+
+
+def expected_stats(conn, movie_id: int) -> dict:
+    ratings = conn.exec_driver_sql(
+        "SELECT rating, timestamp FROM ratings WHERE movieId = ?", (movie_id,)
+    ).all()
+    tag_count = conn.exec_driver_sql("SELECT count(*) FROM tags WHERE movieId = ?", (movie_id,)).scalar()
+    values = [rating for rating, _ in ratings]
+    mean = sum(values) / len(values) if values else None
+    return {
+        "movieId": movie_id,
+        "rating_count": len(values),
+        "rating_mean": mean,
+        "rating_std": math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)) if values else None,
+        "histogram": [
+            {"rating": bucket, "count": sum(round(v * 2) / 2 == bucket for v in values)}
+            for bucket in RATING_BUCKETS
+        ],
+        "tag_count": tag_count,
+        "first_rating_timestamp": min((ts for _, ts in ratings), default=None),
+        "last_rating_timestamp": max((ts for _, ts in ratings), default=None),
+    }
+
+
+def assert_stats_match(client, engine, *movie_ids):
+    with engine.connect() as conn:
+        for movie_id in movie_ids:
+            response = client.get(f"/movies/{movie_id}/stats")
+            assert response.status_code == 200
+            stats, expected = response.json(), expected_stats(conn, movie_id)
+            for field in ("rating_mean", "rating_std"):
+                assert stats.pop(field) == pytest.approx(expected.pop(field))
+            assert stats == expected
+
+
+def test_stats_of_the_loaded_database(client, database_engine):
+    assert_stats_match(client, database_engine, MOVIE_ID, OTHER_MOVIE_ID)
+    assert client.get("/movies/999999/stats").status_code == 404
+
+
+def test_stats_follow_rating_writes(writable_client, writable_engine):
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO ratings VALUES (999, ?, 0.5, 2000000000)", (MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID)
+
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE ratings SET rating = 4.5, timestamp = 1 WHERE userId = 999")
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID)
+
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE ratings SET movieId = ? WHERE userId = 999", (OTHER_MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID, OTHER_MOVIE_ID)
+
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM ratings WHERE movieId = ?", (OTHER_MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID, OTHER_MOVIE_ID)
+
+
+def test_stats_follow_tag_writes(writable_client, writable_engine):
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO tags VALUES (999, ?, 'new', 2000000000)", (MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID)
+
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE tags SET movieId = ? WHERE userId = 999", (OTHER_MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID, OTHER_MOVIE_ID)
+
+    with writable_engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM tags WHERE movieId = ?", (OTHER_MOVIE_ID,))
+    assert_stats_match(writable_client, writable_engine, MOVIE_ID, OTHER_MOVIE_ID)
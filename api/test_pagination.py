@@ -0,0 +1,45 @@
+"""Pagination par curseur : parcours complet et curseurs invalides."""
+
+import pytest
+
+from api import models, query_helpers as helpers
+
+
+def test_cursor_round_trip():
+    cursor = helpers.encode_cursor([414, 60756, "funny"])
+    assert helpers.decode_cursor(cursor, 3) == [414, 60756, "funny"]
+
+
+@pytest.mark.parametrize("values", [[[], 1], [{"a": 1}, 1], [None, 1], [True, 1]])
+def test_cursor_with_non_scalar_values_is_invalid(values):
+    with pytest.raises(ValueError):
+        helpers.decode_cursor(helpers.encode_cursor(values), 2)
+
+
+@pytest.mark.parametrize("path", [
+    "/ratings?cursor=W1tdLDFd",          # [[],1]
+    "/ratings?cursor=" + helpers.encode_cursor([{"a": 1}, 1]),
+    "/movies?cursor=" + helpers.encode_cursor([[1]]),
+    "/tags?cursor=" + helpers.encode_cursor([1, 2]),
+    "/links?cursor=not-base64!",
+])
+def test_malformed_cursor_is_a_client_error(client, path):
+    response = client.get(path)
+    assert response.status_code == 400
+    assert "Curseur invalide" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("path, model", [
+    ("/movies?limit=7", models.Movie),
+    ("/ratings?limit=100", models.Rating),
+    ("/tags?limit=9", models.Tag),
+    ("/links?limit=11", models.Link),
+])
+def test_cursor_walks_every_row_once(client, db, path, model):
+    rows, cursor = [], ""
+    while cursor is not None:
+        response = client.get(f"{path}&cursor={cursor}")
+        assert response.status_code == 200
+        rows.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+    assert len({str(row) for row in rows}) == len(rows) == db.query(model).count() > 0
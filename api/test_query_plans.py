@@ -0,0 +1,37 @@
+"""Plans SQLite des requêtes des query helpers, sur la base de test (voir conftest.py).
+
+Chaque requête doit passer par un index : un `SCAN` de ratings ou de tags
+grandit avec le jeu de données (des secondes sur 25 millions de notes).
+"""
+
+from api import query_helpers as helpers
+
+
+def _details(plans) -> list:
+    return [detail for plan in plans for detail in plan]
+
+
+def test_ratings_by_keys_searches_the_primary_key(db, query_plans):
+    keys = [(user_id, movie_id) for user_id in (1, 2, 3) for movie_id in (1, 10, 17)]
+    details = _details(query_plans(lambda: helpers.get_ratings_by_keys(db, keys)))
+    assert "MULTI-INDEX OR" in details
+    assert not [detail for detail in details if detail.startswith("SCAN")]
+    # index de la clé primaire composite (userId, movieId)
+    assert any(
+        detail.startswith("SEARCH ratings USING INDEX sqlite_autoindex_ratings_1 (userId=? AND movieId=?)")
+        for detail in details
+    )
+
+
+def test_ratings_by_keys_in_request_order(db):
+    keys = [(rating.userId, rating.movieId) for rating in helpers.get_ratings(db, limit=5)][::-1]
+    ratings = helpers.get_ratings_by_keys(db, keys + [(999, 1), keys[0]])
+    assert [(rating.userId, rating.movieId) for rating in ratings] == keys
+
+
+def test_latest_ratings_and_tags_read_the_timestamp_index(db, query_plans):
+    plans = query_plans(lambda: helpers.get_movie(db, 1, ratings_limit=5, tags_limit=5))
+    details = _details(plans)
+    assert "USE TEMP B-TREE FOR ORDER BY" not in details
+    assert any(detail.startswith("SEARCH ratings USING INDEX ix_ratings_movieId_timestamp") for detail in details)
+    assert any(detail.startswith("SEARCH tags USING INDEX ix_tags_movieId_timestamp") for detail in details)
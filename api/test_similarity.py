@@ -0,0 +1,48 @@
+"""Chargement de l'index de similarité (voir similarity.py)."""
+
+import os
+
+import numpy as np
+import pytest
+
+from api.similarity import load_index, save_index
+
+MOVIE_IDS = np.array([1, 10, 17], dtype=np.int32)
+NEIGHBORS = np.array([[17, 10], [1, -1], [1, 10]], dtype=np.int32)
+SCORES = np.array([[0.9, 0.5], [0.4, 0.0], [0.9, 0.3]], dtype=np.float32)
+
+
+@pytest.fixture
+def index_dir(tmp_path) -> str:
+    path = str(tmp_path / "similarity_index")
+    save_index(path, MOVIE_IDS, NEIGHBORS, SCORES)
+    return path
+
+
+def test_load_index(index_dir):
+    index = load_index(index_dir)
+    assert len(index) == 3 and index.k == 2
+    assert index.similar(1, 5) == [(17, pytest.approx(0.9)), (10, pytest.approx(0.5))]
+    assert index.similar(10, 5) == [(1, pytest.approx(0.4))]
+    assert index.similar(2, 5) is None
+
+
+def test_missing_index(tmp_path):
+    assert load_index(str(tmp_path / "absent")) is None
+
+
+def test_partial_index(index_dir):
+    os.remove(os.path.join(index_dir, "scores.npy"))
+    assert load_index(index_dir) is None
+
+
+def test_corrupt_index(index_dir):
+    path = os.path.join(index_dir, "neighbors.npy")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) // 2)
+    assert load_index(index_dir) is None
+
+
+def test_inconsistent_index(index_dir):
+    np.save(os.path.join(index_dir, "scores.npy"), SCORES[:2])
+    assert load_index(index_dir) is None
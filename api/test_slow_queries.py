@@ -0,0 +1,80 @@
+"""Journal des requêtes lentes et capture des plans (voir slow_queries.py)."""
+
+import json
+import logging
+import time
+
+import pytest
+from sqlalchemy import event, text
+
+from api import slow_queries
+from api.slow_queries import SlowQueryLog, configure_logging, read_log, shape_id, statement_shape, summarize
+
+THRESHOLD_MS = 50
+# une ligne lue par la clé primaire, ralentie au-delà du seuil par pause()
+SLOW_QUERY = 'SELECT title FROM movies WHERE "movieId" = :movie_id AND pause(0.08) IS NULL'
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch) -> str:
+    """Journal écrit dans un fichier temporaire, à la place de celui de l'API."""
+    path = str(tmp_path / "slow_queries.jsonl")
+    monkeypatch.setattr(slow_queries.logger, "handlers", [])
+    monkeypatch.setattr(slow_queries.logger, "propagate", True)
+    monkeypatch.setattr(slow_queries.logger, "level", logging.NOTSET)
+    configure_logging(path)
+    yield path
+    for handler in slow_queries.logger.handlers:
+        handler.close()
+
+
+@pytest.fixture
+def slow_engine(writable_engine):
+    @event.listens_for(writable_engine, "connect")
+    def add_pause(dbapi_connection, record):
+        dbapi_connection.create_function("pause", 1, time.sleep)
+
+    SlowQueryLog(threshold_ms=THRESHOLD_MS).instrument(writable_engine)
+    return writable_engine
+
+
+def test_slow_query_is_logged_once_with_its_plan(slow_engine, log_path):
+    with slow_engine.connect() as conn:
+        assert conn.execute(text('SELECT title FROM movies WHERE "movieId" = 1')).scalar()
+        assert conn.execute(text(SLOW_QUERY), {"movie_id": 1}).scalar()
+
+    [entry] = read_log(log_path)
+    assert entry["duration_ms"] >= THRESHOLD_MS
+    assert entry["parameters"] == [1]
+    assert entry["shape"] == statement_shape(entry["statement"])
+    assert entry["shape_id"] == shape_id(entry["shape"])
+    assert any("SEARCH movies USING INTEGER PRIMARY KEY" in line for line in entry["plan"])
+
+
+def test_plan_is_captured_once_per_shape(slow_engine, log_path):
+    with slow_engine.connect() as conn:
+        for movie_id in (1, 10):
+            conn.execute(text(SLOW_QUERY), {"movie_id": movie_id})
+
+    first, second = read_log(log_path)
+    assert first["shape_id"] == second["shape_id"]
+    assert "plan" in first and "plan" not in second
+    [shape] = summarize(read_log(log_path))
+    assert shape["count"] == 2 and shape["plan"] == first["plan"]
+
+
+def test_log_lines_are_json(slow_engine, log_path):
+    with slow_engine.connect() as conn:
+        conn.execute(text(SLOW_QUERY), {"movie_id": 1})
+    with open(log_path, encoding="utf-8") as f:
+        assert [json.loads(line)["parameters"] for line in f] == [[1]]
+
+
+@pytest.mark.parametrize("statement, shape", [
+    ("SELECT * FROM ratings WHERE movieId IN (?, ?, ?)", "SELECT * FROM ratings WHERE movieId IN (?, ...)"),
+    ("SELECT  *\n FROM movies LIMIT 20 OFFSET 40", "SELECT * FROM movies LIMIT ? OFFSET ?"),
+    ("SELECT rating FROM ratings WHERE rating >= 3.5", "SELECT rating FROM ratings WHERE rating >= ?"),
+    ('SELECT "table1".col2 FROM table1', 'SELECT "table1".col2 FROM table1'),
+])
+def test_statement_shape(statement, shape):
+    assert statement_shape(statement) == shape
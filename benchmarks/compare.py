@@ -0,0 +1,57 @@
+"""Compare deux rapports de `benchmarks.run`, endpoint par endpoint.
+
+Usage :
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Affiche l'écart relatif du débit et des latences p50/p95/p99. Le code de
+sortie vaut 1 si un p95 se dégrade de plus de `--threshold` pour cent, ce
+qui permet de l'utiliser dans un job d'intégration continue.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _delta(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(before: dict, after: dict, threshold: float) -> list:
+    """Affiche la comparaison et retourne les endpoints dont le p95 régresse."""
+    endpoints = dict(before["endpoints"], total=before["total"])
+    current = dict(after["endpoints"], total=after["total"])
+    regressions = []
+    width = max(len(name) for name in endpoints)
+    print(f"{'endpoint':<{width}}  " + "  ".join(f"{metric:>22}" for metric in METRICS))
+    for name in ["total"] + sorted(set(endpoints) & set(current) - {"total"}):
+        cells = []
+        for metric in METRICS:
+            old, new = endpoints[name][metric], current[name][metric]
+            cells.append(f"{old:>8.1f} -> {new:>8.1f} {_delta(old, new):+5.0f}%")
+        print(f"{name:<{width}}  " + "  ".join(cells))
+        if _delta(endpoints[name]["p95_ms"], current[name]["p95_ms"]) > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="régression de p95 tolérée, en pour cent")
+    args = parser.parse_args(argv)
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+    regressions = compare(before, after, args.threshold)
+    if regressions:
+        print(f"\np95 dégradé de plus de {args.threshold:.0f} % : {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
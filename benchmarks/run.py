@@ -0,0 +1,212 @@
+"""Banc de charge des endpoints : débit et latences p50/p95/p99 en JSON.
+
+La cible est soit l'application chargée dans le processus (`inprocess`,
+transport ASGI de httpx : ni réseau ni serveur, seulement FastAPI et la
+base), soit l'URL d'un serveur uvicorn/gunicorn déjà démarré.
+
+Usage :
+    python -m benchmarks.run --scenario browse --requests 5000 --concurrency 32 -o before.json
+    python -m benchmarks.run --target http://127.0.0.1:8000 --scenario all -o after.json
+    python -m benchmarks.compare before.json after.json
+
+En `inprocess`, le cache des réponses de l'API est désactivé sauf avec
+`--server-cache` : les requêtes répétées mesureraient sinon le cache et
+non les requêtes SQL. Les réglages MOVIES_DB_* / API_* de l'environnement
+s'appliquent comme pour le serveur.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import httpx
+
+from .scenarios import SCENARIOS, Call, build_calls, load_sample, skipped_endpoints
+
+# Réglages de l'API recopiés dans le rapport, pour comparer à configuration égale
+REPORTED_SETTINGS = (
+    "MOVIES_DB_MODE",
+    "MOVIES_DB_PROFILE",
+    "MOVIES_DB_POOL_SIZE",
+    "API_CACHE_ENABLED",
+    "API_FAST_JSON",
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(q / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+def summarize(latencies: List[float], errors: int, empty: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "empty": empty,
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if count else 0.0,
+    }
+
+
+async def _send(client: httpx.AsyncClient, call: Call) -> httpx.Response:
+    if call.method == "GET" and call.path.startswith("/export/"):
+        # les exports sont lus en entier, comme le ferait un client
+        async with client.stream("GET", call.path, params=call.params) as response:
+            await response.aread()
+            return response
+    return await client.request(call.method, call.path, params=call.params, json=call.json)
+
+
+async def run_calls(client: httpx.AsyncClient, calls: List[Call], concurrency: int):
+    """Envoie les requêtes avec `concurrency` appels simultanés.
+
+    Retourne les latences (ms), le nombre d'erreurs et de listes vides
+    inattendues par endpoint, et la durée totale.
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    empty: Dict[str, int] = defaultdict(int)
+    pending = iter(calls)
+
+    async def worker():
+        for call in pending:
+            started = time.perf_counter()
+            response = None
+            try:
+                response = await _send(client, call)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[call.endpoint].append((time.perf_counter() - started) * 1000)
+            errors[call.endpoint] += failed
+            empty[call.endpoint] += call.expects_rows and not failed and response.content.strip() == b"[]"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, empty, time.perf_counter() - started
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _client(target: str, concurrency: int, timeout: float) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if target == "inprocess":
+        from api.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://inprocess", timeout=timeout, limits=limits)
+    return httpx.AsyncClient(base_url=target, timeout=timeout, limits=limits)
+
+
+def _lifespan(target: str):
+    """Démarrage de l'application en `inprocess` (index de similarité), que le transport ASGI n'exécute pas."""
+    if target != "inprocess":
+        return contextlib.nullcontext()
+    from api.main import app
+
+    return app.router.lifespan_context(app)
+
+
+async def benchmark(args) -> dict:
+    async with _lifespan(args.target), _client(args.target, args.concurrency, args.timeout) as client:
+        sample = await load_sample(client)
+        if args.warmup:
+            await run_calls(client, build_calls(args.scenario, sample, args.warmup, seed=args.seed + 1), args.concurrency)
+        calls = build_calls(args.scenario, sample, args.requests, seed=args.seed)
+        latencies, errors, empty, elapsed = await run_calls(client, calls, args.concurrency)
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "target": args.target,
+        "scenario": args.scenario,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "git_revision": _git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {name: os.environ[name] for name in REPORTED_SETTINGS if name in os.environ},
+        "duration_s": round(elapsed, 3),
+        "skipped": skipped_endpoints(args.scenario, sample),
+        "total": summarize(all_latencies, sum(errors.values()), sum(empty.values()), elapsed),
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], empty[name], elapsed) for name in sorted(latencies)
+        },
+    }
+
+
+def print_table(report: dict, file=sys.stderr):
+    rows = [("total", report["total"])] + list(report["endpoints"].items())
+    width = max(len(name) for name, _ in rows)
+    print(f"{'endpoint':<{width}}  {'req':>6} {'err':>4} {'vide':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}",
+          file=file)
+    for name, stats in rows:
+        print(
+            f"{name:<{width}}  {stats['requests']:>6} {stats['errors']:>4} {stats['empty']:>5} "
+            f"{stats['throughput_rps']:>8.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}",
+            file=file,
+        )
+    if report.get("skipped"):
+        print(f"\nIgnorés, faute d'identifiants dans l'échantillon (base trop petite ?) : "
+              f"{', '.join(report['skipped'])}", file=file)
+    empty = [name for name, stats in report["endpoints"].items() if stats["empty"]]
+    if empty:
+        print(f"\nAttention : listes vides là où le scénario attend des lignes : {', '.join(empty)}", file=file)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="inprocess", help="inprocess (défaut) ou URL d'un serveur démarré")
+    parser.add_argument("--scenario", default="browse", choices=sorted(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="nombre de requêtes mesurées")
+    parser.add_argument("--concurrency", type=int, default=16, help="requêtes simultanées")
+    parser.add_argument("--warmup", type=int, default=200, help="requêtes non mesurées envoyées avant")
+    parser.add_argument("--seed", type=int, default=0, help="graine du tirage des requêtes")
+    parser.add_argument("--timeout", type=float, default=60.0, help="délai maximal d'une requête (s)")
+    parser.add_argument("--server-cache", action="store_true", help="garde le cache de réponses de l'API (inprocess)")
+    parser.add_argument("-o", "--output", help="fichier JSON du rapport (défaut : sortie standard)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.target == "inprocess" and not args.server_cache:
+        # lu à l'import de api.main
+        os.environ["API_CACHE_ENABLED"] = "0"
+    report = asyncio.run(benchmark(args))
+    print_table(report)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
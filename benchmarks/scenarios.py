@@ -0,0 +1,254 @@
+"""Endpoints et mélanges de requêtes (scénarios) du banc de charge.
+
+Chaque endpoint construit une requête à partir d'identifiants réels lus
+dans l'API au démarrage (voir `Sample`) : les requêtes répondent 200 et
+couvrent tout le jeu de données plutôt qu'un seul film. Un scénario est
+une liste pondérée d'endpoints ; la séquence de requêtes est tirée d'un
+générateur aléatoire initialisé par une graine, elle est donc identique
+d'une exécution à l'autre.
+"""
+
+import random
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Sample(NamedTuple):
+    """Identifiants existants utilisés pour construire les requêtes."""
+
+    movie_ids: List[int]
+    genres: List[str]
+    title_words: List[str]
+    user_ids: List[int]
+    rating_keys: List[Tuple[int, int]]
+    tag_keys: List[Tuple[int, int, str]]
+
+
+class Call(NamedTuple):
+    endpoint: str
+    method: str
+    path: str
+    params: Optional[dict] = None
+    json: Optional[dict] = None
+    # la réponse doit contenir des lignes : une liste vide signale une requête mal construite
+    expects_rows: bool = False
+
+
+class Endpoint(NamedTuple):
+    name: str
+    build: Callable[[Sample, random.Random], Call]
+    # champs de Sample qui doivent être non vides : sinon l'endpoint est écarté du tirage
+    requires: Tuple[str, ...] = ()
+
+
+# Pages tirées par `GET /movies?genres=` : seuls les genres d'au moins
+# GENRE_MIN_MOVIES films sont gardés, pour que chaque page contienne des films
+GENRE_MAX_SKIP = 500
+GENRE_MIN_MOVIES = GENRE_MAX_SKIP
+
+
+async def load_sample(client, size: int = 1000) -> Sample:
+    """Lit une page de chaque table pour en tirer des identifiants existants."""
+    movies = (await client.get("/movies", params={"limit": size})).json()
+    ratings = (await client.get("/ratings", params={"limit": size})).json()
+    tags = (await client.get("/tags", params={"limit": size})).json()
+    # genres est la chaîne "Action|Comedy" de la table movies
+    candidates = {genre for movie in movies for genre in (movie["genres"] or "").split("|")}
+    candidates = sorted(candidates - {"", "(no genres listed)"})
+    genres = [
+        genre for genre in candidates
+        if (await client.get("/movies", params={"genres": genre, "limit": 1, "skip": GENRE_MIN_MOVIES - 1})).json()
+    ]
+    words = sorted({word for movie in movies for word in movie["title"].split() if word.isalpha() and len(word) > 3})
+    return Sample(
+        movie_ids=[movie["movieId"] for movie in movies],
+        genres=genres,
+        title_words=words,
+        user_ids=sorted({rating["userId"] for rating in ratings}),
+        rating_keys=[(rating["userId"], rating["movieId"]) for rating in ratings],
+        # "/" ne peut pas figurer dans un segment de chemin
+        tag_keys=[(tag["userId"], tag["movieId"], tag["tag"]) for tag in tags if "/" not in tag["tag"]],
+    )
+
+
+def _call(name: str, path: str, params: Optional[dict] = None, json: Optional[dict] = None, method: str = "GET",
+          expects_rows: bool = False):
+    return Call(name, method, path, params, json, expects_rows)
+
+
+ENDPOINTS = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint("GET /", lambda s, r: _call("GET /", "/")),
+        Endpoint(
+            "GET /movies/{id}",
+            lambda s, r: _call("GET /movies/{id}", f"/movies/{r.choice(s.movie_ids)}"),
+        ),
+        Endpoint(
+            "GET /movies/{id}?include_stats",
+            lambda s, r: _call(
+                "GET /movies/{id}?include_stats",
+                f"/movies/{r.choice(s.movie_ids)}",
+                {"ratings_limit": 20, "tags_limit": 20, "include_stats": "true"},
+            ),
+        ),
+        Endpoint(
+            "GET /movies/{id}/stats",
+            lambda s, r: _call("GET /movies/{id}/stats", f"/movies/{r.choice(s.movie_ids)}/stats"),
+        ),
+        Endpoint(
+            "GET /movies/{id}/similar",
+            lambda s, r: _call("GET /movies/{id}/similar", f"/movies/{r.choice(s.movie_ids)}/similar", {"k": 10}),
+        ),
+        Endpoint(
+            "GET /movies?genres=",
+            lambda s, r: _call(
+                "GET /movies?genres=", "/movies",
+                {"genres": ",".join(r.sample(s.genres, r.randint(1, min(2, len(s.genres))))), "limit": 100,
+                 "skip": r.randrange(0, GENRE_MAX_SKIP, 50)},
+                expects_rows=True,
+            ),
+            # aucun genre n'a GENRE_MIN_MOVIES films sur une petite base
+            requires=("genres",),
+        ),
+        Endpoint(
+            "GET /movies?title=",
+            lambda s, r: _call(
+                "GET /movies?title=", "/movies", {"title": r.choice(s.title_words), "limit": 50}, expects_rows=True
+            ),
+        ),
+        Endpoint(
+            "GET /movies?cursor=",
+            lambda s, r: _call("GET /movies?cursor=", "/movies", {"limit": 1000, "cursor": ""}, expects_rows=True),
+        ),
+        Endpoint(
+            "GET /movies/search",
+            lambda s, r: _call(
+                "GET /movies/search", "/movies/search", {"q": r.choice(s.title_words)[:4], "limit": 20}, expects_rows=True
+            ),
+        ),
+        Endpoint(
+            "POST /movies/batch",
+            lambda s, r: _call(
+                "POST /movies/batch", "/movies/batch", json={"ids": r.sample(s.movie_ids, 50)}, method="POST",
+                expects_rows=True,
+            ),
+        ),
+        Endpoint(
+            "GET /ratings/{user_id}/{movie_id}",
+            lambda s, r: _call("GET /ratings/{user_id}/{movie_id}", "/ratings/{}/{}".format(*r.choice(s.rating_keys))),
+        ),
+        Endpoint(
+            "GET /ratings?movies_id=",
+            lambda s, r: _call("GET /ratings?movies_id=", "/ratings", {"movies_id": r.choice(s.movie_ids), "limit": 100}),
+        ),
+        Endpoint(
+            "GET /ratings?user_id=",
+            lambda s, r: _call(
+                "GET /ratings?user_id=", "/ratings", {"user_id": r.choice(s.user_ids), "min_rating": 3.5, "limit": 100}
+            ),
+        ),
+        Endpoint(
+            "POST /ratings/batch",
+            lambda s, r: _call(
+                "POST /ratings/batch", "/ratings/batch",
+                json={"keys": [{"userId": u, "movieId": m} for u, m in r.sample(s.rating_keys, 50)]},
+                method="POST",
+                expects_rows=True,
+            ),
+        ),
+        Endpoint(
+            "GET /tags/{user_id}/{movie_id}/{tag}",
+            lambda s, r: _call("GET /tags/{user_id}/{movie_id}/{tag}", "/tags/{}/{}/{}".format(*r.choice(s.tag_keys))),
+            requires=("tag_keys",),
+        ),
+        Endpoint(
+            "GET /tags?movie_id=",
+            lambda s, r: _call(
+                "GET /tags?movie_id=", "/tags", {"movie_id": r.choice(s.tag_keys)[1], "limit": 100}, expects_rows=True
+            ),
+            requires=("tag_keys",),
+        ),
+        Endpoint(
+            "GET /links/{id}",
+            lambda s, r: _call("GET /links/{id}", f"/links/{r.choice(s.movie_ids)}"),
+        ),
+        Endpoint(
+            "GET /links",
+            lambda s, r: _call(
+                "GET /links", "/links", {"limit": 100, "skip": r.randrange(0, 9000, 100)}, expects_rows=True
+            ),
+        ),
+        Endpoint(
+            "POST /links/batch",
+            lambda s, r: _call(
+                "POST /links/batch", "/links/batch", json={"ids": r.sample(s.movie_ids, 50)}, method="POST",
+                expects_rows=True,
+            ),
+        ),
+        Endpoint("GET /analytics", lambda s, r: _call("GET /analytics", "/analytics")),
+        Endpoint(
+            "GET /export/links",
+            lambda s, r: _call("GET /export/links", "/export/links", {"format": "ndjson"}),
+        ),
+    )
+}
+
+# Poids relatifs de chaque endpoint dans un scénario
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    # Trafic d'un site de navigation : fiches de films, listes filtrées, recherche
+    "browse": {
+        "GET /movies/{id}": 30,
+        "GET /movies/{id}?include_stats": 10,
+        "GET /movies?genres=": 15,
+        "GET /movies?title=": 5,
+        "GET /movies/search": 20,
+        "GET /links/{id}": 10,
+        "POST /movies/batch": 5,
+        "GET /ratings?movies_id=": 5,
+    },
+    # Lecture des notes et tags (recommandation, analyse par utilisateur)
+    "ratings": {
+        "GET /ratings/{user_id}/{movie_id}": 30,
+        "GET /ratings?movies_id=": 25,
+        "GET /ratings?user_id=": 25,
+        "POST /ratings/batch": 10,
+        "GET /tags?movie_id=": 5,
+        "GET /tags/{user_id}/{movie_id}/{tag}": 5,
+        "GET /movies/{id}/similar": 10,
+    },
+    "analytics": {
+        "GET /analytics": 50,
+        "GET /movies/{id}/stats": 50,
+    },
+    # Toutes les routes à poids égal, exports compris
+    "all": {name: 1 for name in ENDPOINTS},
+}
+
+
+def _scenario(scenario: str) -> Dict[str, int]:
+    try:
+        return SCENARIOS[scenario]
+    except KeyError:
+        raise ValueError(f"Scénario inconnu : {scenario!r} (choisir parmi {', '.join(SCENARIOS)})") from None
+
+
+def skipped_endpoints(scenario: str, sample: Sample) -> List[str]:
+    """Endpoints du scénario écartés faute d'identifiants dans l'échantillon (voir `Endpoint.requires`)."""
+    return [
+        name for name in _scenario(scenario)
+        if not all(getattr(sample, field) for field in ENDPOINTS[name].requires)
+    ]
+
+
+def build_calls(scenario: str, sample: Sample, count: int, seed: int = 0) -> List[Call]:
+    """Tire `count` requêtes du scénario, toujours les mêmes pour une graine donnée.
+
+    Les endpoints de `skipped_endpoints` ne sont pas tirés.
+    """
+    skipped = skipped_endpoints(scenario, sample)
+    weights = {name: weight for name, weight in _scenario(scenario).items() if name not in skipped}
+    if not weights:
+        raise ValueError(f"Scénario {scenario!r} inutilisable : l'échantillon ne permet aucun de ses endpoints")
+    rng = random.Random(seed)
+    names = rng.choices(list(weights), weights=list(weights.values()), k=count)
+    return [ENDPOINTS[name].build(sample, rng) for name in names]
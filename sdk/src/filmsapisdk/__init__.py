@@ -1,15 +1,23 @@
 
 from .film_client import MovieClient
+from .async_film_client import AsyncMovieClient
 from .film_config import MovieConfig
+from .film_cache import MemoryCache, SQLiteCache, CacheStats
 from .schemas import *
 
 __all__ = [
     "MovieClient",
+    "AsyncMovieClient",
     "MovieConfig",
+    "MemoryCache",
+    "SQLiteCache",
+    "CacheStats",
     "MovieSimple",
     "MovieDetailed",
     "RatingSimple",
     "TagSimple",
     "LinkSimple",
     "AnalyticsResponse",
+    "RatingBucket",
+    "MovieStats",
 ]
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import httpx
+from typing import TYPE_CHECKING, Optional, List, Literal, Union, Tuple, AsyncIterator, BinaryIO, Callable, Awaitable, Iterable
+
+from .schemas import MovieSimple, MovieDetailed, RatingSimple, TagSimple, LinkSimple, AnalyticsResponse, MovieStats
+
+from .film_client import (
+    BATCH_MAX_SIZE,
+    MAX_PAGE_SIZE,
+    BaseMovieClient,
+    concat_pages,
+    _arrow_to_pandas,
+    _conditional,
+    _movie_params,
+    _movies_params,
+    _ratings_params,
+    _tags_params,
+    http_client_options,
+    with_backoff,
+)
+from .film_config import MovieConfig
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Nombre d'appels simultanés par défaut des helpers de fan-out
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncMovieClient(BaseMovieClient):
+    """Client asynchrone de l'API MovieLens, sur `httpx.AsyncClient`.
+
+    Mêmes méthodes que `MovieClient`, à attendre avec `await`. Les helpers
+    `gather`, `get_movie_many` et `list_pages` lancent de nombreux appels en
+    parallèle, bornés par un sémaphore.
+
+        async with AsyncMovieClient(config) as client:
+            movies = await client.get_movie_many([1, 2, 3])
+    """
+
+    def __init__(self, config: Optional[MovieConfig] = None):
+        super().__init__(config)
+        self._client = httpx.AsyncClient(**http_client_options(self.config))
+        self._request = with_backoff(self.config, self._send)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Ferme les connexions du pool."""
+        await self._client.aclose()
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self._client.request(method, url, **kwargs)
+        # 304 : l'entrée du cache revalidée par If-None-Match reste valable
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        if self.cache is None:
+            return await self._request("GET", url, **kwargs)
+        # lectures/écritures du cache locales et courtes : faites sans await
+        key, entry = self._cache_lookup(url, kwargs)
+        if entry is not None and entry.fresh:
+            return self._cache_hit(url, entry)
+        response = await self._request("GET", url, **_conditional(kwargs, entry))
+        return self._cache_store(key, entry, url, response)
+
+    async def _list(self, path: str, params: dict, model, output_format, cursor: Optional[str]):
+        response = await self._get(f"{self.movie_base_url}{path}", **self._list_request(params, output_format, cursor))
+        return self._page(response, model, output_format, cursor)
+
+    async def _batch(self, path: str, field: str, items: list) -> list:
+        """Résout des identifiants par requêtes POST /batch de BATCH_MAX_SIZE éléments, en parallèle."""
+        chunks = [items[start:start + BATCH_MAX_SIZE] for start in range(0, len(items), BATCH_MAX_SIZE)]
+
+        async def post(chunk):
+            response = await self._request("POST", f"{self.movie_base_url}{path}", json={field: chunk})
+            return response.json()
+
+        pages = await self.gather(post, chunks, return_exceptions=False)
+        return [item for page in pages for item in page]
+
+    # Fan-out borné
+
+    async def gather(
+        self,
+        func: Callable[..., Awaitable],
+        items: Iterable,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        return_exceptions: bool = True,
+    ) -> list:
+        """Appelle `func(item)` pour chaque élément, au plus `concurrency` appels à la fois.
+
+        Les résultats suivent l'ordre des éléments. Avec `return_exceptions`
+        (défaut), l'erreur d'un élément est retournée à sa place au lieu
+        d'interrompre les autres appels.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(call(item) for item in items), return_exceptions=return_exceptions)
+
+    async def get_movie_many(
+        self,
+        movie_ids: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        return_exceptions: bool = True,
+        **kwargs,
+    ) -> List[Union[MovieDetailed, Exception]]:
+        """Récupère le détail de plusieurs films en parallèle (arguments de `get_movie` en plus).
+
+        Un film introuvable donne une `httpx.HTTPStatusError` à sa place.
+        Pour des `MovieSimple`, préférer `get_movies()` (une seule requête).
+        """
+        return await self.gather(
+            lambda movie_id: self.get_movie(movie_id, **kwargs),
+            movie_ids,
+            concurrency=concurrency,
+            return_exceptions=return_exceptions,
+        )
+
+    async def list_pages(
+        self,
+        list_method: Callable[..., Awaitable],
+        pages: int,
+        limit: int = 1000,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        return_exceptions: bool = True,
+        **filters,
+    ) -> list:
+        """Récupère `pages` pages d'une liste en parallèle (pagination par skip).
+
+        `list_method` est une méthode list_* du client, par exemple
+        `client.list_ratings` ; les pages sont retournées dans l'ordre.
+        """
+        return await self.gather(
+            lambda page: list_method(skip=page * limit, limit=limit, **filters),
+            range(pages),
+            concurrency=concurrency,
+            return_exceptions=return_exceptions,
+        )
+
+    # Méthodes de MovieClient
+
+    async def health_check(self) -> dict:
+        url = f"{self.movie_base_url}/"
+        # état courant de l'API : jamais servi par le cache
+        response = await self._request("GET", url)
+        return response.json()
+
+    async def get_movie(
+        self,
+        movie_id: int,
+        ratings_limit: Optional[int] = None,
+        tags_limit: Optional[int] = None,
+        include_stats: bool = False,
+    ) -> MovieDetailed:
+        url = f"{self.movie_base_url}/movies/{movie_id}"
+        params = _movie_params(ratings_limit, tags_limit, include_stats)
+        response = await self._get(url, params=params)
+        return MovieDetailed(**response.json())
+
+    async def get_movies(self, movie_ids: List[int]) -> List[MovieSimple]:
+        """Récupère plusieurs films en un aller-retour par tranche de 500 IDs (IDs inconnus ignorés)."""
+        return [MovieSimple(**item) for item in await self._batch("/movies/batch", "ids", list(movie_ids))]
+
+    async def get_movie_stats(self, movie_id: int) -> MovieStats:
+        url = f"{self.movie_base_url}/movies/{movie_id}/stats"
+        response = await self._get(url)
+        return MovieStats(**response.json())
+
+    async def list_movies(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        title: Optional[str] = None,
+        genre: Optional[Union[str, List[str]]] = None,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+        genres_match: Literal["any", "all"] = "any",
+    ) -> Union[List[MovieSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _movies_params(skip, limit, title, genre, genres_match)
+        return await self._list("/movies", params, MovieSimple, output_format, cursor)
+
+    async def search_movies(
+        self,
+        query: str,
+        limit: int = 20,
+        output_format: Literal["pydantic", "dict", "pandas"] = "pydantic",
+    ) -> Union[List[MovieSimple], List[dict], pd.DataFrame]:
+        url = f"{self.movie_base_url}/movies/search"
+        response = await self._get(url, params={"q": query, "limit": limit})
+        return self._format_output(response.json(), MovieSimple, output_format)
+
+    async def get_rating(self, user_id: int, movie_id: int) -> RatingSimple:
+        url = f"{self.movie_base_url}/ratings/{user_id}/{movie_id}"
+        response = await self._get(url)
+        return RatingSimple(**response.json())
+
+    async def get_ratings(self, keys: List[Tuple[int, int]]) -> List[RatingSimple]:
+        """Récupère plusieurs évaluations à partir de couples (user_id, movie_id)."""
+        items = [{"userId": user_id, "movieId": movie_id} for user_id, movie_id in keys]
+        return [RatingSimple(**item) for item in await self._batch("/ratings/batch", "keys", items)]
+
+    async def list_ratings(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        movie_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+        max_rating: Optional[float] = None,
+    ) -> Union[List[RatingSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _ratings_params(skip, limit, movie_id, user_id, min_rating, max_rating)
+        return await self._list("/ratings", params, RatingSimple, output_format, cursor)
+
+    async def get_tag(self, user_id: int, movie_id: int, tag_text: str) -> TagSimple:
+        url = f"{self.movie_base_url}/tags/{user_id}/{movie_id}/{tag_text}"
+        response = await self._get(url)
+        return TagSimple(**response.json())
+
+    async def list_tags(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        movie_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+    ) -> Union[List[TagSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _tags_params(skip, limit, movie_id, user_id)
+        return await self._list("/tags", params, TagSimple, output_format, cursor)
+
+    async def get_link(self, movie_id: int) -> LinkSimple:
+        url = f"{self.movie_base_url}/links/{movie_id}"
+        response = await self._get(url)
+        return LinkSimple(**response.json())
+
+    async def get_links(self, movie_ids: List[int]) -> List[LinkSimple]:
+        """Récupère les liens IMDB / TMDB de plusieurs films (IDs inconnus ignorés)."""
+        return [LinkSimple(**item) for item in await self._batch("/links/batch", "ids", list(movie_ids))]
+
+    async def list_links(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+    ) -> Union[List[LinkSimple], List[dict], pd.DataFrame, Tuple]:
+        params = {"skip": skip, "limit": limit}
+        return await self._list("/links", params, LinkSimple, output_format, cursor)
+
+    async def get_analytics(self) -> AnalyticsResponse:
+        url = f"{self.movie_base_url}/analytics"
+        response = await self._get(url)
+        return AnalyticsResponse(**response.json())
+
+    # Parcours complet des listes
+
+    async def iter_pages(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        page_size: int = MAX_PAGE_SIZE,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        prefetch: bool = True,
+        **filters,
+    ) -> AsyncIterator:
+        """Parcourt toutes les pages d'une liste par curseur (voir `MovieClient.iter_pages`).
+
+        Avec `prefetch`, la page suivante est demandée dans une tâche pendant
+        que l'appelant traite la page courante.
+        """
+        list_method = self._list_method(resource)
+
+        def fetch(cursor: str):
+            return list_method(limit=page_size, output_format=output_format, cursor=cursor, **filters)
+
+        if not prefetch:
+            cursor = ""
+            while cursor is not None:
+                page, cursor = await fetch(cursor)
+                yield page
+            return
+
+        task = asyncio.ensure_future(fetch(""))
+        try:
+            while task is not None:
+                page, cursor = await task
+                task = asyncio.ensure_future(fetch(cursor)) if cursor is not None else None
+                yield page
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _iter_items(self, resource: str, page_size: int, output_format: str, prefetch: bool, filters: dict):
+        async for page in self.iter_pages(resource, page_size, output_format, prefetch, **filters):
+            for item in page:
+                yield item
+
+    def iter_movies(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                    prefetch: bool = True, **filters) -> AsyncIterator[Union[MovieSimple, dict]]:
+        """Itère sur tous les films (filtres de list_movies), page après page."""
+        return self._iter_items("movies", page_size, output_format, prefetch, filters)
+
+    def iter_ratings(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                     prefetch: bool = True, **filters) -> AsyncIterator[Union[RatingSimple, dict]]:
+        """Itère sur toutes les évaluations (filtres de list_ratings), page après page."""
+        return self._iter_items("ratings", page_size, output_format, prefetch, filters)
+
+    def iter_tags(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                  prefetch: bool = True, **filters) -> AsyncIterator[Union[TagSimple, dict]]:
+        """Itère sur tous les tags (filtres de list_tags), page après page."""
+        return self._iter_items("tags", page_size, output_format, prefetch, filters)
+
+    def iter_links(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                   prefetch: bool = True) -> AsyncIterator[Union[LinkSimple, dict]]:
+        """Itère sur tous les liens IMDB / TMDB, page après page."""
+        return self._iter_items("links", page_size, output_format, prefetch, {})
+
+    async def to_dataframe(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        page_size: int = MAX_PAGE_SIZE,
+        output_format: Literal["dict", "arrow"] = "dict",
+        prefetch: bool = True,
+        **filters,
+    ) -> pd.DataFrame:
+        """Charge toutes les pages d'une liste dans un seul DataFrame."""
+        pages = [page async for page in self.iter_pages(resource, page_size, output_format, prefetch, **filters)]
+        return concat_pages(pages, output_format)
+
+    async def export(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        destination: Union[str, os.PathLike, BinaryIO],
+        export_format: Literal["ndjson", "csv", "arrow", "parquet"] = "ndjson",
+        **filters,
+    ) -> int:
+        """Écrit l'export complet d'une table dans un fichier, au fil du flux (voir `MovieClient.export`)."""
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, export_format, filters)
+        written = 0
+        async with self._client.stream("GET", url, params=params, timeout=None) as response:
+            response.raise_for_status()
+            if isinstance(destination, (str, os.PathLike)):
+                with open(destination, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        written += f.write(chunk)
+            else:
+                async for chunk in response.aiter_bytes():
+                    written += destination.write(chunk)
+        return written
+
+    async def iter_export(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        **filters,
+    ) -> AsyncIterator[dict]:
+        """Itère sur l'export NDJSON d'une table, une ligne (dict) à la fois."""
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, "ndjson", filters)
+        async with self._client.stream("GET", url, params=params, timeout=None) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def export_dataframe(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        **filters,
+    ) -> pd.DataFrame:
+        """Charge l'export complet d'une table dans un DataFrame, via un flux Arrow."""
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, "arrow", filters)
+        response = await self._get(url, params=params, timeout=None)
+        return _arrow_to_pandas(response.content)
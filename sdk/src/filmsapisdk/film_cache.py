@@ -0,0 +1,209 @@
+"""Cache des réponses GET côté client, en mémoire ou sur disque (SQLite).
+
+Les entrées sont bornées en nombre, en octets et en durée de vie ; les
+moins récemment utilisées sont évincées en premier. Une entrée expirée
+n'est pas jetée : si elle porte un ETag, le client la revalide avec
+`If-None-Match` et l'API répond 304 sans renvoyer le corps.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: dict
+    etag: Optional[str]
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.time()
+
+
+class CacheStats:
+    """Compteurs d'utilisation du cache, partagés par tous les clients du cache."""
+
+    __slots__ = ("hits", "misses", "revalidations", "evictions", "_lock")
+
+    def __init__(self):
+        self.hits = 0           # réponse servie par le cache, sans appel
+        self.misses = 0         # réponse complète téléchargée
+        self.revalidations = 0  # entrée expirée confirmée par un 304
+        self.evictions = 0      # entrées retirées pour respecter les limites
+        self._lock = threading.Lock()
+
+    def increment(self, counter: str):
+        """Incrémente un compteur ; `+=` n'est pas atomique entre threads."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.revalidations
+        total = served + self.misses
+        return served / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def __repr__(self):
+        return f"CacheStats({self.as_dict()})"
+
+
+def cache_key(url: str, params: Optional[dict], accept: Optional[str]) -> str:
+    """Clé d'une requête GET : URL, paramètres triés et en-tête Accept."""
+    raw = json.dumps([url, sorted((params or {}).items()), accept or ""], default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class MemoryCache:
+    """Cache LRU en mémoire, partagé entre threads."""
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: bytes, headers: dict, etag: Optional[str]):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedResponse(body, headers, etag, time.time() + self.ttl)
+            self.size += len(body)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats.increment("evictions")
+
+    def refresh(self, key: str):
+        """Repousse l'expiration d'une entrée revalidée."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = entry._replace(expires=time.time() + self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str):
+        self.size -= len(self._entries.pop(key).body)
+
+
+class SQLiteCache:
+    """Cache LRU persistant dans un fichier SQLite, partagé entre processus."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS responses ("
+        "key TEXT PRIMARY KEY, body BLOB NOT NULL, headers TEXT NOT NULL, etag TEXT, "
+        "expires REAL NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_responses_last_used ON responses (last_used)",
+    )
+
+    def __init__(self, path: str, max_entries: int = 100_000, max_bytes: int = 512 * 1024 * 1024,
+                 ttl: float = 300):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in self.SCHEMA:
+            self._conn.execute(statement)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, etag, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        body, headers, etag, expires = row
+        return CachedResponse(body, json.loads(headers), etag, expires)
+
+    def put(self, key: str, body: bytes, headers: dict, etag: Optional[str]):
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, json.dumps(headers), etag, now + self.ttl, len(body), now),
+            )
+            self._evict()
+
+    def refresh(self, key: str):
+        """Repousse l'expiration d'une entrée revalidée."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires = ? WHERE key = ?", (time.time() + self.ttl, key))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        self._conn.close()
+
+    def _evict(self):
+        count, size = self._conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or size > self.max_bytes:
+            key, entry_size = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            size -= entry_size
+            self.stats.increment("evictions")
+
+
+def create_cache(config):
+    """Cache décrit par `config.movie_cache` : None, "memory", "sqlite" ou un objet cache."""
+    cache = config.movie_cache
+    limits = {
+        "max_entries": config.movie_cache_max_entries,
+        "max_bytes": config.movie_cache_max_bytes,
+        "ttl": config.movie_cache_ttl,
+    }
+    if cache == "memory":
+        return MemoryCache(**limits)
+    if cache == "sqlite":
+        return SQLiteCache(config.movie_cache_path, **limits)
+    if isinstance(cache, str):
+        raise ValueError("Invalid cache. Choose from 'memory' or 'sqlite'.")
+    return cache
@@ -1,16 +1,203 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import backoff
 import httpx
-import pandas as pd
-from typing import Optional, List, Literal, Union
+from typing import TYPE_CHECKING, Optional, List, Literal, Union, Tuple, Iterator, BinaryIO
 
-from .schemas import MovieSimple, MovieDetailed,RatingSimple, TagSimple,  LinkSimple , AnalyticsResponse
+from .schemas import MovieSimple, MovieDetailed,RatingSimple, TagSimple,  LinkSimple , AnalyticsResponse, MovieStats
 
 from .film_config import MovieConfig
+from .film_cache import CachedResponse, cache_key, create_cache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+EXPORT_RESOURCES = ("movies", "ratings", "tags", "links")
+
+# Taille de page maximale acceptée par les endpoints de liste
+MAX_PAGE_SIZE = 1000
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Taille maximale d'une requête /batch acceptée par l'API
+BATCH_MAX_SIZE = 500
+
+# En-têtes conservés avec une réponse en cache
+CACHED_HEADERS = ("content-type", "etag", NEXT_CURSOR_HEADER.lower())
+
+# Réponses réessayées avec backoff : limite de débit et erreurs serveur
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _should_give_up(exc: Exception) -> bool:
+    """Abandonne sur les erreurs définitives (4xx sauf 429)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code not in RETRY_STATUSES
+    return False
+
+
+def with_backoff(config: MovieConfig, send):
+    """Ajoute à `send` le backoff exponentiel plafonné, avec jitter, décrit par la configuration.
+
+    Les erreurs de transport et les réponses 429/5xx sont réessayées tant que
+    `movie_backoff_max_time` n'est pas écoulé ; l'attente double à chaque
+    essai (tirage aléatoire entre 0 et l'attente, « full jitter ») sans
+    dépasser `movie_backoff_max_delay`. Fonctionne aussi avec une coroutine.
+    """
+    if not config.movie_backoff:
+        return send
+    return backoff.on_exception(
+        backoff.expo,
+        (httpx.HTTPStatusError, httpx.TransportError),
+        giveup=_should_give_up,
+        max_time=config.movie_backoff_max_time,
+        max_value=config.movie_backoff_max_delay,
+        jitter=backoff.full_jitter,
+        logger=None,
+    )(send)
+
+
+def http_client_options(config: MovieConfig) -> dict:
+    """Options du client httpx (pool, keep-alive, timeouts, HTTP/2) tirées de la configuration."""
+    return {
+        "timeout": config.movie_timeout,
+        "limits": httpx.Limits(
+            max_connections=config.movie_max_connections,
+            max_keepalive_connections=config.movie_max_keepalive_connections,
+            keepalive_expiry=config.movie_keepalive_expiry,
+        ),
+        "http2": config.movie_http2,
+    }
+
+
+def _pandas():
+    """Importe pandas au premier besoin : `import filmsapisdk` reste rapide
+    pour les usages sans DataFrame (scripts courts, fonctions serverless)."""
+    import pandas
+    return pandas
+
+
+def _arrow_to_pandas(content: bytes) -> pd.DataFrame:
+    """Convertit un flux Arrow IPC en DataFrame.
+
+    Les colonnes numériques sans valeurs nulles sont reprises sans copie
+    (`split_blocks`), et la table Arrow est libérée au fil de la conversion.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError(
+            "output_format='arrow' nécessite pyarrow : pip install 'filmsapisdk[arrow]'"
+        ) from exc
+    table = pa.ipc.open_stream(content).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _movie_params(ratings_limit, tags_limit, include_stats) -> dict:
+    params = {}
+    if ratings_limit is not None:
+        params["ratings_limit"] = ratings_limit
+    if tags_limit is not None:
+        params["tags_limit"] = tags_limit
+    if include_stats:
+        params["include_stats"] = True
+    return params
+
 
+def _movies_params(skip, limit, title, genre, genres_match) -> dict:
+    params = {"skip": skip, "limit": limit}
+    if title:
+        params["title"] = title
+    if genre:
+        params["genres"] = genre if isinstance(genre, str) else ",".join(genre)
+        params["genres_match"] = genres_match
+    return params
+
+
+def _ratings_params(skip, limit, movie_id, user_id, min_rating, max_rating) -> dict:
+    params = {"skip": skip, "limit": limit}
+    if movie_id:
+        params["movies_id"] = movie_id
+    if user_id:
+        params["user_id"] = user_id
+    if min_rating:
+        params["min_rating"] = min_rating
+    if max_rating is not None:
+        params["max_rating"] = max_rating
+    return params
+
+
+def _tags_params(skip, limit, movie_id, user_id) -> dict:
+    params = {"skip": skip, "limit": limit}
+    if movie_id:
+        params["movie_id"] = movie_id
+    if user_id:
+        params["user_id"] = user_id
+    return params
+
+
+def _cached_response(url: str, entry: CachedResponse) -> httpx.Response:
+    return httpx.Response(200, content=entry.body, headers=entry.headers, request=httpx.Request("GET", url))
+
+
+def _conditional(kwargs: dict, entry: Optional[CachedResponse]) -> dict:
+    """Ajoute If-None-Match aux arguments d'une requête si l'entrée expirée a un ETag."""
+    if entry is None or not entry.etag:
+        return kwargs
+    return {**kwargs, "headers": {**(kwargs.get("headers") or {}), "If-None-Match": entry.etag}}
+
+
+def concat_pages(pages: list, output_format: str) -> pd.DataFrame:
+    """Assemble des pages en un seul DataFrame, en une seule copie.
+
+    Les pages "dict" sont mises bout à bout avant de construire le
+    DataFrame ; les pages "arrow" (DataFrames) sont concaténées en un appel.
+    """
+    pd = _pandas()
+    if output_format == "arrow":
+        if not pages:
+            return pd.DataFrame()
+        return pd.concat(pages, ignore_index=True)
+    return pd.DataFrame([item for page in pages for item in page])
+
+
+class BaseMovieClient:
+    """Partie commune aux clients synchrone et asynchrone : construction des
+    requêtes et décodage des réponses, sans entrées/sorties."""
 
-class MovieClient:
     def __init__(self, config: Optional[MovieConfig] = None):
         self.config = config or MovieConfig()
         self.movie_base_url = self.config.movie_base_url
+        # None si le cache des réponses GET n'est pas activé (voir film_cache.py)
+        self.cache = create_cache(self.config)
+
+    def _cache_lookup(self, url: str, kwargs: dict):
+        """Retourne (clé, entrée) pour une requête GET ; l'entrée vaut None si absente."""
+        key = cache_key(url, kwargs.get("params"), (kwargs.get("headers") or {}).get("Accept"))
+        return key, self.cache.get(key)
+
+    def _cache_hit(self, url: str, entry: CachedResponse) -> httpx.Response:
+        self.cache.stats.increment("hits")
+        return _cached_response(url, entry)
+
+    def _cache_store(self, key: str, entry: Optional[CachedResponse], url: str, response: httpx.Response):
+        """Met en cache une réponse 200, ou prolonge l'entrée confirmée par un 304."""
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats.increment("revalidations")
+            self.cache.refresh(key)
+            return _cached_response(url, entry)
+        self.cache.stats.increment("misses")
+        # les exports en streaming sont marqués no-store par l'API
+        if "no-store" not in response.headers.get("cache-control", ""):
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            self.cache.put(key, response.content, headers, response.headers.get("etag"))
+        return response
 
     def _format_output(
         self,
@@ -23,49 +210,178 @@ class MovieClient:
         elif output_format == "dict":
             return data
         elif output_format == "pandas":
-            return pd.DataFrame(data)
+            return _pandas().DataFrame(data)
         else:
             raise ValueError(
                 "Invalid output_format. Choose from 'pydantic', 'dict', or 'pandas'."
             )
 
+    def _list_request(self, params: dict, output_format, cursor: Optional[str]) -> dict:
+        """Arguments de la requête GET d'une page de liste."""
+        if cursor is not None:
+            params["cursor"] = cursor
+        if output_format == "arrow":
+            # colonnes Arrow décodées sans passer par JSON
+            return {"params": params, "headers": {"Accept": ARROW_MEDIA_TYPE}}
+        return {"params": params}
+
+    def _page(self, response: httpx.Response, model, output_format, cursor: Optional[str]):
+        """Décode une page de liste.
+
+        `output_format="arrow"` retourne un DataFrame pandas construit depuis
+        le flux Arrow IPC. Sans curseur, retourne la page formatée. Avec un
+        curseur ("" pour la première page), retourne un tuple
+        (page, next_cursor) où next_cursor vaut None sur la dernière page.
+        """
+        if output_format == "arrow":
+            data = _arrow_to_pandas(response.content)
+        else:
+            data = self._format_output(response.json(), model, output_format)
+        if cursor is None:
+            return data
+        return data, response.headers.get(NEXT_CURSOR_HEADER)
+
+    def _list_method(self, resource: str):
+        """Méthode list_* d'une ressource ("movies", "ratings", "tags", "links")."""
+        if resource not in EXPORT_RESOURCES:
+            raise ValueError(f"Invalid resource. Choose from {', '.join(EXPORT_RESOURCES)}.")
+        return getattr(self, f"list_{resource}")
+
+    def _export_params(self, resource: str, export_format: str, filters: dict) -> dict:
+        if resource not in EXPORT_RESOURCES:
+            raise ValueError(f"Invalid resource. Choose from {', '.join(EXPORT_RESOURCES)}.")
+        params = {"format": export_format}
+        for name, value in filters.items():
+            if value is None:
+                continue
+            # même nom d'argument que list_ratings()
+            if resource == "ratings" and name == "movie_id":
+                name = "movies_id"
+            params[name] = value
+        return params
+
+
+class MovieClient(BaseMovieClient):
+    """Client de l'API MovieLens.
+
+    Les appels partagent un pool de connexions HTTP persistantes : fermer le
+    client avec `close()`, ou l'utiliser comme gestionnaire de contexte.
+    """
+
+    def __init__(self, config: Optional[MovieConfig] = None):
+        super().__init__(config)
+        self._client = httpx.Client(**http_client_options(self.config))
+        self._request = with_backoff(self.config, self._send)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Ferme les connexions du pool."""
+        self._client.close()
+
+    def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = self._client.request(method, url, **kwargs)
+        # 304 : l'entrée du cache revalidée par If-None-Match reste valable
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        if self.cache is None:
+            return self._request("GET", url, **kwargs)
+        key, entry = self._cache_lookup(url, kwargs)
+        if entry is not None and entry.fresh:
+            return self._cache_hit(url, entry)
+        response = self._request("GET", url, **_conditional(kwargs, entry))
+        return self._cache_store(key, entry, url, response)
+
+    def _list(self, path: str, params: dict, model, output_format, cursor: Optional[str]):
+        """Récupère une page de liste (voir `BaseMovieClient._page`)."""
+        response = self._get(f"{self.movie_base_url}{path}", **self._list_request(params, output_format, cursor))
+        return self._page(response, model, output_format, cursor)
+
+    def _batch(self, path: str, field: str, items: list) -> list:
+        """Résout des identifiants par requêtes POST /batch de BATCH_MAX_SIZE éléments."""
+        results = []
+        for start in range(0, len(items), BATCH_MAX_SIZE):
+            response = self._request(
+                "POST",
+                f"{self.movie_base_url}{path}",
+                json={field: items[start:start + BATCH_MAX_SIZE]},
+            )
+            results.extend(response.json())
+        return results
+
     def health_check(self) -> dict:
         url = f"{self.movie_base_url}/"
-        response = httpx.get(url)
-        response.raise_for_status()
+        # état courant de l'API : jamais servi par le cache
+        response = self._request("GET", url)
         return response.json()
 
-    def get_movie(self, movie_id: int) -> MovieDetailed:
+    def get_movie(
+        self,
+        movie_id: int,
+        ratings_limit: Optional[int] = None,
+        tags_limit: Optional[int] = None,
+        include_stats: bool = False,
+    ) -> MovieDetailed:
         url = f"{self.movie_base_url}/movies/{movie_id}"
-        response = httpx.get(url)
-        response.raise_for_status()
+        params = _movie_params(ratings_limit, tags_limit, include_stats)
+        response = self._get(url, params=params)
         return MovieDetailed(**response.json())
 
+    def get_movies(self, movie_ids: List[int]) -> List[MovieSimple]:
+        """Récupère plusieurs films en un aller-retour par tranche de 500 IDs.
+
+        Les films sont retournés dans l'ordre des IDs ; les IDs inconnus sont ignorés.
+        """
+        return [MovieSimple(**item) for item in self._batch("/movies/batch", "ids", list(movie_ids))]
+
+    def get_movie_stats(self, movie_id: int) -> MovieStats:
+        url = f"{self.movie_base_url}/movies/{movie_id}/stats"
+        response = self._get(url)
+        return MovieStats(**response.json())
+
     def list_movies(
         self,
         skip: int = 0,
         limit: int = 100,
         title: Optional[str] = None,
-        genre: Optional[str] = None,
+        genre: Optional[Union[str, List[str]]] = None,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+        genres_match: Literal["any", "all"] = "any",
+    ) -> Union[List[MovieSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _movies_params(skip, limit, title, genre, genres_match)
+        return self._list("/movies", params, MovieSimple, output_format, cursor)
+
+    def search_movies(
+        self,
+        query: str,
+        limit: int = 20,
         output_format: Literal["pydantic", "dict", "pandas"] = "pydantic",
     ) -> Union[List[MovieSimple], List[dict], pd.DataFrame]:
-        url = f"{self.movie_base_url}/movies"
-        params = {"skip": skip, "limit": limit}
-        if title:
-            params["title"] = title
-        if genre:
-            params["genre"] = genre
-
-        response = httpx.get(url, params=params)
-        response.raise_for_status()
+        url = f"{self.movie_base_url}/movies/search"
+        response = self._get(url, params={"q": query, "limit": limit})
         return self._format_output(response.json(), MovieSimple, output_format)
 
     def get_rating(self, user_id: int, movie_id: int) -> RatingSimple:
         url = f"{self.movie_base_url}/ratings/{user_id}/{movie_id}"
-        response = httpx.get(url)
-        response.raise_for_status()
+        response = self._get(url)
         return RatingSimple(**response.json())
 
+    def get_ratings(self, keys: List[Tuple[int, int]]) -> List[RatingSimple]:
+        """Récupère plusieurs évaluations à partir de couples (user_id, movie_id).
+
+        Les couples sans évaluation sont ignorés.
+        """
+        items = [{"userId": user_id, "movieId": movie_id} for user_id, movie_id in keys]
+        return [RatingSimple(**item) for item in self._batch("/ratings/batch", "keys", items)]
+
     def list_ratings(
         self,
         skip: int = 0,
@@ -73,25 +389,16 @@ class MovieClient:
         movie_id: Optional[int] = None,
         user_id: Optional[int] = None,
         min_rating: Optional[float] = None,
-        output_format: Literal["pydantic", "dict", "pandas"] = "pydantic",
-    ) -> Union[List[RatingSimple], List[dict], pd.DataFrame]:
-        url = f"{self.movie_base_url}/ratings"
-        params = {"skip": skip, "limit": limit}
-        if movie_id:
-            params["movie_id"] = movie_id
-        if user_id:
-            params["user_id"] = user_id
-        if min_rating:
-            params["min_rating"] = min_rating
-
-        response = httpx.get(url, params=params)
-        response.raise_for_status()
-        return self._format_output(response.json(), RatingSimple, output_format)
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+        max_rating: Optional[float] = None,
+    ) -> Union[List[RatingSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _ratings_params(skip, limit, movie_id, user_id, min_rating, max_rating)
+        return self._list("/ratings", params, RatingSimple, output_format, cursor)
 
     def get_tag(self, user_id: int, movie_id: int, tag_text: str) -> TagSimple:
         url = f"{self.movie_base_url}/tags/{user_id}/{movie_id}/{tag_text}"
-        response = httpx.get(url)
-        response.raise_for_status()
+        response = self._get(url)
         return TagSimple(**response.json())
 
     def list_tags(
@@ -100,40 +407,161 @@ class MovieClient:
         limit: int = 100,
         movie_id: Optional[int] = None,
         user_id: Optional[int] = None,
-        output_format: Literal["pydantic", "dict", "pandas"] = "pydantic",
-    ) -> Union[List[TagSimple], List[dict], pd.DataFrame]:
-        url = f"{self.movie_base_url}/tags"
-        params = {"skip": skip, "limit": limit}
-        if movie_id:
-            params["movie_id"] = movie_id
-        if user_id:
-            params["user_id"] = user_id
-
-        response = httpx.get(url, params=params)
-        response.raise_for_status()
-        return self._format_output(response.json(), TagSimple, output_format)
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+    ) -> Union[List[TagSimple], List[dict], pd.DataFrame, Tuple]:
+        params = _tags_params(skip, limit, movie_id, user_id)
+        return self._list("/tags", params, TagSimple, output_format, cursor)
 
     def get_link(self, movie_id: int) -> LinkSimple:
         url = f"{self.movie_base_url}/links/{movie_id}"
-        response = httpx.get(url)
-        response.raise_for_status()
+        response = self._get(url)
         return LinkSimple(**response.json())
 
+    def get_links(self, movie_ids: List[int]) -> List[LinkSimple]:
+        """Récupère les liens IMDB / TMDB de plusieurs films (IDs inconnus ignorés)."""
+        return [LinkSimple(**item) for item in self._batch("/links/batch", "ids", list(movie_ids))]
+
     def list_links(
         self,
         skip: int = 0,
         limit: int = 100,
-        output_format: Literal["pydantic", "dict", "pandas"] = "pydantic",
-    ) -> Union[List[LinkSimple], List[dict], pd.DataFrame]:
-        url = f"{self.movie_base_url}/links"
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        cursor: Optional[str] = None,
+    ) -> Union[List[LinkSimple], List[dict], pd.DataFrame, Tuple]:
         params = {"skip": skip, "limit": limit}
 
-        response = httpx.get(url, params=params)
-        response.raise_for_status()
-        return self._format_output(response.json(), LinkSimple, output_format)
+        return self._list("/links", params, LinkSimple, output_format, cursor)
 
     def get_analytics(self) -> AnalyticsResponse:
         url = f"{self.movie_base_url}/analytics"
-        response = httpx.get(url)
-        response.raise_for_status()
+        response = self._get(url)
         return AnalyticsResponse(**response.json())
+
+    # Parcours complet des listes
+
+    def iter_pages(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        page_size: int = MAX_PAGE_SIZE,
+        output_format: Literal["pydantic", "dict", "pandas", "arrow"] = "pydantic",
+        prefetch: bool = True,
+        **filters,
+    ) -> Iterator:
+        """Parcourt toutes les pages d'une liste par curseur.
+
+        Les filtres sont ceux de la méthode list_* correspondante. Avec
+        `prefetch`, la page suivante est demandée en arrière-plan pendant que
+        l'appelant traite la page courante.
+        """
+        list_method = self._list_method(resource)
+
+        def fetch(cursor: str):
+            return list_method(limit=page_size, output_format=output_format, cursor=cursor, **filters)
+
+        if not prefetch:
+            cursor = ""
+            while cursor is not None:
+                page, cursor = fetch(cursor)
+                yield page
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch, "")
+            while future is not None:
+                page, cursor = future.result()
+                future = executor.submit(fetch, cursor) if cursor is not None else None
+                yield page
+
+    def iter_movies(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                    prefetch: bool = True, **filters) -> Iterator[Union[MovieSimple, dict]]:
+        """Itère sur tous les films (filtres de list_movies), page après page."""
+        for page in self.iter_pages("movies", page_size, output_format, prefetch, **filters):
+            yield from page
+
+    def iter_ratings(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                     prefetch: bool = True, **filters) -> Iterator[Union[RatingSimple, dict]]:
+        """Itère sur toutes les évaluations (filtres de list_ratings), page après page."""
+        for page in self.iter_pages("ratings", page_size, output_format, prefetch, **filters):
+            yield from page
+
+    def iter_tags(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                  prefetch: bool = True, **filters) -> Iterator[Union[TagSimple, dict]]:
+        """Itère sur tous les tags (filtres de list_tags), page après page."""
+        for page in self.iter_pages("tags", page_size, output_format, prefetch, **filters):
+            yield from page
+
+    def iter_links(self, page_size: int = MAX_PAGE_SIZE, output_format: Literal["pydantic", "dict"] = "pydantic",
+                   prefetch: bool = True) -> Iterator[Union[LinkSimple, dict]]:
+        """Itère sur tous les liens IMDB / TMDB, page après page."""
+        for page in self.iter_pages("links", page_size, output_format, prefetch):
+            yield from page
+
+    def to_dataframe(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        page_size: int = MAX_PAGE_SIZE,
+        output_format: Literal["dict", "arrow"] = "dict",
+        prefetch: bool = True,
+        **filters,
+    ) -> pd.DataFrame:
+        """Charge toutes les pages d'une liste dans un seul DataFrame.
+
+        `output_format="arrow"` reçoit les pages en Arrow (nécessite pyarrow).
+        Pour une table entière sans filtre de pagination, `export_dataframe()`
+        évite la pagination.
+        """
+        pages = list(self.iter_pages(resource, page_size, output_format, prefetch, **filters))
+        return concat_pages(pages, output_format)
+
+    def export(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        destination: Union[str, os.PathLike, BinaryIO],
+        export_format: Literal["ndjson", "csv", "arrow", "parquet"] = "ndjson",
+        **filters,
+    ) -> int:
+        """Écrit l'export complet d'une table dans un fichier, au fil du flux.
+
+        `destination` est un chemin ou un fichier ouvert en binaire ; les
+        filtres sont ceux des méthodes list_* (par ex. movie_id=1).
+        Retourne le nombre d'octets écrits.
+        """
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, export_format, filters)
+        written = 0
+        with self._client.stream("GET", url, params=params, timeout=None) as response:
+            response.raise_for_status()
+            if isinstance(destination, (str, os.PathLike)):
+                with open(destination, "wb") as f:
+                    for chunk in response.iter_bytes():
+                        written += f.write(chunk)
+            else:
+                for chunk in response.iter_bytes():
+                    written += destination.write(chunk)
+        return written
+
+    def iter_export(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        **filters,
+    ) -> Iterator[dict]:
+        """Itère sur l'export NDJSON d'une table, une ligne (dict) à la fois."""
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, "ndjson", filters)
+        with self._client.stream("GET", url, params=params, timeout=None) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def export_dataframe(
+        self,
+        resource: Literal["movies", "ratings", "tags", "links"],
+        **filters,
+    ) -> pd.DataFrame:
+        """Charge l'export complet d'une table dans un DataFrame, via un flux Arrow."""
+        url = f"{self.movie_base_url}/export/{resource}"
+        params = self._export_params(resource, "arrow", filters)
+        response = self._get(url, params=params, timeout=None)
+        return _arrow_to_pandas(response.content)
@@ -1,29 +1,75 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _base_url_from_env():
+    """Lit MOVIE_API_BASE_URL dans l'environnement, puis dans le fichier .env.
+
+    python-dotenv n'est importé que si la variable n'est pas déjà définie
+    (elle a priorité sur le fichier .env, comme avec `load_dotenv()`).
+    """
+    base_url = os.getenv("MOVIE_API_BASE_URL")
+    if base_url is None:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        base_url = os.getenv("MOVIE_API_BASE_URL")
+    return base_url
 
 
 class MovieConfig:
     """Classe de configuration contenant des arguments pour le client SDK.
     
-    Contient la configuration de l'URL de base et du backoff progressif.
+    Contient la configuration de l'URL de base, du backoff progressif et
+    du pool de connexions HTTP.
     
     Attributes:
         movie_base_url (str): L'URL de base pour les appels d'API.
         movie_backoff (bool): Indique si le backoff progressif est activé.
         movie_backoff_max_time (int): Le temps maximal de backoff en secondes.
+        movie_backoff_max_delay (float): L'attente maximale entre deux essais, en secondes.
+        movie_timeout (float): Le délai maximal d'un appel, en secondes.
+        movie_max_connections (int): Le nombre maximal de connexions ouvertes.
+        movie_max_keepalive_connections (int): Le nombre de connexions gardées ouvertes entre deux appels.
+        movie_keepalive_expiry (float): La durée de vie d'une connexion inactive, en secondes.
+        movie_http2 (bool): Indique si HTTP/2 est utilisé.
+        movie_cache: Le cache des réponses GET : None, "memory", "sqlite" ou un objet cache.
+        movie_cache_path (str): Le fichier du cache "sqlite".
+        movie_cache_ttl (float): La durée de fraîcheur d'une réponse en cache, en secondes.
+        movie_cache_max_entries (int): Le nombre maximal de réponses en cache.
+        movie_cache_max_bytes (int): La taille maximale du cache, en octets.
     """
 
     movie_base_url: str
     movie_backoff: bool
     movie_backoff_max_time: int
+    movie_backoff_max_delay: float
+    movie_timeout: float
+    movie_max_connections: int
+    movie_max_keepalive_connections: int
+    movie_keepalive_expiry: float
+    movie_http2: bool
+    movie_cache: object
+    movie_cache_path: str
+    movie_cache_ttl: float
+    movie_cache_max_entries: int
+    movie_cache_max_bytes: int
     
     def __init__(
         self,
         movie_base_url: str = None,
         backoff: bool = True,
         backoff_max_time: int = 30,
+        backoff_max_delay: float = 10.0,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        cache=None,
+        cache_path: str = "filmsapisdk_cache.sqlite3",
+        cache_ttl: float = 300,
+        cache_max_entries: int = 10_000,
+        cache_max_bytes: int = 64 * 1024 * 1024,
 ):
 
         """
@@ -42,15 +88,49 @@ class MovieConfig:
         backoff_max_time (optional):
         Le nombre maximal de secondes pendant lesquelles le SDK doit
         continuer à essayer un appel API avant de s'arrêter.
+
+        backoff_max_delay (optional):
+        L'attente maximale entre deux essais : l'attente double à chaque
+        essai (avec une part aléatoire) sans dépasser cette valeur.
+
+        timeout (optional):
+        Le délai maximal, en secondes, d'un appel API.
+
+        max_connections, max_keepalive_connections, keepalive_expiry (optional):
+        Les limites du pool de connexions HTTP réutilisées d'un appel à l'autre.
+
+        http2 (optional):
+        Active HTTP/2 (nécessite `pip install "httpx[http2]"`).
+
+        cache (optional):
+        Met en cache les réponses GET : "memory" (LRU en mémoire), "sqlite"
+        (fichier `cache_path`, conservé d'une exécution à l'autre) ou un
+        objet `MemoryCache` / `SQLiteCache` partagé entre clients. Une
+        réponse expirée est revalidée avec son ETag (If-None-Match).
+
+        cache_path, cache_ttl, cache_max_entries, cache_max_bytes (optional):
+        Le fichier du cache "sqlite", la durée de fraîcheur d'une réponse et
+        les limites du cache (les réponses les moins récemment utilisées
+        sont évincées en premier).
         """
         
         
-        self.movie_base_url = movie_base_url or os.getenv("MOVIE_API_BASE_URL")
-        print(f"MOVIE_API_BASE_URL in MovieConfig init: {self.movie_base_url}")
+        self.movie_base_url = movie_base_url or _base_url_from_env()
         if not self.movie_base_url:
             raise ValueError("L'URL de base est requise. Définissez la variable d'environnement MOVIE_API_BASE_URL.")
         self.movie_backoff = backoff
         self.movie_backoff_max_time = backoff_max_time
+        self.movie_backoff_max_delay = backoff_max_delay
+        self.movie_timeout = timeout
+        self.movie_max_connections = max_connections
+        self.movie_max_keepalive_connections = max_keepalive_connections
+        self.movie_keepalive_expiry = keepalive_expiry
+        self.movie_http2 = http2
+        self.movie_cache = cache
+        self.movie_cache_path = cache_path
+        self.movie_cache_ttl = cache_ttl
+        self.movie_cache_max_entries = cache_max_entries
+        self.movie_cache_max_bytes = cache_max_bytes
 
     def __str__(self):
         """Fonction Stringify pour renvoyer le contenu de l'objet de
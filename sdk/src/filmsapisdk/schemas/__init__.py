@@ -5,6 +5,8 @@ from .modos import (
     TagSimple,
     LinkSimple,
     AnalyticsResponse,
+    RatingBucket,
+    MovieStats,
 )
 
 __all__ = [
@@ -14,6 +16,8 @@ __all__ = [
     "TagSimple",
     "LinkSimple",
     "AnalyticsResponse",
+    "RatingBucket",
+    "MovieStats",
 ]
 
 
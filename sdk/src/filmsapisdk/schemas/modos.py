@@ -31,6 +31,25 @@ class LinkBase(BaseModel):
         from_attributes = True
 
 
+class RatingBucket(BaseModel):
+    rating: float
+    count: int
+
+
+class MovieStats(BaseModel):
+    movieId: int
+    rating_count: int
+    rating_mean: Optional[float] = None
+    rating_std: Optional[float] = None
+    histogram: List[RatingBucket] = []
+    tag_count: int
+    first_rating_timestamp: Optional[int] = None
+    last_rating_timestamp: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
 # --- Schéma principal Movie ---
 
 class MovieBase(BaseModel):
@@ -46,6 +65,7 @@ class MovieDetailed(MovieBase):
     ratings: List[RatingBase] = []
     tags: List[TagBase] = []
     link: Optional[LinkBase] = None
+    stats: Optional[MovieStats] = None
 
 
 # --- Schéma simple Movie (liste) ---
@@ -95,4 +115,5 @@ class AnalyticsResponse(BaseModel):
     tag_count: int
     link_count: int
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
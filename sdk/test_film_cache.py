@@ -0,0 +1,138 @@
+"""Cache des réponses GET et backoff du client, contre une API simulée.
+
+Les requêtes sont servies par `httpx.MockTransport` : aucun appel réseau.
+
+Usage :
+    python -m pytest sdk/test_film_cache.py
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from filmsapisdk import AsyncMovieClient, MovieClient, MovieConfig
+from filmsapisdk.film_cache import CacheStats, MemoryCache
+
+BASE_URL = "http://api.test"
+ANALYTICS = {"movie_count": 3, "rating_count": 10, "tag_count": 2, "link_count": 3}
+
+
+class FakeApi:
+    """Répond aux requêtes du client et garde celles qu'il a reçues.
+
+    `failures` réponses 503 sont renvoyées avant les réponses normales ; un
+    If-None-Match égal à `etag` reçoit un 304.
+    """
+
+    def __init__(self, etag: str = None, failures: int = 0):
+        self.etag = etag
+        self.failures = failures
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503)
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        if request.url.path == "/":
+            return httpx.Response(200, json={"status": "ok"})
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(200, json=ANALYTICS, headers=headers)
+
+
+def _client(api: FakeApi, cache=None, **options) -> MovieClient:
+    client = MovieClient(MovieConfig(BASE_URL, cache=cache, **options))
+    client._client = httpx.Client(transport=httpx.MockTransport(api))
+    return client
+
+
+def test_fresh_entry_is_served_without_a_call():
+    api = FakeApi()
+    with _client(api, cache="memory") as client:
+        assert client.get_analytics() == client.get_analytics()
+        assert len(api.requests) == 1
+        assert (client.cache.stats.hits, client.cache.stats.misses) == (1, 1)
+
+
+def test_expired_entry_is_revalidated_with_its_etag():
+    api = FakeApi(etag='"v1"')
+    with _client(api, cache="memory", cache_ttl=0) as client:
+        first = client.get_analytics()
+        second = client.get_analytics()
+    assert first == second
+    assert len(api.requests) == 2
+    assert api.requests[1].headers["if-none-match"] == '"v1"'
+    assert (client.cache.stats.revalidations, client.cache.stats.misses) == (1, 1)
+
+
+def test_expired_entry_without_etag_is_downloaded_again():
+    api = FakeApi()
+    with _client(api, cache="memory", cache_ttl=0) as client:
+        client.get_analytics()
+        client.get_analytics()
+    assert len(api.requests) == 2
+    assert "if-none-match" not in api.requests[1].headers
+    assert client.cache.stats.misses == 2
+
+
+def test_health_check_bypasses_the_cache():
+    api = FakeApi()
+    with _client(api, cache="memory") as client:
+        client.health_check()
+        client.health_check()
+    assert len(api.requests) == 2
+    assert len(client.cache) == 0
+
+
+def test_async_health_check_bypasses_the_cache():
+    api = FakeApi()
+
+    async def run():
+        client = AsyncMovieClient(MovieConfig(BASE_URL, cache="memory"))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+        async with client:
+            await client.health_check()
+            await client.health_check()
+        return client
+
+    client = asyncio.run(run())
+    assert len(api.requests) == 2
+    assert len(client.cache) == 0
+
+
+def test_server_errors_are_retried():
+    api = FakeApi(failures=2)
+    with _client(api, backoff_max_delay=0.01) as client:
+        assert client.get_analytics().movie_count == 3
+    assert len(api.requests) == 3
+
+
+def test_server_errors_are_raised_without_backoff():
+    api = FakeApi(failures=1)
+    with _client(api, backoff=False) as client, pytest.raises(httpx.HTTPStatusError):
+        client.get_analytics()
+    assert len(api.requests) == 1
+
+
+def test_stats_are_counted_across_threads():
+    stats = CacheStats()
+    threads = [threading.Thread(target=lambda: [stats.increment("hits") for _ in range(10_000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats.hits == 80_000
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, b"{}", {}, None)
+    cache.get("a")
+    cache.put("c", b"{}", {}, None)
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.stats.evictions == 1
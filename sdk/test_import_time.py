@@ -0,0 +1,59 @@
+"""Temps d'import du SDK, mesuré avec `python -X importtime`.
+
+`import filmsapisdk` ne doit charger ni pandas ni python-dotenv (importés au
+premier besoin) et doit rester sous un budget, pour les scripts courts et
+les fonctions serverless dont chaque démarrage à froid paie l'import.
+
+Usage :
+    python -m pytest sdk/test_import_time.py
+    FILMSAPISDK_IMPORT_BUDGET_MS=300 python -m pytest sdk/test_import_time.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent / "src"
+
+# Budget en millisecondes : meilleur temps sur plusieurs démarrages à froid
+IMPORT_BUDGET_MS = float(os.getenv("FILMSAPISDK_IMPORT_BUDGET_MS", "500"))
+RUNS = 5
+
+
+def _import(code: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PYTHONDONTWRITEBYTECODE": ""}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_ms() -> float:
+    """Temps cumulé de `import filmsapisdk` (ligne de premier niveau de -X importtime)."""
+    for line in _import("import filmsapisdk").stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == "filmsapisdk" and name.startswith(" filmsapisdk"):
+            return int(cumulative) / 1000
+    raise AssertionError("filmsapisdk absent de la sortie -X importtime")
+
+
+def test_heavy_dependencies_are_not_imported():
+    result = _import(
+        "import sys, filmsapisdk; print(' '.join(m for m in ('pandas', 'pyarrow', 'dotenv') if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_does_not_print():
+    assert _import("import filmsapisdk").stdout == ""
+
+
+def test_import_time_budget():
+    best = min(_import_time_ms() for _ in range(RUNS))
+    print(f"\nimport filmsapisdk : {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    assert best < IMPORT_BUDGET_MS